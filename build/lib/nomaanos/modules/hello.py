@@ -1,2 +0,0 @@
-def main():
-    return "👋 Hello from NomaanOS module!"
@@ -16,6 +16,8 @@ except Exception:
     class _FakeConfig:
         def load(self): return {}
         def save(self, cfg): return True
+        def update(self, values): return dict(values)
+        def parse_pairs(self, args): return {args[i]: args[i + 1] for i in range(0, len(args) - 1, 2)}
     config = _FakeConfig()
 
 RUNNER_MODULE_PATH = "src.nomaanos.modules.runner"
@@ -50,30 +52,14 @@ def cmd_config():
 
 def cmd_set(args):
     if len(args) < 2:
-        print("Usage: nomaan set <key> <value>")
+        print("Usage: nomaan set <key> <value> [<key> <value> ...]")
         return
-    key = args[0]
-    value = args[1]
-    # Simple auto-typing
-    if isinstance(value, str):
-        if value.lower() == "true":
-            value = True
-        elif value.lower() == "false":
-            value = False
-        elif value.isdigit():
-            try:
-                value = int(value)
-            except Exception:
-                pass
+    # all pairs go to disk in one locked, atomic write
     try:
-        cfg = config.load()
-    except Exception:
-        cfg = {}
-    cfg[key] = value
-    try:
-        config.save(cfg)
+        cfg = config.update(config.parse_pairs(args))
     except Exception as e:
-        print("[WARN] config.save() failed:", e)
+        print("[WARN] config.update() failed:", e)
+        return
     print("Updated:", cfg)
 
 def cmd_modules():
@@ -97,9 +83,24 @@ def cmd_modules():
         pass
     print("[INFO] No modules found or runner missing list_modules().")
 
+def _output():
+    """Result serialiser from the package, or None when running without it."""
+    try:
+        return importlib.import_module("src.nomaanos.output")
+    except Exception:
+        return None
+
 def cmd_run(args):
+    output = _output()
+    fmt = None
+    if output is not None:
+        try:
+            args, fmt = output.pop_format(args)
+        except output.FormatError as e:
+            print("[ERROR]", e)
+            return
     if not args:
-        print("Usage: nomaan run <module>")
+        print("Usage: nomaan run <module> [--format repr|json|ndjson]")
         return
     name = args[0]
     runner = _get_runner()
@@ -111,13 +112,16 @@ def cmd_run(args):
     try:
         result = runner.run(name)
         if result is not None:
-            print(result)
+            if output is not None:
+                output.emit(result, fmt)
+            else:
+                print(result)
     except Exception as e:
         print(f"[ERROR] running module '{name}':", e)
 
 def main():
     if len(sys.argv) == 1:
-        print("NomaanOS CLI: try 'info', 'hello <name>', 'config', 'set <k> <v>', 'modules', 'run <module>'")
+        print("NomaanOS CLI: try 'info', 'hello <name>', 'config', 'set <k> <v> ...', 'modules', 'run <module>'")
         return
 
     cmd = sys.argv[1]
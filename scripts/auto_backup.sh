@@ -1,6 +1,14 @@
 #!/bin/bash
 set -e
 
+# Incremental snapshot of src via `nomaanos backup`; honours the auto_backup
+# config flag and prunes down to backup_keep snapshots afterwards.
+# Without cron: `nomaanos schedule add backup @backup --cron "30 3 * * *"`
+# and keep `nomaanos schedule` running.
 echo "[NomaanOS Backup] Starting..."
-tar -czf nomaanos_backup_$(date +%Y%m%d_%H%M).tar.gz src || echo "Source not found"
+if command -v nomaanos >/dev/null 2>&1; then
+  nomaanos backup --auto || echo "Backup failed"
+else
+  PYTHONPATH="src${PYTHONPATH:+:$PYTHONPATH}" python3 -m nomaanos backup --auto || echo "Backup failed"
+fi
 echo "[NomaanOS Backup] Done"
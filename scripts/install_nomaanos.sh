@@ -1,31 +1,41 @@
 #!/usr/bin/env sh
 set -e
 
+# Default: build the single-file bundle and copy it onto PATH.
+#   scripts/install_nomaanos.sh              -> $BIN/nomaanos (zipapp, bytecode only)
+#   scripts/install_nomaanos.sh --editable   -> pip install -e . (workspace changes reflect immediately)
+# On another device just copy dist/nomaanos.pyz to somewhere on PATH; the bundle is
+# bytecode for this Python X.Y only, so rerun this after upgrading Python.
+
 # 1) go to repo root (adjust if your repo path is different)
-REPO=~/workspace/nomaanos
+REPO=${NOMAANOS_REPO:-~/workspace/nomaanos}
 if [ ! -d "$REPO" ]; then
   echo "ERROR: repo not found at $REPO"
   exit 1
 fi
 cd "$REPO"
 
-echo ">>> cleaning previous installs (safe)"
-python3 -m pip uninstall -y nomaanos >/dev/null 2>&1 || true
-rm -f /data/data/com.termux/files/usr/bin/nomaanos >/dev/null 2>&1 || true
+BIN=${PREFIX:+$PREFIX/bin}
+BIN=${BIN:-$HOME/.local/bin}
 
-echo ">>> ensuring pyproject/setup exists"
-if [ ! -f "pyproject.toml" ] && [ ! -f "setup.py" ] && [ ! -f "setup.cfg" ]; then
-  echo "WARNING: no pyproject.toml or setup.py in repo root. Aborting."
-  exit 1
+if [ "$1" = "--editable" ]; then
+  echo ">>> cleaning previous installs (safe)"
+  python3 -m pip uninstall -y nomaanos >/dev/null 2>&1 || true
+  rm -f "$BIN/nomaanos" >/dev/null 2>&1 || true
+  echo ">>> installing editable"
+  python3 -m pip install -e . || {
+    echo "pip install failed"
+    exit 1
+  }
+else
+  echo ">>> building bundle"
+  PYTHONPATH=src python3 -m nomaanos bundle -o dist/nomaanos.pyz
+  mkdir -p "$BIN"
+  cp dist/nomaanos.pyz "$BIN/nomaanos.tmp"
+  mv "$BIN/nomaanos.tmp" "$BIN/nomaanos"
+  echo ">>> installed $BIN/nomaanos"
 fi
 
-echo ">>> installing editable (so workspace changes reflect immediately)"
-python3 -m pip install --upgrade pip wheel setuptools >/dev/null
-python3 -m pip install -e . || {
-  echo "pip install failed"
-  exit 1
-}
-
 echo ">>> Done. Quick smoke tests:"
 echo " - nomaanos info:"
 nomaanos info || echo "nomaanos info failed"
@@ -2,7 +2,7 @@
 Safe package initializer for nomaanos.
 Expose a callable `main()` at package level and a `run(name)` helper.
 """
-import importlib
+import importlib, time
 
 def _call_from_candidates(candidates, name="main"):
     """Try candidate modules in order; return first callable found (function)"""
@@ -24,11 +24,17 @@ def _call_from_candidates(candidates, name="main"):
 
 def main(*args, **kwargs):
     """
-    Package-level main() callable. Tries common candidate modules and calls them.
+    Package-level main() callable. Dispatches straight to nomaanos.main and only
+    probes the other candidate modules if that import fails.
     This is what python -m nomaanos and console script will call.
     """
-    candidates = ("main", "core", "runner")
-    fn = _call_from_candidates(candidates)
+    t0 = time.perf_counter_ns()
+    try:
+        from .main import main as fn
+    except Exception:
+        fn = _call_from_candidates(("core", "runner"))
+    from . import trace
+    trace.record("init", t0, time.perf_counter_ns())
     if fn is None:
         raise RuntimeError("no main() available in nomaanos package")
     # call function; if it accepts args, pass them; otherwise call without
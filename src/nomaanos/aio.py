@@ -0,0 +1,59 @@
+"""
+Shared asyncio runtime for `async def main()` modules.
+One event loop runs on a background daemon thread for the life of the process
+(CLI call, daemon or shell); any thread hands coroutines to it and waits, so
+modules never start their own loops and the CLI thread is never the loop.
+"""
+import asyncio, threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+def loop():
+    """The shared event loop, started on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="nomaanos-aio", daemon=True)
+            _thread.start()
+    return _loop
+
+async def _guard(coro, timeout):
+    if timeout is None:
+        return await coro
+    return await asyncio.wait_for(coro, timeout)
+
+def run(coro, timeout=None):
+    """Run coro on the shared loop and block the calling thread until it finishes."""
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("blocking on the nomaanos event loop from inside it; await the module instead")
+    fut = asyncio.run_coroutine_threadsafe(_guard(coro, timeout), loop())
+    try:
+        return fut.result()
+    except BaseException:
+        # Ctrl-C while waiting: cancel the coroutine instead of leaving it running
+        fut.cancel()
+        raise
+
+async def _one(name, coro, timeout):
+    try:
+        return name, await _guard(coro, timeout)
+    except asyncio.TimeoutError:
+        return name, {"error": f"timed out after {timeout}s"}
+    except asyncio.CancelledError:
+        return name, {"error": "cancelled"}
+    except BaseException as e:
+        return name, {"error": f"{type(e).__name__}: {e}"}
+
+def gather(coros, timeout=None):
+    """
+    Await {name: coroutine} concurrently on the shared loop; returns {name: result}.
+    Each coroutine gets its own timeout and is cancelled when it runs out;
+    a failure is reported as {"error": ...} for that name only.
+    """
+    async def _all():
+        return dict(await asyncio.gather(*(_one(n, c, timeout) for n, c in coros.items())))
+    return run(_all())
@@ -0,0 +1,137 @@
+"""
+`nomaanos bundle`: build a single-file, self-contained zipapp.
+
+    nomaanos bundle [-o dist/nomaanos.pyz] [--optimize 0|1|2] [--python /usr/bin/env python3]
+
+The archive holds only bytecode: every module in the package is compiled
+here (optimised, docstrings/asserts stripped at -O2) and stored as a
+sourceless .pyc. zipimport runs those without looking for or stat-ing a
+.py, and there is nothing to compile on first start. The module manifest is
+pre-built from the sources and frozen into nomaanos/_bundled.pyc, so the
+registry never scans a directory (there is none inside a zip).
+
+Bytecode is specific to the Python minor version that built it, so a bundle
+only runs on that X.Y (3.11 bytecode will not load on 3.12). The version is
+recorded in _bundled (PYTHON) and checked by the one source file in the
+archive, __main__.py, which exits with a clear message on a mismatch instead
+of zipimport's "can't find '__main__' module". Rebuild after upgrading
+Python, and point --python at an interpreter of the same version.
+
+Installing on another device is a file copy, given the same Python X.Y:
+    cp dist/nomaanos.pyz $PREFIX/bin/nomaanos && nomaanos info
+"""
+import importlib.util, marshal, os, stat, sys, time, zipfile
+
+DEFAULT_OUT = os.path.join("dist", "nomaanos.pyz")
+DEFAULT_INTERPRETER = "/usr/bin/env python3"
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+# the flat modules.py is shadowed by the modules/ package and never imported
+SKIP = ("modules.py",)
+
+# kept as source: it has to run on any interpreter to report a version mismatch
+MAIN = """\
+import sys
+if sys.version_info[:2] != {version!r}:
+    sys.exit("nomaanos: this bundle was built for Python {built} and cannot run on Python %d.%d;"
+             " rebuild it with `nomaanos bundle` on this interpreter" % sys.version_info[:2])
+from nomaanos.main import main
+raise SystemExit(main())
+"""
+
+class BundleError(RuntimeError):
+    pass
+
+def _pyc(source, arcname, optimize):
+    """Unchecked hash-based pyc: valid without any source file next to it."""
+    code = compile(source, arcname, "exec", optimize=optimize, dont_inherit=True)
+    flags = (1).to_bytes(4, "little")  # hash-based, check_source=0
+    return importlib.util.MAGIC_NUMBER + flags + importlib.util.source_hash(source) + marshal.dumps(code)
+
+def _sources(pkg_dir):
+    """(path, arcname) for every .py under the package, sorted for reproducible archives."""
+    root = os.path.dirname(pkg_dir)
+    out = []
+    for d, dirs, files in os.walk(pkg_dir):
+        dirs[:] = sorted(x for x in dirs if x != "__pycache__")
+        for f in sorted(files):
+            if not f.endswith(".py") or (d == pkg_dir and f in SKIP):
+                continue
+            path = os.path.join(d, f)
+            out.append((path, os.path.relpath(path, root).replace(os.sep, "/")))
+    return out
+
+def _frozen_manifest(pkg_dir):
+    """Built-in module entries as the registry would scan them, without the stat keys."""
+    from nomaanos import registry
+    mods = {}
+    mod_dir = os.path.join(pkg_dir, "modules")
+    for n in sorted(os.listdir(mod_dir)):
+        if not n.endswith(".py") or n in registry.EXCLUDE or n.startswith("_"):
+            continue
+        spec = registry.analyse_file(os.path.join(mod_dir, n))
+        spec.update({"module": f"{registry.PKG}.{n[:-3]}", "source": "builtin", "stat": None})
+        mods[n[:-3]] = spec
+    return {"built": time.time_ns(), "python": tuple(sys.version_info[:2]), "modules": mods}
+
+def _add(zf, arcname, data):
+    info = zipfile.ZipInfo(arcname, date_time=(1980, 1, 1, 0, 0, 0))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    zf.writestr(info, data)
+
+def build(out=DEFAULT_OUT, optimize=2, interpreter=DEFAULT_INTERPRETER, pkg_dir=PKG_DIR):
+    """Write the zipapp to `out`; returns {"path", "modules", "files", "bytes"}."""
+    if not os.path.isdir(pkg_dir):
+        raise BundleError(f"package sources not found at {pkg_dir} (building from a bundle is not supported)")
+    frozen = _frozen_manifest(pkg_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    files = 0
+    try:
+        with open(tmp, "wb") as f:
+            f.write(b"#!" + interpreter.encode() + b"\n")
+            with zipfile.ZipFile(f, "w") as zf:
+                for path, arcname in _sources(pkg_dir):
+                    with open(path, "rb") as src:
+                        _add(zf, arcname[:-3] + ".pyc", _pyc(src.read(), arcname, optimize))
+                    files += 1
+                version = frozen["python"]
+                frozen_src = f"MANIFEST = {frozen!r}\nPYTHON = {version!r}\n".encode()
+                _add(zf, "nomaanos/_bundled.pyc", _pyc(frozen_src, "nomaanos/_bundled.py", optimize))
+                _add(zf, "__main__.py", MAIN.format(version=version, built="%d.%d" % version))
+        os.chmod(tmp, os.stat(tmp).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        os.replace(tmp, out)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return {"path": out, "modules": sorted(frozen["modules"]), "files": files + 2, "bytes": os.path.getsize(out)}
+
+def cli(args):
+    """Handler for `nomaanos bundle ...`."""
+    from nomaanos.output import next_number
+    opts = {"out": DEFAULT_OUT, "optimize": 2, "interpreter": DEFAULT_INTERPRETER}
+    it = iter(args)
+    try:
+        for a in it:
+            if a in ("-o", "--out"):
+                opts["out"] = next(it, DEFAULT_OUT)
+            elif a == "--optimize":
+                opts["optimize"] = next_number(it, a, int)
+                if opts["optimize"] not in (0, 1, 2):
+                    raise ValueError(f"--optimize expects 0, 1 or 2, got {opts['optimize']}")
+            elif a == "--python":
+                opts["interpreter"] = next(it, DEFAULT_INTERPRETER)
+            else:
+                print("Usage: nomaanos bundle [-o FILE] [--optimize 0|1|2] [--python INTERPRETER]")
+                return 1
+    except ValueError as e:
+        print(f"[ERROR] bundle: {e}")
+        return 2
+    try:
+        res = build(**opts)
+    except (BundleError, OSError, SyntaxError) as e:
+        print(f"[ERROR] bundle: {e}")
+        return 1
+    print(f"Bundled {res['files']} files ({len(res['modules'])} modules, {res['bytes']} bytes) -> {res['path']}")
+    return 0
@@ -0,0 +1,143 @@
+"""
+Small TTL result cache shared by info providers and module runs.
+Entries live in-process and in CACHE_DIR/results.cache so they survive
+between CLI calls; the file is marshal, not json, because a cache hit has to
+be cheaper than the work it saves and json drags in `re`.
+
+  cached(key, fn, ttl)   -> fn() result, reused for ttl seconds
+  invalidate(prefix="")  -> drop matching keys (here and on disk)
+Set NOMAANOS_NO_CACHE=1 (or pass --no-cache on the CLI) to bypass it.
+"""
+import marshal, os, threading, time
+
+from nomaanos.config import CACHE_DIR
+
+CACHE_FILE = os.path.join(CACHE_DIR, "results.cache")
+MAX_ENTRIES = 256
+
+_entries = None   # key -> (expires_at, value)
+_dirty = set()    # keys written or dropped since the file was read
+_registered = False
+# run_many, daemon, pipeline and doctor threads share the dict: every access holds this
+_lock = threading.RLock()
+
+def enabled():
+    return not os.environ.get("NOMAANOS_NO_CACHE")
+
+def _read_file():
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            data = marshal.load(f)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _load():
+    global _entries
+    with _lock:
+        if _entries is None:
+            _entries = _read_file()
+        return _entries
+
+def _evict(entries, now):
+    for k in [k for k, (exp, _) in list(entries.items()) if exp <= now]:
+        del entries[k]
+    # dicts keep insertion order and hits re-insert, so the front is least recent
+    excess = len(entries) - MAX_ENTRIES
+    if excess > 0:
+        for k in list(entries)[:excess]:
+            del entries[k]
+
+def flush():
+    """Merge this process's changes into the cache file (atomic replace)."""
+    global _dirty
+    with _lock:
+        if not _dirty or _entries is None:
+            return
+        on_disk = _read_file()
+        for k in list(_dirty):
+            if k in _entries:
+                on_disk[k] = _entries[k]
+            else:
+                on_disk.pop(k, None)
+        _evict(on_disk, time.time())
+        tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp, "wb") as f:
+                marshal.dump(on_disk, f)
+            os.replace(tmp, CACHE_FILE)
+        except (OSError, ValueError):
+            # ValueError: a value marshal can't store; keep it in-process only
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        _dirty = set()
+
+def _mark(key):
+    global _registered
+    with _lock:
+        _dirty.add(key)
+        if not _registered:
+            import atexit
+            atexit.register(flush)
+            _registered = True
+
+def get(key, default=None):
+    if not enabled():
+        return default
+    with _lock:
+        entries = _load()
+        hit = entries.get(key)
+        if hit is None:
+            return default
+        if hit[0] <= time.time():
+            del entries[key]
+            return default
+        entries[key] = entries.pop(key)  # most recently used goes last
+        return hit[1]
+
+def put(key, value, ttl):
+    if not enabled() or not ttl or ttl <= 0:
+        return value
+    with _lock:
+        entries = _load()
+        entries.pop(key, None)
+        entries[key] = (time.time() + ttl, value)
+        _evict(entries, time.time())
+        _mark(key)
+    return value
+
+_MISS = object()
+
+def cached(key, fn, ttl):
+    """Return the cached value for key, computing and storing fn() on a miss."""
+    value = get(key, _MISS)
+    if value is _MISS:
+        value = put(key, fn(), ttl)
+    return value
+
+def invalidate(prefix=""):
+    """Drop every key starting with prefix (all keys by default). Returns how many went."""
+    with _lock:
+        entries = _load()
+        on_disk = _read_file()
+        keys = {k for k in list(entries) + list(on_disk) if k.startswith(prefix)}
+        for k in keys:
+            entries.pop(k, None)
+            _mark(k)
+        flush()
+    return len(keys)
+
+def stats():
+    with _lock:
+        entries = _load()
+        now = time.time()
+        return {
+            "file": CACHE_FILE,
+            "entries": len(entries),
+            "live": sum(1 for exp, _ in entries.values() if exp > now),
+            "max_entries": MAX_ENTRIES,
+            "keys": sorted(entries),
+        }
@@ -1,6 +1,7 @@
-import json, os
+import os
 
-CONFIG_FILE = "/root/nomaanos_config.json"
+CONFIG_FILE = os.environ.get("NOMAANOS_CONFIG", "/root/nomaanos_config.json")
+CACHE_DIR = os.environ.get("NOMAANOS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nomaanos"))
 
 default_config = {
     "username": "Nomaan",
@@ -8,11 +9,156 @@ default_config = {
     "auto_backup": True
 }
 
+# parsed config keyed by the file's (mtime_ns, size, inode); re-read only when that changes
+_cache = None
+# updates staged inside `with batch():`, written once on exit
+_pending = None
+_depth = 0
+
+def _stat():
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _read():
+    import json
+    with open(CONFIG_FILE) as f:
+        return json.load(f)
+
+def _lock():
+    """Exclusive lock on CONFIG_FILE.lock; returns an fd to pass to _unlock()."""
+    try:
+        import fcntl
+    except ImportError:
+        return None
+    os.makedirs(os.path.dirname(os.path.abspath(CONFIG_FILE)), exist_ok=True)
+    fd = os.open(CONFIG_FILE + ".lock", os.O_CREAT | os.O_RDWR, 0o600)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    return fd
+
+def _unlock(fd):
+    if fd is not None:
+        os.close(fd)
+
+def _write(cfg):
+    """Replace CONFIG_FILE atomically: temp file in the same dir, fsync, rename."""
+    global _cache
+    import json
+    tmp = f"{CONFIG_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(cfg, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, CONFIG_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _cache = (_stat(), dict(cfg))
+
 def load():
-    if not os.path.exists(CONFIG_FILE):
+    global _cache
+    key = _stat()
+    if key is None:
         save(default_config)
-    return json.load(open(CONFIG_FILE))
+        key = _stat()
+    if _cache is None or _cache[0] != key:
+        _cache = (key, _read())
+    cfg = dict(_cache[1])
+    if _pending:
+        cfg.update(_pending)
+    return cfg
 
 def save(cfg):
-    json.dump(cfg, open(CONFIG_FILE, "w"), indent=4)
+    fd = _lock()
+    try:
+        _write(cfg)
+    finally:
+        _unlock(fd)
     return True
+
+def get(key, default=None):
+    return load().get(key, default)
+
+def peek(key, default=None):
+    """
+    get() for the hot path: never creates the file or takes the lock, and a
+    missing or unreadable config gives `default`. Shares load()'s parse cache.
+    """
+    global _cache
+    if _pending and key in _pending:
+        return _pending[key]
+    st = _stat()
+    if st is None:
+        return default
+    cached = _cache
+    if cached is None or cached[0] != st:
+        try:
+            cfg = _read()
+        except (OSError, ValueError):
+            return default
+        if not isinstance(cfg, dict):
+            return default
+        cached = _cache = (st, cfg)
+    return cached[1].get(key, default)
+
+def update(values):
+    """
+    Merge values into the config with one locked read-modify-write.
+    Inside `with batch():` the values are only staged.
+    """
+    global _pending
+    if _pending is not None:
+        _pending.update(values)
+        return load()
+    fd = _lock()
+    try:
+        # re-read under the lock so a concurrent writer's keys aren't lost
+        cfg = _read() if _stat() is not None else dict(default_config)
+        cfg.update(values)
+        _write(cfg)
+    finally:
+        _unlock(fd)
+    return dict(cfg)
+
+class batch:
+    """`with config.batch():` -- any number of update() calls, one write (and fsync) on exit."""
+
+    def __enter__(self):
+        global _pending, _depth
+        if _depth == 0:
+            _pending = {}
+        _depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _pending, _depth
+        _depth -= 1
+        if _depth:
+            return False
+        values, _pending = _pending, None
+        if exc_type is None and values:
+            update(values)
+        return False
+
+def coerce(value):
+    """CLI auto-typing: 'true'/'false' -> bool, digits -> int, anything else stays a string."""
+    if isinstance(value, str):
+        if value.lower() == "true":
+            return True
+        if value.lower() == "false":
+            return False
+        if value.isdigit():
+            return int(value)
+    return value
+
+def parse_pairs(args):
+    """['k1', 'v1', 'k2', 'v2'] -> {'k1': v1, 'k2': v2} with coerce() applied; a key without a value raises ValueError."""
+    if len(args) % 2:
+        raise ValueError(f"no value for key {args[-1]!r}")
+    return {args[i]: coerce(args[i + 1]) for i in range(0, len(args) - 1, 2)}
@@ -5,20 +5,35 @@ Run: python src/nomaanos/core.py
 """
 
 from datetime import datetime
-import platform
-import os
+import os, sys
+
+# python/platform only change on an upgrade, so probe them at most daily
+HOST_TTL = 24 * 3600
+
+def _now():
+    return datetime.utcnow().isoformat() + "Z"
+
+def _probe_host():
+    import platform
+    return {"python": platform.python_version(), "platform": platform.platform()}
+
+def host_facts():
+    """Static host facts ({"python", "platform"}), served from the result cache."""
+    from nomaanos import cache
+    return cache.cached(f"host:{sys.hexversion}", _probe_host, HOST_TTL)
 
 def info():
+    host = host_facts()
     return {
         "project": "NomaanOS",
-        "time": datetime.utcnow().isoformat() + "Z",
+        "time": _now(),
         "user": os.getenv("USER", "unknown"),
-        "python": platform.python_version(),
-        "platform": platform.platform()
+        "python": host["python"],
+        "platform": host["platform"]
     }
 
 def hello(name="Nomaan"):
-    return f"Hello, {name}! Welcome to NomaanOS. ({info()['time']})"
+    return f"Hello, {name}! Welcome to NomaanOS. ({_now()})"
 
 if __name__ == "__main__":
     print(hello())
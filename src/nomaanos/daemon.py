@@ -0,0 +1,339 @@
+"""
+Resident nomaanos daemon.
+`nomaanos serve` keeps one warm interpreter (modules imported, config loaded)
+listening on a Unix socket; the `nomaanos` entry point forwards commands to it
+when it is running and falls back to in-process execution otherwise.
+
+Wire format (one request per connection):
+  client -> cwd, then each NOMAANOS_*=value of its environment, an empty
+            field, then argv; fields joined by NUL bytes, then shutdown(SHUT_WR)
+  server -> everything the command prints, sent as it is flushed, then a
+            trailer of a NUL byte and the exit code
+Output streams: an ndjson record reaches the client when the module yields
+it, not when the command finishes, and the daemon holds at most
+STREAM_BUFFER bytes of a request's output at a time.
+
+Each request runs in the client's cwd and with the client's NOMAANOS_*
+environment. Requests with the same context run concurrently; one with a
+different context waits until those finish. Modules whose source changed
+since the daemon imported them are reloaded before the request runs.
+"""
+import os
+# the C module: `socket` itself drags in enum/selectors and costs more than the call
+import _socket
+
+from nomaanos.config import CACHE_DIR
+
+SOCKET_PATH = os.environ.get("NOMAANOS_SOCKET", os.path.join(CACHE_DIR, "nomaanos.sock"))
+# commands the daemon will answer; anything else always runs in-process
+DAEMON_COMMANDS = ("info", "hello", "modules", "run")
+CONNECT_TIMEOUT = 0.5
+STREAM_BUFFER = 64 * 1024
+
+def _recv_all(sock):
+    chunks = []
+    while True:
+        b = sock.recv(65536)
+        if not b:
+            break
+        chunks.append(b)
+    return b"".join(chunks)
+
+def _client_env():
+    return {k: v for k, v in os.environ.items() if k.startswith("NOMAANOS_") and k != "NOMAANOS_NO_DAEMON"}
+
+def _encode_request(argv):
+    head = [os.getcwd()] + [f"{k}={v}" for k, v in sorted(_client_env().items())]
+    return "\0".join(head + [""] + list(argv)).encode()
+
+def _decode_request(data):
+    """(cwd, env, argv) from a request; cwd is None for a bare argv (older clients)."""
+    fields = data.decode(errors="replace").split("\0")
+    if "" not in fields:
+        return None, {}, [a for a in fields if a]
+    i = fields.index("")
+    env = dict(f.partition("=")[::2] for f in fields[1:i])
+    return fields[0], env, [a for a in fields[i + 1:] if a]
+
+def call(argv, path=None, out=None):
+    """
+    Forward argv to a running daemon. Returns (exit_code, output) or None when
+    no daemon is listening, so the caller can run the command itself. With
+    `out`, output is written there as it arrives and the returned output is "".
+    """
+    import codecs, io
+    path = path or SOCKET_PATH
+    if not os.path.exists(path):
+        return None
+    sink = out if out is not None else io.StringIO()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    s = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        s.settimeout(CONNECT_TIMEOUT)
+        try:
+            s.connect(path)
+        except OSError:
+            return None
+        s.settimeout(None)
+        s.sendall(_encode_request(argv))
+        s.shutdown(_socket.SHUT_WR)
+        # everything from the last NUL on may be the trailer; hold only that back
+        tail, got = b"", False
+        while True:
+            b = s.recv(65536)
+            if not b:
+                break
+            got = True
+            data = tail + b
+            cut = data.rfind(b"\0")
+            if cut < 0 or len(data) - cut > 16:
+                cut = len(data)
+            data, tail = data[:cut], data[cut:]
+            if data:
+                sink.write(decoder.decode(data))
+                sink.flush()
+    finally:
+        s.close()
+    try:
+        rc = int(tail[1:]) if tail[:1] == b"\0" else None
+    except ValueError:
+        rc = None
+    if rc is None:
+        if not got:
+            return None  # nothing answered: let the caller run it
+        sink.write(decoder.decode(tail, final=True))
+        rc = 1  # the daemon went away mid-command
+    return rc, sink.getvalue() if out is None else ""
+
+def forward(argv):
+    """Client side of main(): stream the daemon's answer to stdout and return its exit code, or None."""
+    if os.environ.get("NOMAANOS_NO_DAEMON") or not argv or argv[0] not in DAEMON_COMMANDS:
+        return None
+    import sys
+    res = call(argv, out=sys.stdout)
+    return None if res is None else res[0]
+
+class _SocketOut:
+    """A request's stdout in the daemon: text goes to the client on flush or every STREAM_BUFFER bytes."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._buf = []
+        self._size = 0
+
+    def write(self, s):
+        self._buf.append(s)
+        self._size += len(s)
+        if self._size >= STREAM_BUFFER:
+            self.flush()
+        return len(s)
+
+    def flush(self):
+        if not self._buf:
+            return
+        data = "".join(self._buf).encode()
+        self._buf, self._size = [], 0
+        try:
+            self._sock.sendall(data)
+        except OSError:
+            pass  # client went away; the command still runs to completion
+
+class _ThreadStdout:
+    """sys.stdout replacement that sends each request thread's prints to its own buffer."""
+
+    def __init__(self, real):
+        import threading
+        self._real = real
+        self._local = threading.local()
+
+    def capture(self, buf):
+        self._local.buf = buf
+
+    def release(self):
+        self._local.buf = None
+
+    def _target(self):
+        return getattr(self._local, "buf", None) or self._real
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, attr):
+        return getattr(self._real, attr)
+
+class _Context:
+    """
+    cwd and NOMAANOS_* environment are process-wide: requests sharing a context
+    run together, a request with another context waits for them to finish.
+    """
+
+    def __init__(self):
+        import threading
+        self._cond = threading.Condition()
+        self._key = None
+        self._active = 0
+
+    def enter(self, cwd, env):
+        key = (cwd, tuple(sorted(env.items())))
+        with self._cond:
+            while self._active and self._key != key:
+                self._cond.wait()
+            if self._key != key:
+                _apply(cwd, env)
+                self._key = key
+            self._active += 1
+
+    def exit(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+def _apply(cwd, env):
+    for k in [k for k in os.environ if k.startswith("NOMAANOS_") and k not in env]:
+        del os.environ[k]
+    os.environ.update(env)
+    if cwd:
+        try:
+            os.chdir(cwd)
+        except OSError:
+            pass
+
+_reloader = None  # set up by serve(): (Reloader, lock)
+
+def _reload_changed():
+    """Reload modules edited since the daemon imported them; returns their names."""
+    if _reloader is None:
+        return []
+    reloader, lock = _reloader
+    with lock:
+        return reloader.reload_changed()
+
+def _warm():
+    """Import everything a request is likely to touch so the first call is already hot."""
+    from importlib import import_module
+    from nomaanos import config, core, registry
+    from nomaanos.modules import runner
+    try:
+        config.load()
+    except Exception:
+        pass
+    for name in registry.list_modules():
+        spec = registry.lookup(name)
+        try:
+            import_module(spec["module"])
+        except Exception:
+            # broken modules still report their error per request
+            pass
+
+def execute(argv, buf=None):
+    """
+    Run one CLI command inside the daemon; returns (exit_code, output).
+    With `buf` (a writable stream) the output goes there and "" is returned.
+    """
+    import io, sys
+    from nomaanos.main import COMMANDS
+    stream = buf is not None
+    buf = buf if stream else io.StringIO()
+    out = sys.stdout
+    if isinstance(out, _ThreadStdout):
+        out.capture(buf)
+    try:
+        _reload_changed()
+        handler = COMMANDS.get(argv[0]) if argv and argv[0] in DAEMON_COMMANDS else None
+        if handler is None:
+            print("Unknown command:", argv[0] if argv else "")
+            rc = 2
+        else:
+            rc = handler(argv[1:]) or 0
+    except SystemExit as e:
+        rc = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        print(f"[ERROR] {argv[0]}: {e}")
+        rc = 1
+    finally:
+        if isinstance(out, _ThreadStdout):
+            out.release()
+    return rc, "" if stream else buf.getvalue()
+
+def _cleanup(path):
+    """Remove a socket file nobody is listening on. Returns False if a daemon is alive."""
+    if not os.path.exists(path):
+        return True
+    s = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        s.connect(path)
+        return False
+    except OSError:
+        os.unlink(path)
+        return True
+    finally:
+        s.close()
+
+def serve(path=None):
+    """Run the daemon in the foreground until SIGINT/SIGTERM or `nomaanos serve --stop`."""
+    import signal, socketserver, sys, threading
+    path = path or SOCKET_PATH
+    if not _cleanup(path):
+        print(f"nomaanos daemon already running on {path}")
+        return 1
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _warm()
+    global _reloader
+    from nomaanos.shell import Reloader
+    reloader = Reloader()
+    reloader.track()
+    _reloader = (reloader, threading.Lock())
+    context = _Context()
+    sys.stdout = _ThreadStdout(sys.stdout)
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            cwd, env, argv = _decode_request(_recv_all(self.request))
+            if argv == ["__stop__"]:
+                self.request.sendall(b"stopping\n\x000")
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            out = _SocketOut(self.request)
+            rc = 1
+            context.enter(cwd, env)
+            try:
+                rc, _ = execute(argv, out)
+            finally:
+                context.exit()
+                out.flush()
+                try:
+                    self.request.sendall(f"\0{rc}".encode())
+                except OSError:
+                    pass
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    srv = Server(path, Handler)
+    os.chmod(path, 0o600)
+    signal.signal(signal.SIGTERM, lambda *a: threading.Thread(target=srv.shutdown, daemon=True).start())
+    sys.stdout._real.write(f"nomaanos daemon listening on {path}\n")
+    sys.stdout._real.flush()
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        sys.stdout = sys.stdout._real
+    return 0
+
+def stop(path=None):
+    res = call(["__stop__"], path)
+    if res is None:
+        print("nomaanos daemon not running")
+        return 1
+    print(res[1].strip())
+    return 0
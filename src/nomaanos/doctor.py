@@ -0,0 +1,306 @@
+"""
+`nomaanos doctor`: diagnose an install in well under a second.
+
+    nomaanos doctor [--format json] [--no-cache]
+
+Checks run concurrently, in this process except for one launch of the
+installed console script:
+
+  entry points   console_scripts metadata resolves, the `nomaanos` on PATH has
+                 a working interpreter and answers `info --format json`
+  config         the config file is readable JSON holding an object
+  import <name>  every registered module imports and has an entry callable
+  json output    `run sysinfo` and `info` emit JSON with project and time
+
+A passing check is remembered by a hash of the files it depends on (and the
+Python version), so the next run only re-checks what changed; --no-cache
+forces every check. Exit code 1 when any check fails.
+"""
+import os, sys, time
+
+DOCTOR_TTL = 7 * 86400
+SCRIPT_TIMEOUT = 5.0
+PKG_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class DoctorError(RuntimeError):
+    pass
+
+class DoctorWarning(Exception):
+    """Not broken, but worth a look (reported as WARN)."""
+
+class Check:
+    """One diagnosis: fn() returns a detail string (ok) or raises DoctorError (fail)."""
+
+    def __init__(self, name, fn, files=None):
+        self.name = name
+        self.fn = fn
+        self.files = files  # None: never cached
+
+_hashes = {}  # path -> ((mtime_ns, size), sha1)
+
+def _file_hash(path):
+    """sha1 of a file's content, re-read only when its stat changed (the daemon and shell live long)."""
+    import hashlib
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "-"
+    stamp = (st.st_mtime_ns, st.st_size)
+    hit = _hashes.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    try:
+        with open(path, "rb") as f:
+            h = hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return "-"
+    _hashes[path] = (stamp, h)
+    return h
+
+def _key(check):
+    import hashlib
+    files = check.files() if callable(check.files) else check.files
+    h = hashlib.sha1(sys.version.encode())
+    for p in sorted(files):
+        h.update(f"{p}\0{_file_hash(p)}\0".encode())
+    return h.hexdigest()
+
+def _package_files(root=PKG_DIR):
+    out = []
+    for d, dirs, files in os.walk(root):
+        dirs[:] = [x for x in dirs if x != "__pycache__"]
+        out.extend(os.path.join(d, f) for f in files if f.endswith(".py"))
+    return out
+
+# --- checks ------------------------------------------------------------------
+
+def _script():
+    import shutil
+    return shutil.which("nomaanos")
+
+def _resolve(ep):
+    """
+    File an entry point resolves to, as a fresh interpreter would see it.
+    Not ep.load(): once the CLI has run, `nomaanos.main` in this process is
+    the submodule that shadows the package-level function.
+    """
+    import ast
+    from importlib.util import find_spec
+    module, _, attr = ep.value.partition(":")
+    try:
+        spec = find_spec(module.strip())
+    except (ImportError, ValueError) as e:
+        raise DoctorError(f"entry point {ep.value}: {type(e).__name__}: {e}") from None
+    if spec is None or not spec.origin:
+        raise DoctorError(f"entry point {ep.value}: module {module} not found")
+    attr = attr.strip().split(".")[0]
+    if attr and spec.origin.endswith(".py"):
+        with open(spec.origin, "rb") as f:
+            tree = ast.parse(f.read(), spec.origin)
+        names = set()
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(node.name)
+            elif isinstance(node, ast.Assign):
+                names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                names.update((a.asname or a.name).split(".")[0] for a in node.names)
+        if attr not in names:
+            raise DoctorError(f"entry point {ep.value}: {spec.origin} defines no {attr!r}")
+    return spec.origin
+
+def check_entry_points():
+    import json, subprocess
+    from importlib import metadata
+    try:
+        eps = metadata.distribution("nomaanos").entry_points
+    except metadata.PackageNotFoundError:
+        eps = ()
+    ours = [ep for ep in eps if ep.group == "console_scripts" and ep.name == "nomaanos"]
+    notes = []
+    for ep in ours:
+        notes.append(f"{ep.value} -> {_resolve(ep)}")
+    import nomaanos
+    where = os.path.dirname(os.path.abspath(nomaanos.__file__))
+    notes.append(f"package {where}")
+    script = _script()
+    if script is None:
+        raise DoctorWarning("; ".join(notes + ["no `nomaanos` on PATH (run scripts/install_nomaanos.sh)"]))
+    with open(script, "rb") as f:
+        first = f.readline().decode(errors="replace").strip()
+    if first.startswith("#!"):
+        interp = first[2:].split()
+        if interp and interp[0] != "/usr/bin/env" and not os.access(interp[0], os.X_OK):
+            raise DoctorError(f"{script} wants interpreter {interp[0]}, which does not exist")
+    env = dict(os.environ, NOMAANOS_NO_DAEMON="1")
+    try:
+        proc = subprocess.run([script, "info", "--format", "json"], capture_output=True,
+                              timeout=SCRIPT_TIMEOUT, env=env)
+    except subprocess.TimeoutExpired:
+        raise DoctorError(f"{script} info did not answer within {SCRIPT_TIMEOUT:g}s") from None
+    except OSError as e:
+        raise DoctorError(f"{script} does not start: {e}") from None
+    if proc.returncode != 0:
+        err = (proc.stderr or proc.stdout).decode(errors="replace").strip().splitlines()
+        raise DoctorError(f"{script} exited {proc.returncode}: {err[-1] if err else '(no output)'}")
+    try:
+        json.loads(proc.stdout)
+    except ValueError:
+        raise DoctorError(f"{script} info --format json printed non-JSON: {proc.stdout[:60]!r}") from None
+    if not ours:
+        notes.append("no console_scripts metadata (running from a bundle or source tree?)")
+    return "; ".join(notes + [f"{script} ok"])
+
+def _entry_files():
+    files = [os.path.join(PKG_DIR, f) for f in ("__init__.py", "__main__.py", "main.py", "core.py", "output.py")]
+    script = _script()
+    return files + ([script] if script else [])
+
+def check_config():
+    import json
+    from nomaanos import config
+    path = config.CONFIG_FILE
+    if not os.path.exists(path):
+        return f"{path} not created yet (defaults in use)"
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except OSError as e:
+        raise DoctorError(f"cannot read {path}: {e}") from None
+    except ValueError as e:
+        raise DoctorError(f"{path} is not valid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise DoctorError(f"{path} holds a {type(data).__name__}, expected an object")
+    return f"{path} ({len(data)} keys)"
+
+def _config_files():
+    from nomaanos import config
+    return [config.CONFIG_FILE]
+
+def _import_check(spec):
+    def fn():
+        from nomaanos import registry
+        try:
+            entry = registry.load(spec)
+        except Exception as e:
+            raise DoctorError(f"{spec['module']}: {type(e).__name__}: {e}") from None
+        if entry is None:
+            raise DoctorError(f"{spec['module']} has no main()/run() entry point")
+        return f"{spec['module']}.{entry.__name__}"
+    return fn
+
+def _json_of(argv):
+    import io, json
+    from nomaanos.main import COMMANDS
+    buf = io.StringIO()
+    out = sys.stdout
+    out.capture(buf)
+    try:
+        rc = COMMANDS[argv[0]](argv[1:]) or 0
+    finally:
+        out.release()
+    text = buf.getvalue()
+    if rc:
+        raise DoctorError(f"`{' '.join(argv)}` exited {rc}: {text.strip()[-120:]}")
+    try:
+        return json.loads(text)
+    except ValueError:
+        raise DoctorError(f"`{' '.join(argv)}` printed non-JSON: {text[:60]!r}") from None
+
+def check_json_output():
+    notes = []
+    for argv in (["run", "sysinfo", "--format", "json"], ["info", "--format", "json"]):
+        data = _json_of(argv)
+        if isinstance(data, dict) and "error" in data:
+            raise DoctorError(f"`{' '.join(argv)}` returned an error: {data['error']}")
+        if not isinstance(data, dict):
+            raise DoctorError(f"`{' '.join(argv)}` returned {str(data)[:120]!r}, expected an object")
+        if argv[0] == "run":
+            missing = [k for k in ("project", "time") if k not in data]
+            if missing:
+                raise DoctorError(f"`{' '.join(argv)}` lacks {', '.join(missing)}")
+        notes.append(f"{argv[0]} ok")
+    return ", ".join(notes)
+
+def checks():
+    from nomaanos import registry
+    out = [
+        Check("entry points", check_entry_points, _entry_files),
+        Check("config", check_config, _config_files),
+    ]
+    data = registry.manifest()
+    for name, spec in sorted(registry._all(data).items()):
+        # builtin sources sit in MODULE_DIR; anything else is re-checked every time
+        builtin = spec.get("source") == "builtin" and registry.BUNDLED is None
+        files = [os.path.join(registry.MODULE_DIR, name + ".py")] if builtin else None
+        out.append(Check(f"import {name}", _import_check(spec), files))
+    # inside a bundle there are no sources to hash: always re-check
+    out.append(Check("json output", check_json_output, _package_files if registry.BUNDLED is None else None))
+    return out
+
+# --- driver ------------------------------------------------------------------
+
+def _run_one(check):
+    from nomaanos import cache
+    t0 = time.perf_counter()
+    key = None
+    if check.files is not None:
+        try:
+            key = _key(check)
+        except Exception:
+            key = None
+        if key is not None and cache.get(f"doctor:{check.name}") == key:
+            return {"check": check.name, "status": "ok", "detail": "unchanged since last pass",
+                    "ms": round((time.perf_counter() - t0) * 1000, 2), "cached": True}
+    try:
+        detail, status = check.fn(), "ok"
+    except DoctorWarning as e:
+        detail, status = str(e), "warn"
+    except DoctorError as e:
+        detail, status = str(e), "fail"
+    except Exception as e:
+        detail, status = f"{type(e).__name__}: {e}", "fail"
+    if status == "ok" and key is not None:
+        cache.put(f"doctor:{check.name}", key, DOCTOR_TTL)
+    return {"check": check.name, "status": status, "detail": detail,
+            "ms": round((time.perf_counter() - t0) * 1000, 2), "cached": False}
+
+def diagnose(jobs=None):
+    """Run every check concurrently; returns the list of results in check order."""
+    from concurrent.futures import ThreadPoolExecutor
+    from nomaanos import daemon
+    todo = checks()
+    # each check captures its own prints (import-time chatter, the json probes)
+    wrapped = not isinstance(sys.stdout, daemon._ThreadStdout)
+    if wrapped:
+        sys.stdout = daemon._ThreadStdout(sys.stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs or min(16, len(todo))) as pool:
+            results = list(pool.map(_run_one, todo))
+    finally:
+        if wrapped:
+            sys.stdout = sys.stdout._real
+    return results
+
+MARKS = {"ok": "ok  ", "warn": "WARN", "fail": "FAIL"}
+
+def cli(args):
+    """Handler for `nomaanos doctor`."""
+    from nomaanos.output import emit, pop_format
+    args, fmt = pop_format(args)
+    if args:
+        print("Usage: nomaanos doctor [--format json] [--no-cache]")
+        return 1
+    t0 = time.perf_counter()
+    results = diagnose()
+    wall = round((time.perf_counter() - t0) * 1000, 2)
+    failed = sum(r["status"] == "fail" for r in results)
+    if fmt:
+        emit({"checks": results, "failed": failed, "ms": wall}, fmt)
+    else:
+        width = max(len(r["check"]) for r in results)
+        for r in results:
+            print(f"{MARKS[r['status']]}  {r['check']:{width}}  {r['ms']:8.2f} ms  {r['detail']}")
+        cached = sum(r["cached"] for r in results)
+        print(f"{len(results)} checks, {failed} failed, {cached} cached, {wall:.0f} ms")
+    return 1 if failed else 0
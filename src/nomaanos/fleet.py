@@ -0,0 +1,358 @@
+"""
+Fan-out to NomaanOS agents on other devices.
+
+`nomaanos agent` serves module runs over TCP; `--hosts` on `run` and
+`modules` sends the request to every listed host at once:
+
+    nomaanos agent [--bind 0.0.0.0 [--insecure]] [--port 7878]
+    nomaanos run sysinfo --hosts phone,tablet:7879,@lab [--timeout 5]
+    nomaanos modules --hosts phone,tablet
+
+Wire format, both directions: 4-byte big-endian length + UTF-8 JSON.
+  request  {"id": 1, "op": "run", "name": "sysinfo", "token": "..."}
+           {"id": 2, "op": "modules"} / {"id": 3, "op": "ping"}
+  response {"id": 1, "ok": true, "result": ..., "stdout": "..."}
+           {"id": 1, "ok": false, "error": "..."}
+A connection carries any number of requests. The client writes them all
+before reading (pipelining) and the agent answers each as it finishes, so
+responses may come back out of order and are matched by id.
+
+Connections are pooled per host for the life of the process (the daemon,
+shell or scheduler keep them warm), and hosts are gathered concurrently,
+each against its own timeout. A fleet-wide call costs about one round trip.
+
+Config: agent_port (7878), agent_timeout (10s), agent_token (shared secret;
+required by the agent when set, also NOMAANOS_AGENT_TOKEN) and "hosts",
+named groups usable as @group: {"lab": ["phone", "tablet:7879"]}.
+The agent only runs modules known to the registry, and refuses to bind a
+non-loopback address without a token unless started with --insecure.
+"""
+import json, os, struct, threading, time
+
+DEFAULT_PORT = 7878
+DEFAULT_TIMEOUT = 10.0
+MAX_FRAME = 64 * 1024 * 1024
+_HEADER = struct.Struct(">I")
+
+class FleetError(OSError):
+    pass
+
+# --- framing -----------------------------------------------------------------
+
+def encode(obj):
+    data = json.dumps(obj, default=str, separators=(",", ":")).encode()
+    return _HEADER.pack(len(data)) + data
+
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return bytes(buf)
+
+def read_frame(sock):
+    """Next decoded frame, or None when the peer closed the connection."""
+    head = _recv_exact(sock, _HEADER.size)
+    if head is None:
+        return None
+    (n,) = _HEADER.unpack(head)
+    if n > MAX_FRAME:
+        raise FleetError(f"frame of {n} bytes exceeds {MAX_FRAME}")
+    data = _recv_exact(sock, n)
+    if data is None:
+        return None
+    return json.loads(data)
+
+# --- settings ----------------------------------------------------------------
+
+def _settings():
+    from nomaanos import config
+    cfg = config.load()
+    return {
+        "port": int(cfg.get("agent_port", DEFAULT_PORT)),
+        "timeout": float(cfg.get("agent_timeout", DEFAULT_TIMEOUT)),
+        "token": os.environ.get("NOMAANOS_AGENT_TOKEN", cfg.get("agent_token")),
+        "groups": cfg.get("hosts") or {},
+    }
+
+def parse_hosts(spec, port=DEFAULT_PORT, groups=None):
+    """'a,b:7879,@lab' -> [("a", 7878), ("b", 7879), ...] (deduplicated, in order)."""
+    groups = groups or {}
+    out = []
+    for h in (x.strip() for x in spec.split(",")):
+        if not h:
+            continue
+        if h.startswith("@"):
+            members = groups.get(h[1:])
+            if members is None:
+                raise FleetError(f"unknown host group {h!r}")
+            out.extend(parse_hosts(",".join(members), port, groups))
+            continue
+        host, sep, p = h.rpartition(":")
+        if sep and p.isdigit() and "]" not in p:
+            out.append((host.strip("[]"), int(p)))
+        else:
+            out.append((h.strip("[]"), port))
+    return list(dict.fromkeys(out))
+
+def pop_hosts(args):
+    """Strip --hosts X / --hosts=X from args; returns (args, spec or None)."""
+    out, spec = [], None
+    it = iter(args)
+    for a in it:
+        if a == "--hosts" or a.startswith("--hosts="):
+            spec = next(it, None) if a == "--hosts" else a.partition("=")[2]
+            # an empty list must not quietly fall back to running locally
+            if not spec or not spec.strip(" ,"):
+                raise ValueError("--hosts expects a comma-separated list of hosts")
+        else:
+            out.append(a)
+    return out, spec
+
+def _hosts(spec, s):
+    hosts = parse_hosts(spec, s["port"], s["groups"])
+    if not hosts:
+        raise FleetError(f"no hosts in {spec!r}")
+    return hosts
+
+# --- client ------------------------------------------------------------------
+
+class Connection:
+    def __init__(self, addr, timeout):
+        import socket
+        self.addr = addr
+        self.sock = socket.create_connection(addr, timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reused = False
+
+    def exchange(self, requests, deadline, got):
+        """Send every request, then collect the responses into got {id: response}."""
+        self.sock.settimeout(max(0.001, deadline - time.monotonic()))
+        self.sock.sendall(b"".join(encode(r) for r in requests))
+        want = {r["id"] for r in requests}
+        while want - got.keys():
+            self.sock.settimeout(max(0.001, deadline - time.monotonic()))
+            resp = read_frame(self.sock)
+            if resp is None:
+                raise FleetError("agent closed the connection")
+            got[resp.get("id")] = resp
+        return got
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+_pool = {}  # (host, port) -> [idle Connection]
+_pool_lock = threading.Lock()
+_ids = iter(range(1, 1 << 62))
+
+def _checkout(addr, timeout):
+    with _pool_lock:
+        idle = _pool.get(addr)
+        if idle:
+            conn = idle.pop()
+            conn.reused = True
+            return conn
+    return Connection(addr, timeout)
+
+def _checkin(conn):
+    with _pool_lock:
+        _pool.setdefault(conn.addr, []).append(conn)
+
+def close_pool():
+    with _pool_lock:
+        conns = [c for idle in _pool.values() for c in idle]
+        _pool.clear()
+    for c in conns:
+        c.close()
+
+def _host_call(addr, requests, timeout):
+    """Responses in request order; requests still unanswered at the deadline get an error."""
+    deadline = time.monotonic() + timeout
+    got = {}
+    for attempt in (0, 1):
+        try:
+            conn = _checkout(addr, timeout)
+        except TimeoutError:
+            break
+        try:
+            conn.exchange(requests, deadline, got)
+        except TimeoutError:
+            conn.close()  # late answers would land on the next user of this socket
+            break
+        except (OSError, ValueError):
+            conn.close()
+            # a pooled connection may have been dropped by a restarted agent: redial once
+            if attempt == 0 and conn.reused and not got:
+                continue
+            raise
+        _checkin(conn)
+        break
+    missing = {"ok": False, "error": f"timed out after {timeout}s"}
+    return [got.get(r["id"], missing) for r in requests]
+
+def gather(hosts, requests, timeout=None, token=None):
+    """
+    Send the same requests to every host concurrently.
+    Returns {"host:port": [response, ...]}; an unreachable host gets
+    {"ok": False, "error": ...} for each request, a slow one for each request
+    it hadn't answered when its timeout ran out.
+    """
+    timeout = timeout or DEFAULT_TIMEOUT
+    results = {}
+
+    def work(addr):
+        reqs = [dict(r, id=next(_ids), token=token) if token else dict(r, id=next(_ids)) for r in requests]
+        key = f"{addr[0]}:{addr[1]}"
+        try:
+            results[key] = _host_call(addr, reqs, timeout)
+        except (OSError, ValueError) as e:
+            results[key] = [{"ok": False, "error": f"{type(e).__name__}: {e}"}] * len(reqs)
+
+    threads = [threading.Thread(target=work, args=(a,), name=f"nomaanos-fleet-{a[0]}", daemon=True)
+               for a in hosts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {f"{a[0]}:{a[1]}": results[f"{a[0]}:{a[1]}"] for a in hosts}
+
+def _unwrap(resp):
+    return resp.get("result") if resp.get("ok") else {"error": resp.get("error")}
+
+def run(spec, names, timeout=None):
+    """{host: result} for one module, {host: {module: result}} for several."""
+    s = _settings()
+    hosts = _hosts(spec, s)
+    out = gather(hosts, [{"op": "run", "name": n} for n in names], timeout or s["timeout"], s["token"])
+    if len(names) == 1:
+        return {h: _unwrap(r[0]) for h, r in out.items()}
+    return {h: {n: _unwrap(x) for n, x in zip(names, r)} for h, r in out.items()}
+
+def modules(spec, timeout=None):
+    s = _settings()
+    hosts = _hosts(spec, s)
+    out = gather(hosts, [{"op": "modules"}], timeout or s["timeout"], s["token"])
+    return {h: _unwrap(r[0]) for h, r in out.items()}
+
+# --- agent -------------------------------------------------------------------
+
+def _answer(req, token):
+    """Handle one request inside the agent; module prints go back in "stdout"."""
+    import hmac, io, sys
+    rid = req.get("id")
+    if token and not hmac.compare_digest(str(req.get("token") or ""), str(token)):
+        return {"id": rid, "ok": False, "error": "bad agent token"}
+    op = req.get("op")
+    buf = io.StringIO()
+    out = sys.stdout
+    capture = hasattr(out, "capture")
+    if capture:
+        out.capture(buf)
+    try:
+        if op == "ping":
+            result = "pong"
+        elif op == "modules":
+            from nomaanos.modules import list_modules
+            result = list_modules()
+        elif op == "run":
+            from nomaanos import registry
+            from nomaanos.modules import runner
+            from nomaanos.output import materialise
+            name = req.get("name")
+            # registered modules only: never the runner's import-anything fallback
+            if not isinstance(name, str) or registry.lookup(name) is None:
+                return {"id": rid, "ok": False, "error": f"unknown module {name!r}"}
+            result = materialise(runner.run(name))
+        else:
+            return {"id": rid, "ok": False, "error": f"unknown op {op!r}"}
+        return {"id": rid, "ok": True, "result": result, "stdout": buf.getvalue()}
+    except Exception as e:
+        return {"id": rid, "ok": False, "error": f"{type(e).__name__}: {e}", "stdout": buf.getvalue()}
+    finally:
+        if capture:
+            out.release()
+
+def serve(bind="127.0.0.1", port=None, insecure=False):
+    """Run the agent in the foreground until SIGINT/SIGTERM."""
+    import signal, socketserver, sys
+    from nomaanos import daemon
+    s = _settings()
+    port = s["port"] if port is None else port
+    token = s["token"]
+    if bind not in ("127.0.0.1", "localhost", "::1") and not token:
+        if not insecure:
+            print(f"[ERROR] agent: refusing to listen on {bind} without agent_token;"
+                  " set one (nomaanos set agent_token ...) or pass --insecure")
+            return 1
+        print("[WARN] agent reachable from the network without agent_token; anyone can run modules")
+    daemon._warm()
+    sys.stdout = daemon._ThreadStdout(sys.stdout)
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            import socket
+            sock = self.request
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            wlock = threading.Lock()
+
+            def reply(req):
+                data = encode(_answer(req, token))
+                with wlock:
+                    try:
+                        sock.sendall(data)
+                    except OSError:
+                        pass  # client went away
+
+            while True:
+                try:
+                    req = read_frame(sock)
+                except (OSError, ValueError):
+                    break
+                if req is None:
+                    break
+                threading.Thread(target=reply, args=(req,), daemon=True).start()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    srv = Server((bind, port), Handler)
+    signal.signal(signal.SIGTERM, lambda *a: threading.Thread(target=srv.shutdown, daemon=True).start())
+    sys.stdout._real.write(f"nomaanos agent listening on {bind}:{srv.server_address[1]}\n")
+    sys.stdout._real.flush()
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        sys.stdout = sys.stdout._real
+    return 0
+
+def cli(args):
+    """Handler for `nomaanos agent ...`."""
+    from nomaanos.output import next_number
+    bind, port, insecure = "127.0.0.1", None, False
+    it = iter(args)
+    try:
+        for a in it:
+            if a == "--bind":
+                bind = next(it, bind)
+            elif a == "--port":
+                port = next_number(it, a, int)
+                if not 0 <= port <= 65535:
+                    raise ValueError(f"--port expects 0-65535, got {port}")
+            elif a == "--insecure":
+                insecure = True
+            else:
+                print("Usage: nomaanos agent [--bind ADDRESS [--insecure]] [--port N]")
+                return 1
+    except ValueError as e:
+        print(f"[ERROR] agent: {e}")
+        return 2
+    return serve(bind, port, insecure)
@@ -0,0 +1,330 @@
+"""
+Run history: every module invocation (module, start, duration, status,
+result) appended to a local sqlite3 database for trends and comparisons.
+
+Off by default; turn it on with `nomaanos set history true` or
+NOMAANOS_HISTORY=1 (NOMAANOS_HISTORY=0 forces it off). The database is
+NOMAANOS_HISTORY_DB or CACHE_DIR/history.db, in WAL mode with indexes on
+(module, started) and (started). Each insert batch also upserts per-module
+hourly rollups (runs, errors, duration sum/min/max), so --stats over months
+of runs reads a few hundred rollup rows plus the raw rows of the partial
+hours at either end of the range.
+
+Recording only appends to an in-process list; rows reach the database in
+one executemany() transaction when BATCH rows are pending, FLUSH_SECS after
+the first pending row (daemon, scheduler) or at exit. sqlite3 and json are
+imported on the first flush, never on the run path.
+
+  nomaanos history [<module>] [--since 1h|7d|2026-10-01] [--until ...]
+                   [--status ok|error] [--limit N] [--stats] [--format json]
+  nomaanos history clear [--before 30d]
+"""
+import os, threading, time
+
+from nomaanos.config import CACHE_DIR
+from nomaanos.output import is_stream
+
+DB_FILE = os.environ.get("NOMAANOS_HISTORY_DB", os.path.join(CACHE_DIR, "history.db"))
+BATCH = 256
+FLUSH_SECS = 2.0
+MAX_PAYLOAD = 64 * 1024  # larger results are stored truncated
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    module TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_module_started ON runs (module, started);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+CREATE TABLE IF NOT EXISTS hourly (
+    module TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    runs INTEGER NOT NULL,
+    errors INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    first REAL NOT NULL,
+    last REAL NOT NULL,
+    PRIMARY KEY (module, hour)
+) WITHOUT ROWID;
+"""
+ROLLUP_UPSERT = """
+INSERT INTO hourly (module, hour, runs, errors, total, min, max, first, last)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (module, hour) DO UPDATE SET
+    runs = runs + excluded.runs, errors = errors + excluded.errors, total = total + excluded.total,
+    min = MIN(min, excluded.min), max = MAX(max, excluded.max),
+    first = MIN(first, excluded.first), last = MAX(last, excluded.last)
+"""
+RAW_AGG = ("SELECT module, COUNT(*), SUM(status = 'error'), SUM(duration), MIN(duration), MAX(duration),"
+           " MIN(started), MAX(started) FROM runs{where} GROUP BY module")
+ROLLUP_AGG = ("SELECT module, SUM(runs), SUM(errors), SUM(total), MIN(min), MAX(max), MIN(first), MAX(last)"
+              " FROM hourly{where} GROUP BY module")
+
+_pending = []
+_lock = threading.Lock()
+_timer = None
+_registered = False
+
+def enabled():
+    """
+    Whether runs are recorded. Uses config.peek(): the run path must never
+    write the config, and a missing or unreadable one just means off.
+    """
+    env = os.environ.get("NOMAANOS_HISTORY")
+    if env is not None:
+        return env not in ("", "0", "false")
+    from nomaanos import config
+    return bool(config.peek("history", False))
+
+def connect(path=None):
+    import sqlite3
+    path = path or DB_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    con = sqlite3.connect(path, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    con.executescript(SCHEMA)
+    return con
+
+def _payload(result):
+    import json
+    try:
+        text = json.dumps(result, default=str, separators=(",", ":"))
+    except (TypeError, ValueError):
+        text = json.dumps(repr(result))
+    return text if len(text) <= MAX_PAYLOAD else text[:MAX_PAYLOAD]
+
+def status_of(result):
+    if is_stream(result):
+        return "stream"
+    if isinstance(result, dict) and "error" in result:
+        return "error"
+    return "ok"
+
+def record(module, started, duration, status, result=None):
+    """Queue one run; cheap enough to call on every invocation, and never raises."""
+    global _timer, _registered
+    try:
+        with _lock:
+            _pending.append((module, started, duration, status, None if status == "stream" else result))
+            n = len(_pending)
+            if not _registered:
+                import atexit
+                atexit.register(flush)
+                _registered = True
+            if n == 1 and _timer is None:
+                # long-lived processes (daemon, scheduler) shouldn't wait for exit
+                _timer = threading.Timer(FLUSH_SECS, flush)
+                _timer.daemon = True
+                _timer.start()
+        if n >= BATCH:
+            flush()
+    except Exception:
+        # history is best-effort; it must not fail the run it describes
+        pass
+
+def flush():
+    """Write the pending rows in one transaction."""
+    global _timer
+    with _lock:
+        rows = _pending[:]
+        del _pending[:]
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not rows:
+        return 0
+    import sqlite3
+    try:
+        con = connect()
+        with con:
+            con.executemany("INSERT INTO runs (module, started, duration, status, result) VALUES (?, ?, ?, ?, ?)",
+                            [(m, s, d, st, None if r is None else _payload(r)) for m, s, d, st, r in rows])
+            con.executemany(ROLLUP_UPSERT, _rollup(rows))
+        con.close()
+    except (sqlite3.Error, OSError):
+        # history is best-effort; a locked or read-only store must not fail the run
+        return 0
+    return len(rows)
+
+def _rollup(rows):
+    """Fold a batch into (module, hour, runs, errors, total, min, max, first, last) rows."""
+    acc = {}
+    for m, s, d, st, _ in rows:
+        key = (m, int(s // 3600))
+        a = acc.get(key)
+        if a is None:
+            acc[key] = [1, st == "error", d, d, d, s, s]
+        else:
+            a[0] += 1
+            a[1] += st == "error"
+            a[2] += d
+            a[3] = min(a[3], d)
+            a[4] = max(a[4], d)
+            a[5] = min(a[5], s)
+            a[6] = max(a[6], s)
+    return [(m, h, a[0], int(a[1]), a[2], a[3], a[4], a[5], a[6]) for (m, h), a in acc.items()]
+
+def parse_time(spec, now=None):
+    """'90s' / '15m' / '2h' / '7d' ago, an ISO date/time, or epoch seconds -> epoch seconds."""
+    now = time.time() if now is None else now
+    s = str(spec).strip()
+    if s[-1:] in ("s", "m", "h", "d") and s[:-1].replace(".", "", 1).isdigit():
+        from nomaanos.schedule import parse_interval
+        return now - parse_interval(s)
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    from datetime import datetime
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        raise ValueError(f"bad time {spec!r}; expected e.g. 1h, 7d, 2026-10-01 or epoch seconds") from None
+
+def _where(module=None, since=None, until=None, status=None):
+    clauses, args = [], []
+    for col, op, val in (("module", "=", module), ("started", ">=", since),
+                         ("started", "<", until), ("status", "=", status)):
+        if val is not None:
+            clauses.append(f"{col} {op} ?")
+            args.append(val)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+def query(module=None, since=None, until=None, status=None, limit=100):
+    """Newest-first runs as dicts, payloads decoded."""
+    import json
+    flush()
+    where, args = _where(module, since, until, status)
+    con = connect()
+    try:
+        cur = con.execute(f"SELECT module, started, duration, status, result FROM runs{where}"
+                          " ORDER BY started DESC LIMIT ?", args + [limit])
+        rows = cur.fetchall()
+    finally:
+        con.close()
+    out = []
+    for m, s, d, st, r in rows:
+        try:
+            res = json.loads(r) if r is not None else None
+        except ValueError:
+            res = r  # truncated payload
+        out.append({"module": m, "started": s, "duration": d, "status": st, "result": res})
+    return out
+
+def _merge(acc, rows):
+    for m, n, e, total, lo, hi, first, last in rows:
+        if not n:
+            continue
+        a = acc.get(m)
+        if a is None:
+            acc[m] = [n, e or 0, total, lo, hi, first, last]
+        else:
+            a[0] += n
+            a[1] += e or 0
+            a[2] += total
+            a[3] = min(a[3], lo)
+            a[4] = max(a[4], hi)
+            a[5] = min(a[5], first)
+            a[6] = max(a[6], last)
+
+def stats(module=None, since=None, until=None, status=None):
+    """Per-module aggregates: runs, errors, avg/min/max duration, first/last start."""
+    flush()
+    con = connect()
+    acc = {}
+    try:
+        # whole hours inside [since, until) come from the rollups, the ragged ends from raw rows
+        h0 = -(-since // 3600) if since is not None else None
+        h1 = until // 3600 if until is not None else None
+        if status is not None or (h0 is not None and h1 is not None and h0 >= h1):
+            where, args = _where(module, since, until, status)
+            _merge(acc, con.execute(RAW_AGG.format(where=where), args))
+        else:
+            clauses, args = [], []
+            for cond, val in (("module = ?", module), ("hour >= ?", h0), ("hour < ?", h1)):
+                if val is not None:
+                    clauses.append(cond)
+                    args.append(val)
+            where = " WHERE " + " AND ".join(clauses) if clauses else ""
+            _merge(acc, con.execute(ROLLUP_AGG.format(where=where), args))
+            if since is not None:
+                where, args = _where(module, since, h0 * 3600)
+                _merge(acc, con.execute(RAW_AGG.format(where=where), args))
+            if until is not None:
+                where, args = _where(module, h1 * 3600, until)
+                _merge(acc, con.execute(RAW_AGG.format(where=where), args))
+    finally:
+        con.close()
+    return {m: {"runs": n, "errors": e, "avg": round(total / n, 6), "min": round(lo, 6), "max": round(hi, 6),
+                "first": first, "last": last}
+            for m, (n, e, total, lo, hi, first, last) in sorted(acc.items())}
+
+def clear(before=None):
+    """Delete runs started before `before` (all runs if None); returns the count."""
+    flush()
+    con = connect()
+    try:
+        with con:
+            if before is None:
+                n = con.execute("DELETE FROM runs").rowcount
+                con.execute("DELETE FROM hourly")
+            else:
+                n = con.execute("DELETE FROM runs WHERE started < ?", (before,)).rowcount
+                hour = int(before // 3600)
+                con.execute("DELETE FROM hourly WHERE hour <= ?", (hour,))
+                # the hour `before` falls in keeps its later runs; rebuild that bucket
+                rows = con.execute("SELECT module, started, duration, status FROM runs"
+                                   " WHERE started >= ? AND started < ?", (hour * 3600, (hour + 1) * 3600))
+                con.executemany(ROLLUP_UPSERT, _rollup([r + (None,) for r in rows]))
+    finally:
+        con.close()
+    return n
+
+def _fmt_time(t):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+
+def cli(args):
+    """Handler for `nomaanos history ...`."""
+    from nomaanos.output import emit, pop_format
+    args, fmt = pop_format(args)
+    opts, rest = {}, []
+    it = iter(args)
+    for a in it:
+        if a in ("--since", "--until", "--before", "--status", "--limit"):
+            opts[a[2:]] = next(it, None)
+        elif a == "--stats":
+            opts["stats"] = True
+        else:
+            rest.append(a)
+    try:
+        since = parse_time(opts["since"]) if opts.get("since") else None
+        until = parse_time(opts["until"]) if opts.get("until") else None
+        if rest[:1] == ["clear"]:
+            n = clear(parse_time(opts["before"]) if opts.get("before") else None)
+            print(f"Deleted {n} history rows")
+            return 0
+        module = rest[0] if rest else None
+        if opts.get("stats"):
+            emit(stats(module, since, until, opts.get("status")), fmt)
+            return 0
+        rows = query(module, since, until, opts.get("status"), int(opts.get("limit") or 100))
+    except ValueError as e:
+        print(f"[ERROR] history: {e}")
+        return 1
+    if fmt is not None:
+        emit(rows, fmt)
+        return 0
+    if not rows and not enabled():
+        print("No history recorded; enable it with `nomaanos set history true`")
+    for r in rows:
+        res = repr(r["result"])
+        print(f"{_fmt_time(r['started'])}  {r['module']:14} {r['status']:6} {r['duration'] * 1000:9.2f}ms  "
+              f"{res if len(res) <= 80 else res[:77] + '...'}")
+    return 0
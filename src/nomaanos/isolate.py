@@ -0,0 +1,168 @@
+"""
+Isolated module execution: run a module in a child process under rlimits.
+
+    nomaanos run <module> [<module> ...] --isolate [--timeout S] [--cpu S] [--mem MB]
+
+The child sets RLIMIT_CPU / RLIMIT_AS on itself before importing anything,
+runs the module through the normal runner and sends back one marshal
+payload. The parent kills it when the wall-clock limit runs out, so an
+infinite loop or a memory blow-up only takes the child down. Every result
+carries accounting from wait4():
+
+    {"status": "ok", "result": ..., "usage": {"wall": 0.041, "user": 0.03,
+     "sys": 0.01, "max_rss_kb": 14200}}
+
+status: ok | error | timeout | cpu_limit | memory_limit | killed
+Defaults for the limits come from config keys isolate_timeout, isolate_cpu
+and isolate_mem_mb (unset = no limit).
+"""
+import marshal, os, signal, subprocess, sys, threading, time
+
+# the child imports nomaanos from wherever this copy lives (src tree or bundle)
+PKG_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def limits(timeout=None, cpu=None, mem_mb=None):
+    """Explicit limits, falling back to the isolate_* config keys."""
+    from nomaanos import config
+    cfg = config.load()
+    return {
+        "timeout": timeout if timeout is not None else cfg.get("isolate_timeout"),
+        "cpu": cpu if cpu is not None else cfg.get("isolate_cpu"),
+        "mem_mb": mem_mb if mem_mb is not None else cfg.get("isolate_mem_mb"),
+    }
+
+def _child_cmd(name, cpu, mem_mb):
+    cmd = [sys.executable, "-m", "nomaanos.isolate", name]
+    if cpu:
+        cmd += ["--cpu", str(cpu)]
+    if mem_mb:
+        cmd += ["--mem", str(mem_mb)]
+    return cmd
+
+def _status(rc, payload, timed_out, cpu):
+    if timed_out:
+        return "timeout"
+    if payload is not None:
+        return payload["status"]
+    if rc == -signal.SIGXCPU or (cpu and rc == -signal.SIGKILL):
+        # SIGXCPU at the soft CPU limit, SIGKILL at the hard one
+        return "cpu_limit"
+    return "killed" if rc < 0 else "error"
+
+def run(name, timeout=None, cpu=None, mem_mb=None):
+    """Run one module in a child process; returns {"status", "result", "usage"[, "error"]}."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (PKG_ROOT, env.get("PYTHONPATH")) if p)
+    t0 = time.monotonic()
+    proc = subprocess.Popen(_child_cmd(name, cpu, mem_mb), stdin=subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, env=env)
+    timed_out = []
+    timer = None
+    if timeout:
+        def _kill():
+            timed_out.append(True)
+            proc.kill()
+        timer = threading.Timer(timeout, _kill)
+        timer.daemon = True
+        timer.start()
+    try:
+        data = proc.stdout.read()
+        _, status, ru = os.wait4(proc.pid, 0)
+    finally:
+        if timer is not None:
+            timer.cancel()
+        proc.stdout.close()
+    wall = time.monotonic() - t0
+    rc = os.waitstatus_to_exitcode(status)
+    proc.returncode = rc  # reaped by wait4 above
+    try:
+        payload = marshal.loads(data) if data else None
+    except (EOFError, ValueError, TypeError):
+        payload = None
+    out = {
+        "status": _status(rc, payload, bool(timed_out), cpu),
+        "result": payload.get("result") if payload else None,
+        "usage": {
+            "wall": round(wall, 4),
+            "user": round(ru.ru_utime, 4),
+            "sys": round(ru.ru_stime, 4),
+            "max_rss_kb": ru.ru_maxrss,
+        },
+    }
+    if payload and payload.get("stdout"):
+        sys.stdout.write(payload["stdout"])
+    if out["status"] == "timeout":
+        out["error"] = f"timed out after {timeout}s"
+    elif out["status"] == "cpu_limit":
+        out["error"] = f"exceeded {cpu}s CPU time"
+    elif payload and payload.get("error"):
+        out["error"] = payload["error"]
+    elif out["status"] != "ok":
+        out["error"] = f"child exited with {rc}"
+    return out
+
+def run_many(names, jobs=None, timeout=None, cpu=None, mem_mb=None):
+    """Isolated runs of several modules, at most `jobs` children at a time; {name: result}."""
+    names = list(dict.fromkeys(n for n in names if n))
+    slots = threading.Semaphore(max(1, jobs or len(names) or 1))
+    results = {}
+
+    def work(n):
+        with slots:
+            try:
+                results[n] = run(n, timeout, cpu, mem_mb)
+            except OSError as e:
+                results[n] = {"status": "error", "result": None, "error": f"{type(e).__name__}: {e}"}
+
+    threads = [threading.Thread(target=work, args=(n,), name=f"nomaanos-isolate-{n}") for n in names]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return {n: results[n] for n in names}
+
+def _set_limits(cpu, mem_mb):
+    import resource
+    if cpu:
+        secs = max(1, int(float(cpu) + 0.999))
+        resource.setrlimit(resource.RLIMIT_CPU, (secs, secs + 1))
+    if mem_mb:
+        cap = int(float(mem_mb) * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (cap, cap))
+
+def _child(argv):
+    """Entry point of the child: apply limits, run the module, marshal the outcome to fd 1."""
+    import io
+    name, cpu, mem_mb = None, None, None
+    it = iter(argv)
+    for a in it:
+        if a == "--cpu":
+            cpu = next(it, None)
+        elif a == "--mem":
+            mem_mb = next(it, None)
+        else:
+            name = a
+    _set_limits(cpu, mem_mb)
+    real = sys.stdout
+    sys.stdout = captured = io.StringIO()
+    payload = {"status": "ok", "result": None}
+    try:
+        from nomaanos.modules.runner import run as run_module
+        from nomaanos.output import materialise
+        payload["result"] = materialise(run_module(name))
+    except MemoryError:
+        payload = {"status": "memory_limit", "result": None, "error": f"exceeded {mem_mb} MB address space"}
+    except BaseException as e:
+        payload = {"status": "error", "result": None, "error": f"{type(e).__name__}: {e}"}
+    payload["stdout"] = captured.getvalue()
+    try:
+        data = marshal.dumps(payload)
+    except ValueError:
+        # not a marshal-able type; the repr still tells the caller what came back
+        payload["result"] = repr(payload["result"])
+        data = marshal.dumps(payload)
+    real.buffer.write(data)
+    real.flush()
+
+if __name__ == "__main__":
+    _child(sys.argv[1:])
@@ -1,34 +1,269 @@
 import sys
-from nomaanos.core import info, hello
-from nomaanos.config import load, save
-from nomaanos.modules import run as run_module, list_modules
 
-def main():
-    if len(sys.argv) == 1:
-        print("NomaanOS CLI: try 'info', 'hello <name>', 'config', 'get <key>', 'set <key> <value>', 'modules', or 'run <module>'")
-        return
+from nomaanos import trace
+from nomaanos.output import FormatError, emit, next_number, pop_format
+
+# global flags: --no-cache, --trace[=FILE], --importtime; most commands take --format repr|json|ndjson
+USAGE = "NomaanOS CLI: try 'info', 'hello <name>', 'config', 'get <key>', 'set <key> <value> ...', 'modules', 'run <module>', 'pipe <name>', 'watch <module>', 'cache [clear]', 'history [<module>]', 'backup', 'schedule', 'bundle', 'shell', 'doctor', 'serve [--stop]' or 'agent'"
+
+# Each handler imports only what its subcommand needs, so `nomaanos hello`
+# never pays for platform probing or module discovery.
+
+def cmd_info(args):
+    args, fmt = pop_format(args)
+    from nomaanos.core import info
+    with trace.span("execute", module="info"):
+        result = info()
+    with trace.span("serialise"):
+        emit(result, fmt)
 
-    cmd = sys.argv[1]
+def cmd_hello(args):
+    from nomaanos.core import hello
+    name = args[0] if args else "Nomaan"
+    print(hello(name))
 
-    if cmd == "info":
-        print(info())
+def cmd_config(args):
+    args, fmt = pop_format(args)
+    from nomaanos import config
+    emit(config.load(), fmt, label="NomaanOS Config:")
 
-    elif cmd == "hello":
-        name = sys.argv[2] if len(sys.argv) > 2 else "Nomaan"
-        print(hello(name))
+def cmd_get(args):
+    args, fmt = pop_format(args)
+    if not args:
+        print("Usage: nomaanos get <key>")
+        return
+    from nomaanos import config
+    emit(config.get(args[0]), fmt)
+
+def cmd_set(args):
+    args, fmt = pop_format(args)
+    if len(args) < 2:
+        print("Usage: nomaanos set <key> <value> [<key> <value> ...]")
+        return
+    from nomaanos import config
+    try:
+        values = config.parse_pairs(args)
+    except ValueError as e:
+        print(f"[ERROR] set: {e}")
+        return 2
+    emit(config.update(values), fmt, label="Updated:")
 
-    elif cmd == "modules":
-        print("Available modules:", list_modules())
+def cmd_modules(args):
+    args, fmt = pop_format(args)
+    if any(a == "--hosts" or a.startswith("--hosts=") for a in args):
+        from nomaanos import fleet
+        try:
+            args, hosts = fleet.pop_hosts(args)
+        except ValueError as e:
+            print(f"[ERROR] modules: {e}")
+            return 2
+        try:
+            emit(fleet.modules(hosts), fmt)
+        except fleet.FleetError as e:
+            print("[ERROR]", e)
+            return 1
+        return
+    from nomaanos.modules import list_modules
+    with trace.span("discover"):
+        names = list_modules(refresh="--refresh" in args)
+    if "-v" not in args:
+        emit(names, fmt, label="Available modules:")
+        return
+    from nomaanos.registry import describe
+    for n in names:
+        d = describe(n) or {}
+        doc = (d.get("doc") or "").strip().splitlines()
+        params = ",".join(d["inputs"]) if d.get("inputs") else (d.get("arity") if d.get("arity") is not None else "?")
+        entry = f"{'async ' if d.get('async') else ''}{d.get('entry') or '?'}({params})"
+        print(f"{n:16} {entry:14} {doc[0] if doc else ''}")
 
-    elif cmd == "run":
-        if len(sys.argv) < 3:
-            print("Usage: nomaanos run <module>")
-            return
-        module = sys.argv[2]
-        print(run_module(module))
+def _parse_run_args(args):
+    """
+    Split `run` args into (names, jobs, timeout, isolate); isolate is None or {"cpu", "mem_mb"}.
+    Raises ValueError for a flag whose value isn't a number.
+    """
+    names, jobs, timeout, isolate = [], None, None, None
+    it = iter(args)
+    for a in it:
+        if a in ("--jobs", "-j"):
+            jobs = next_number(it, a, int) or None
+        elif a == "--timeout":
+            timeout = next_number(it, a, float) or None
+        elif a == "--isolate":
+            isolate = isolate or {}
+        elif a == "--cpu":
+            isolate = dict(isolate or {}, cpu=next_number(it, a, float) or None)
+        elif a == "--mem":
+            isolate = dict(isolate or {}, mem_mb=next_number(it, a, float) or None)
+        else:
+            names.append(a)
+    return names, jobs, timeout, isolate
 
+def cmd_run(args):
+    args, fmt = pop_format(args)
+    hosts = None
+    try:
+        if any(a == "--hosts" or a.startswith("--hosts=") for a in args):
+            from nomaanos.fleet import pop_hosts
+            args, hosts = pop_hosts(args)
+        names, jobs, timeout, isolate = _parse_run_args(args)
+    except ValueError as e:
+        print(f"[ERROR] run: {e}")
+        return 2
+    if not names:
+        print("Usage: nomaanos run <module> [<module> ...] [--jobs N] [--timeout SECONDS]"
+              " [--isolate [--cpu SECONDS] [--mem MB]] [--hosts H1,H2:PORT,@group] [--format repr|json|ndjson]")
+        return
+    if hosts is not None:
+        # same request to every host's agent at once; timeout is per host
+        from nomaanos import fleet
+        try:
+            result = fleet.run(hosts, names, timeout)
+        except fleet.FleetError as e:
+            print("[ERROR]", e)
+            return 1
+    elif isolate is not None:
+        # child processes under rlimits; each result carries its usage accounting
+        from nomaanos import isolate as iso
+        lim = iso.limits(timeout, isolate.get("cpu"), isolate.get("mem_mb"))
+        if len(names) == 1:
+            result = iso.run(names[0], **lim)
+        else:
+            result = iso.run_many(names, jobs=jobs, **lim)
+            if fmt == "ndjson":
+                result = [{"module": n, **v} for n, v in result.items()]
+    elif len(names) == 1 and timeout is None:
+        from nomaanos.modules import run as run_module
+        result = run_module(names[0])
     else:
+        from nomaanos.modules import run_many
+        result = run_many(names, jobs=jobs, timeout=timeout)
+        if fmt == "ndjson":
+            # one line per module rather than one line holding them all
+            from nomaanos.output import materialise
+            result = [{"module": n, "result": materialise(v)} for n, v in result.items()]
+    with trace.span("serialise"):
+        emit(result, fmt)
+
+def cmd_pipe(args):
+    from nomaanos.pipeline import cli
+    return cli(args)
+
+def cmd_watch(args):
+    from nomaanos.watch import cli
+    return cli(args)
+
+def cmd_cache(args):
+    from nomaanos import cache
+    if args and args[0] == "clear":
+        n = cache.invalidate(args[1] if len(args) > 1 else "")
+        print(f"Cleared {n} cache entries")
+        return
+    print(cache.stats())
+
+def cmd_backup(args):
+    from nomaanos.backup import cli
+    return cli(args)
+
+def cmd_history(args):
+    from nomaanos.history import cli
+    return cli(args)
+
+def cmd_schedule(args):
+    from nomaanos.schedule import cli
+    return cli(args)
+
+def cmd_bundle(args):
+    from nomaanos.bundle import cli
+    return cli(args)
+
+def cmd_agent(args):
+    from nomaanos.fleet import cli
+    return cli(args)
+
+def cmd_doctor(args):
+    from nomaanos.doctor import cli
+    return cli(args)
+
+def cmd_shell(args):
+    from nomaanos.shell import cli
+    return cli(args)
+
+def cmd_serve(args):
+    from nomaanos import daemon
+    if "--stop" in args:
+        return daemon.stop()
+    return daemon.serve()
+
+COMMANDS = {
+    "info": cmd_info,
+    "hello": cmd_hello,
+    "config": cmd_config,
+    "get": cmd_get,
+    "set": cmd_set,
+    "modules": cmd_modules,
+    "run": cmd_run,
+    "pipe": cmd_pipe,
+    "serve": cmd_serve,
+    "agent": cmd_agent,
+    "watch": cmd_watch,
+    "cache": cmd_cache,
+    "backup": cmd_backup,
+    "history": cmd_history,
+    "schedule": cmd_schedule,
+    "bundle": cmd_bundle,
+    "shell": cmd_shell,
+    "doctor": cmd_doctor,
+}
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    argv = list(argv)
+
+    traced = [a for a in argv if a == "--trace" or a.startswith("--trace=")]
+    if traced:
+        argv = [a for a in argv if a not in traced]
+        trace.enable(traced[-1].partition("=")[2] or None)
+    if not trace.enabled():
+        return _dispatch(argv)
+    try:
+        with trace.span("command", argv=" ".join(argv)):
+            return _dispatch(argv)
+    finally:
+        trace.finish()
+
+def _dispatch(argv):
+    if argv and argv[0] == "--importtime":
+        from nomaanos.startup import report
+        return report(argv[1:])
+
+    no_cache = "--no-cache" in argv
+    if no_cache:
+        import os
+        argv = [a for a in argv if a != "--no-cache"]
+        os.environ["NOMAANOS_NO_CACHE"] = "1"
+
+    if not argv:
+        print(USAGE)
+        return
+
+    cmd = argv[0]
+    if cmd in ("info", "hello", "modules", "run") and not no_cache and not trace.enabled():
+        # a running `nomaanos serve` answers these without paying our startup again
+        from nomaanos.daemon import forward
+        rc = forward(argv)
+        if rc is not None:
+            return rc
+    handler = COMMANDS.get(cmd)
+    if handler is None:
         print("Unknown command:", cmd)
+        return
+    try:
+        return handler(argv[1:])
+    except FormatError as e:
+        print("[ERROR]", e)
+        return 2
 
 if __name__ == "__main__":
     main()
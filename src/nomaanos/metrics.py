@@ -0,0 +1,198 @@
+"""
+/proc-based system metrics for Linux / Termux.
+
+Engine keeps its /proc files open between samples and re-reads them with
+pread into buffers allocated once, so a snapshot is a handful of syscalls
+and a parse. CPU utilisation (system-wide and per process) comes from the
+delta against the previous sample; the first sample is measured since boot.
+
+Groups: cpu, mem, load, uptime, disk, procs
+    snapshot(("cpu", "mem"))     # module-level engine, reused across calls
+"""
+import os, threading, time
+
+GROUPS = ("cpu", "mem", "load", "uptime", "disk", "procs")
+DEFAULT_GROUPS = ("cpu", "mem", "load", "uptime", "disk")
+MAX_PROC_FDS = 512  # keep at most this many /proc/<pid>/stat files open
+MEMINFO_KEYS = (b"MemTotal", b"MemFree", b"MemAvailable", b"Buffers", b"Cached", b"SwapTotal", b"SwapFree")
+
+try:
+    CLK_TCK = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    CLK_TCK, PAGE_SIZE = 100, 4096
+
+class Engine:
+    def __init__(self, disk_paths=("/",), proc_root="/proc"):
+        self.proc_root = proc_root
+        self.disk_paths = tuple(disk_paths)
+        self._fds = {}          # /proc file name -> fd
+        self._buf = bytearray(1 << 16)
+        self._view = memoryview(self._buf)
+        self._cpu_prev = None   # (total, idle) jiffies
+        self._pid_fds = {}      # pid -> fd of /proc/<pid>/stat
+        self._pid_prev = {}     # pid -> utime+stime jiffies
+        self._pid_t = None      # monotonic time of previous procs sample
+        self._lock = threading.Lock()  # daemon threads share one engine and buffer
+
+    def close(self):
+        for fd in list(self._fds.values()) + list(self._pid_fds.values()):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
+        self._pid_fds.clear()
+
+    def __del__(self):
+        self.close()
+
+    def _read_fd(self, fd):
+        n = os.preadv(fd, [self._buf], 0)
+        return bytes(self._view[:n])
+
+    def _read(self, name):
+        fd = self._fds.get(name)
+        if fd is None:
+            fd = self._fds[name] = os.open(os.path.join(self.proc_root, name), os.O_RDONLY)
+        return self._read_fd(fd)
+
+    def cpu(self):
+        data = self._read("stat")
+        line = data[:data.index(b"\n")]
+        f = [int(x) for x in line.split()[1:]]
+        idle = f[3] + (f[4] if len(f) > 4 else 0)
+        total = sum(f[:8])  # guest time is already counted in user/nice
+        prev = self._cpu_prev or (0, 0)
+        self._cpu_prev = (total, idle)
+        dt, di = total - prev[0], idle - prev[1]
+        ncpu = data.count(b"\ncpu")
+        return {
+            "percent": round(100.0 * (dt - di) / dt, 1) if dt > 0 else 0.0,
+            "count": ncpu,
+            "since_boot": prev == (0, 0),
+        }
+
+    def mem(self):
+        out = {}
+        for line in self._read("meminfo").splitlines():
+            key, _, rest = line.partition(b":")
+            if key in MEMINFO_KEYS:
+                out[key.decode()] = int(rest.split()[0]) * 1024
+        total = out.get("MemTotal", 0)
+        avail = out.get("MemAvailable", out.get("MemFree", 0))
+        return {
+            "total": total,
+            "available": avail,
+            "used": total - avail,
+            "percent": round(100.0 * (total - avail) / total, 1) if total else 0.0,
+            "buffers": out.get("Buffers", 0),
+            "cached": out.get("Cached", 0),
+            "swap_total": out.get("SwapTotal", 0),
+            "swap_used": out.get("SwapTotal", 0) - out.get("SwapFree", 0),
+        }
+
+    def load(self):
+        f = self._read("loadavg").split()
+        running, _, total = f[3].partition(b"/")
+        return {"1m": float(f[0]), "5m": float(f[1]), "15m": float(f[2]),
+                "running": int(running), "threads": int(total)}
+
+    def uptime(self):
+        f = self._read("uptime").split()
+        return {"seconds": float(f[0]), "idle_seconds": float(f[1])}
+
+    def disk(self):
+        out = {}
+        for p in self.disk_paths:
+            try:
+                st = os.statvfs(p)
+            except OSError:
+                continue
+            total = st.f_blocks * st.f_frsize
+            free = st.f_bavail * st.f_frsize
+            out[p] = {"total": total, "free": free, "used": total - st.f_bfree * st.f_frsize,
+                      "percent": round(100.0 * (total - free) / total, 1) if total else 0.0}
+        return out
+
+    def _pid_stat(self, pid):
+        fd = self._pid_fds.get(pid)
+        if fd is None:
+            fd = os.open(f"{self.proc_root}/{pid}/stat", os.O_RDONLY)
+            if len(self._pid_fds) < MAX_PROC_FDS:
+                self._pid_fds[pid] = fd
+            else:
+                try:
+                    return self._read_fd(fd)
+                finally:
+                    os.close(fd)
+        return self._read_fd(fd)
+
+    def procs(self):
+        """Per-process table: pid, comm, state, cpu %, rss bytes, threads."""
+        now = time.monotonic()
+        elapsed = (now - self._pid_t) if self._pid_t else None
+        self._pid_t = now
+        seen, table, prev = set(), [], self._pid_prev
+        with os.scandir(self.proc_root) as it:
+            pids = [int(e.name) for e in it if e.name.isdigit()]
+        for pid in pids:
+            try:
+                data = self._pid_stat(pid)
+            except OSError:
+                continue  # exited between listing and reading
+            if not data:
+                continue
+            head, _, rest = data.rpartition(b")")
+            comm = head.partition(b"(")[2]
+            f = rest.split()
+            # fields after ")": state=0 ppid=1 ... utime=11 stime=12 ... threads=17 ... rss=21
+            ticks = int(f[11]) + int(f[12])
+            cpu = None
+            if elapsed and pid in prev:
+                cpu = round(100.0 * (ticks - prev[pid]) / CLK_TCK / elapsed, 1)
+            prev[pid] = ticks
+            seen.add(pid)
+            table.append({"pid": pid, "comm": comm.decode(errors="replace"), "state": f[0].decode(),
+                          "cpu": cpu, "rss": int(f[21]) * PAGE_SIZE, "threads": int(f[17])})
+        for pid in [p for p in self._pid_fds if p not in seen]:
+            os.close(self._pid_fds.pop(pid))
+        for pid in [p for p in prev if p not in seen]:
+            del prev[pid]
+        return table
+
+    def snapshot(self, groups=DEFAULT_GROUPS):
+        """{group: data} for the requested groups; a failing group reports {"error": ...}."""
+        out = {}
+        with self._lock:
+            for g in groups:
+                out[g] = self._group(g)
+        return out
+
+    def _group(self, g):
+        fn = getattr(self, g, None) if g in GROUPS else None
+        if fn is None:
+            return {"error": f"unknown metric group {g!r}; expected {', '.join(GROUPS)}"}
+        try:
+            return fn()
+        except (OSError, ValueError, IndexError) as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+_engine = None
+
+def engine():
+    global _engine
+    if _engine is None:
+        _engine = Engine()
+    return _engine
+
+def parse_groups(spec):
+    """'cpu,mem' -> ('cpu', 'mem'); 'all' -> every group; empty -> the defaults."""
+    if not spec:
+        return DEFAULT_GROUPS
+    if spec == "all":
+        return GROUPS
+    return tuple(g.strip() for g in spec.split(",") if g.strip())
+
+def snapshot(groups=None):
+    return engine().snapshot(groups or DEFAULT_GROUPS)
@@ -2,25 +2,15 @@
 # Exposes list_modules() and run(name) for CLI and installs.
 import importlib, os
 
-__all__ = ["list_modules", "run"]
+__all__ = ["list_modules", "run", "run_many"]
 
 MODULE_DIR = os.path.dirname(__file__)
 
-def _module_files():
+def list_modules(refresh=False):
+    """Return sorted list of runnable module names (from the module registry)."""
     try:
-        for f in os.listdir(MODULE_DIR):
-            if not f.endswith(".py"):
-                continue
-            if f in ("__init__.py","runner.py"):
-                continue
-            yield f[:-3]
-    except Exception:
-        return []
-
-def list_modules():
-    """Return sorted list of candidate module names (filenames without .py)."""
-    try:
-        return sorted(_module_files())
+        from nomaanos import registry
+        return registry.list_modules(refresh)
     except Exception:
         return []
 
@@ -67,3 +57,8 @@ def run(name):
         except Exception as e:
             return f"module {name} run() error: {e}"
     return f"Module {name} has no callable main() or run()"
+
+def run_many(names, jobs=None, timeout=None):
+    """Run several modules in parallel; returns {name: result}. See runner.run_many."""
+    from nomaanos.modules.runner import run_many as _run_many
+    return _run_many(names, jobs=jobs, timeout=timeout)
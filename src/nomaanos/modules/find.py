@@ -0,0 +1,419 @@
+"""Search the workspace through a persistent token/path index (NOMAANOS_FIND='terms')."""
+# NOMAANOS_FIND="backup prune"      files holding both tokens
+# NOMAANOS_FIND="back* *config"     token prefix / suffix / *substring* matches
+# NOMAANOS_FIND="'def main('"       literal substring (index narrows, files confirm)
+# NOMAANOS_FIND="path:scripts/ sh"  path substring, combined with anything else
+# NOMAANOS_FIND="" (or unset)       just bring the index up to date
+#
+# Terms are ANDed and case-insensitive; tokens are runs of [a-z0-9], 2-64 long.
+# The index lives in CACHE_DIR/find/ as marshal: postings are array('I') bytes
+# per token, so loading it is one marshal.loads. Updates are incremental: each
+# query stats directories only and rescans the ones whose mtime moved (new,
+# removed or atomically-saved files); every find_rescan seconds (300) all files
+# are stat'ed by (mtime_ns, size) to catch in-place edits. Changed files are
+# read in 1 MiB chunks and, past PARALLEL_MIN of them, tokenised on every core.
+#
+# Config: find_root (default: the current directory), find_skip (extra
+# directory names to leave out), find_limit (50), find_rescan (300).
+import marshal, os, threading, time
+from array import array
+from collections import defaultdict
+
+from nomaanos.config import CACHE_DIR
+
+INDEX_DIR = os.path.join(CACHE_DIR, "find")
+INDEX_VERSION = 1
+CHUNK = 1 << 20
+MAX_TOKEN = 64
+MAX_LINE = 4096
+PARALLEL_MIN = 256
+SKIP_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", ".mypy_cache", ".tox"}
+
+# lower-case letters and digits survive, every other byte becomes a separator
+_FOLD = bytes(c | 0x20 if 65 <= c <= 90 else c if 97 <= c <= 122 or 48 <= c <= 57 else 32 for c in range(256))
+_SHORT = {bytes([c]) for c in b"abcdefghijklmnopqrstuvwxyz0123456789"}
+
+_TOKEN = None
+_loaded = {}  # index path -> (stat key, index) for resident processes (daemon, shell)
+_lock = threading.Lock()
+
+def _pattern():
+    global _TOKEN
+    if _TOKEN is None:
+        import re
+        _TOKEN = re.compile(rb"[a-z0-9]{2,}")
+    return _TOKEN
+
+def _settings():
+    from nomaanos import config
+    cfg = config.load()
+    return {
+        "root": os.path.abspath(os.path.expanduser(cfg.get("find_root") or os.getcwd())),
+        "skip": SKIP_DIRS | set(cfg.get("find_skip") or ()),
+        "limit": int(cfg.get("find_limit", 50)),
+        "rescan": float(cfg.get("find_rescan", 300)),
+    }
+
+# --- tokenising (runs in worker processes too) -------------------------------
+
+def tokens_of(path, rel=""):
+    """Distinct tokens of rel (the path) and of the file, read in CHUNK pieces (a set of bytes)."""
+    out = set(rel.encode().translate(_FOLD).split())
+    carry = b""
+    try:
+        with open(path, "rb") as f:
+            first = True
+            while True:
+                chunk = f.read(CHUNK)
+                if not chunk:
+                    break
+                if first and b"\0" in chunk[:8192]:
+                    break  # binary: index the path only
+                first = False
+                data = carry + chunk.translate(_FOLD)
+                parts = data.split()
+                # a token may continue in the next chunk: hold back the trailing run
+                carry = parts.pop() if parts and data[-1:] != b" " else b""
+                if len(carry) > MAX_TOKEN:
+                    carry = b""
+                out.update(parts)
+    except OSError:
+        pass
+    if carry:
+        out.add(carry)
+    out -= _SHORT
+    if out and max(map(len, out)) > MAX_TOKEN:
+        out = {t for t in out if len(t) <= MAX_TOKEN}
+    return out
+
+def _postings_batch(root, rels, base):
+    """Postings {token: array('I') bytes} for rels, which get the ids base, base + 1, ..."""
+    acc = defaultdict(list)
+    for i, r in enumerate(rels, base):
+        for t in tokens_of(os.path.join(root, r), r):
+            acc[t].append(i)
+    return {t.decode(): array("I", ids).tobytes() for t, ids in acc.items()}
+
+def _index(root, rels, base):
+    """Postings for rels in id order, one part per batch; batches run on every core when worth it."""
+    cpus = os.cpu_count() or 1
+    # forking a multi-threaded process (a daemon or pipeline request) can
+    # leave a lock held in the child forever; only the main thread forks
+    if len(rels) < PARALLEL_MIN or cpus < 2 or threading.current_thread() is not threading.main_thread():
+        return [_postings_batch(root, rels, base)]
+    size = max(64, len(rels) // (cpus * 4))
+    starts = range(0, len(rels), size)
+    try:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=cpus) as pool:
+            # map() yields in submission order, so merged postings stay sorted by id
+            return list(pool.map(_postings_batch, [root] * len(starts),
+                                 [rels[i:i + size] for i in starts], [base + i for i in starts]))
+    except (ImportError, OSError, NotImplementedError):
+        # no working multiprocessing here (no sem_open on Android, sandboxed /dev/shm)
+        return [_postings_batch(root, rels, base)]
+
+# --- scanning ----------------------------------------------------------------
+
+def _walk(root, rel, skip, files, dirs):
+    """Add every file (rel -> (mtime_ns, size)) and directory (rel -> mtime_ns) under rel."""
+    stack = [rel]
+    while stack:
+        d = stack.pop()
+        full = os.path.join(root, d) if d else root
+        try:
+            dirs[d] = os.stat(full).st_mtime_ns
+            it = os.scandir(full)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                r = f"{d}/{e.name}" if d else e.name
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in skip:
+                            stack.append(r)
+                    elif e.is_file(follow_symlinks=False):
+                        st = e.stat(follow_symlinks=False)
+                        files[r] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+
+def _moved_dirs(root, dirs):
+    """Directories whose mtime changed (entries added, removed or renamed) or that are gone."""
+    out = []
+    for d, mtime in dirs.items():
+        try:
+            if os.stat(os.path.join(root, d) if d else root).st_mtime_ns != mtime:
+                out.append(d)
+        except OSError:
+            out.append(d)
+    return out
+
+def _rescan_dirs(root, skip, old_files, old_dirs, changed):
+    """Current (files, dirs), re-listing only the `changed` directories."""
+    files, dirs = dict(old_files), dict(old_dirs)
+    gone = set(changed)
+    for r in [r for r in files if r.rpartition("/")[0] in gone]:
+        del files[r]
+    for d in changed:
+        full = os.path.join(root, d) if d else root
+        try:
+            dirs[d] = os.stat(full).st_mtime_ns
+            it = os.scandir(full)
+        except OSError:
+            # the directory went away (its subdirectories fail their own stat too)
+            prefix = d + "/"
+            for r in [r for r in files if r.startswith(prefix)]:
+                del files[r]
+            for x in [x for x in dirs if x == d or x.startswith(prefix)]:
+                del dirs[x]
+            continue
+        with it:
+            for e in it:
+                r = f"{d}/{e.name}" if d else e.name
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        if e.name not in skip and r not in dirs:
+                            _walk(root, r, skip, files, dirs)
+                    elif e.is_file(follow_symlinks=False):
+                        st = e.stat(follow_symlinks=False)
+                        files[r] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+    return files, dirs
+
+# --- the index ---------------------------------------------------------------
+
+def index_path(root):
+    import hashlib
+    return os.path.join(INDEX_DIR, hashlib.sha1(root.encode()).hexdigest()[:16] + ".idx")
+
+def _empty(root):
+    return {"version": INDEX_VERSION, "root": root, "scanned": 0.0, "files": [], "meta": [],
+            "post": {}, "dirs": {}}
+
+def load(root):
+    path = index_path(root)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _empty(root)
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    hit = _loaded.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    try:
+        with open(path, "rb") as f:
+            idx = marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return _empty(root)
+    if not isinstance(idx, dict) or idx.get("version") != INDEX_VERSION or idx.get("root") != root:
+        return _empty(root)
+    _loaded[path] = (key, idx)
+    return idx
+
+def save(idx):
+    path = index_path(idx["root"])
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        marshal.dump(idx, f)
+    os.replace(tmp, path)
+    st = os.stat(path)
+    _loaded[path] = ((st.st_mtime_ns, st.st_size, st.st_ino), idx)
+
+def _compact(idx):
+    """Renumber live files and drop dead ids from every posting (no file reads)."""
+    files, meta, remap = [], [], array("i")
+    for p, m in zip(idx["files"], idx["meta"]):
+        remap.append(len(files) if p is not None else -1)
+        if p is not None:
+            files.append(p)
+            meta.append(m)
+    post = {}
+    for t, b in idx["post"].items():
+        ids = array("I")
+        ids.frombytes(b)
+        live = array("I", [remap[i] for i in ids if remap[i] >= 0])
+        if live:
+            post[t] = live.tobytes()
+    idx.update(files=files, meta=meta, post=post)
+
+def update(idx, settings, full=False):
+    """Bring idx in line with the tree; returns how many files were (re)indexed or dropped."""
+    root, skip = settings["root"], settings["skip"]
+    full = full or not idx["dirs"]
+    moved = None if full else _moved_dirs(root, idx["dirs"])
+    if not full and not moved:
+        return 0
+    ids = {p: i for i, p in enumerate(idx["files"]) if p is not None}
+    old = {p: idx["meta"][i] for p, i in ids.items()}
+    if full:
+        files, dirs = {}, {}
+        _walk(root, "", skip, files, dirs)
+        idx["scanned"] = time.time()
+    else:
+        files, dirs = _rescan_dirs(root, skip, old, idx["dirs"], moved)
+    idx["dirs"] = dirs
+    dropped = [p for p in old if files.get(p) != old[p]]
+    fresh = sorted(p for p, m in files.items() if old.get(p) != m)
+    if not dropped and not fresh:
+        return 0
+    # a changed file gets a new id; the old one stays in the postings, dead, until compaction
+    for p in dropped:
+        i = ids[p]
+        idx["files"][i] = idx["meta"][i] = None
+    base = len(idx["files"])
+    idx["files"].extend(fresh)
+    idx["meta"].extend(files[p] for p in fresh)
+    chunks = defaultdict(list)
+    for part in _index(root, fresh, base):
+        for t, b in part.items():
+            chunks[t].append(b)
+    post = idx["post"]
+    for t, bs in chunks.items():
+        # new ids are always the largest: appending keeps each posting sorted
+        post[t] = post.get(t, b"") + b"".join(bs)
+    dead = idx["files"].count(None)
+    if dead * 2 > len(idx["files"]):
+        _compact(idx)
+    return len(set(dropped).union(fresh))
+
+# --- queries -----------------------------------------------------------------
+
+def _ids(post, token):
+    a = array("I")
+    b = post.get(token)
+    if b:
+        a.frombytes(b)
+    return a
+
+def _token_matches(post, term):
+    """File ids for a token term: exact, or prefix*/ *suffix / *substring* over the vocabulary."""
+    core = term.strip("*")
+    if core == term:
+        return set(_ids(post, term))
+    if term.startswith("*") and term.endswith("*"):
+        hit = [t for t in post if core in t]
+    elif term.endswith("*"):
+        hit = [t for t in post if t.startswith(core)]
+    else:
+        hit = [t for t in post if t.endswith(core)]
+    out = set()
+    for t in hit:
+        out.update(_ids(post, t))
+    return out
+
+def _first_line(path, needle):
+    """(line number, line) of the first case-insensitive occurrence of needle, streaming."""
+    # the carry holds the unfinished line (at most MAX_LINE bytes of it), so a
+    # match can be sliced out whole however many chunks the line spans
+    keep = max(MAX_LINE, len(needle) - 1)
+    carry, line_no = b"", 1
+    try:
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK)
+                if not chunk:
+                    return None
+                raw = carry + chunk
+                # bytes.lower() is ASCII-only and keeps offsets, so a match in the
+                # lowered copy slices the same line out of the original
+                data = raw.lower()
+                at = data.find(needle)
+                if at >= 0:
+                    start = data.rfind(b"\n", 0, at) + 1
+                    line_no += data.count(b"\n", 0, start)
+                    parts, end = [raw[start:]], data.find(b"\n", at)
+                    size = len(parts[0])
+                    # the line runs on past this chunk: read up to its newline
+                    while end < 0 and size < keep:
+                        more = f.read(CHUNK)
+                        if not more:
+                            break
+                        end = more.find(b"\n")
+                        parts.append(more if end < 0 else more[:end])
+                        size += len(parts[-1])
+                    line = b"".join(parts)
+                    if end >= 0 and len(parts) == 1:
+                        line = line[:end - start]
+                    return line_no, line[:keep]
+                cut = max(data.rfind(b"\n") + 1, len(data) - keep)
+                line_no += data.count(b"\n", 0, cut)
+                carry = raw[cut:]
+    except OSError:
+        return None
+
+def _literal(idx, settings, term, candidates):
+    """Confirm a literal substring in candidate files (narrowed by the tokens it spans)."""
+    token = _pattern()
+    needle = term.lower().encode()
+    for m in token.finditer(needle):
+        # a token at either end of the substring may be cut mid-word: match it loosely there
+        pat = ("*" if m.start() == 0 else "") + m.group().decode() + ("*" if m.end() == len(needle) else "")
+        got = _token_matches(idx["post"], pat)
+        candidates = got if candidates is None else candidates & got
+        if not candidates:
+            return set(), {}
+    files = idx["files"]
+    if candidates is None:
+        candidates = range(len(files))
+    lines = {}
+    for i in sorted((i for i in candidates if files[i] is not None), key=files.__getitem__):
+        hit = _first_line(os.path.join(settings["root"], idx["files"][i]), needle)
+        if hit is not None:
+            lines[i] = hit
+    return set(lines), lines
+
+def search(idx, settings, query):
+    """Matching files, sorted by path, as [{"path", ("line", "text")}]; plus the total hit count."""
+    import shlex
+    token = _pattern()
+    terms = shlex.split(query)
+    found, lines, literals = None, {}, []
+    for term in terms:
+        low = term.lower()
+        if low.startswith("path:"):
+            sub = low[5:]
+            got = {i for i, p in enumerate(idx["files"]) if p is not None and sub in p.lower()}
+        elif token.fullmatch(low.strip("*").encode()):
+            got = _token_matches(idx["post"], low)
+        else:
+            literals.append(term)  # confirmed last, against the narrowest candidate set
+            continue
+        found = got if found is None else found & got
+    for term in literals:
+        found, lines = _literal(idx, settings, term, found)
+    files = idx["files"]
+    hits = sorted((i for i in found or () if files[i] is not None), key=files.__getitem__)
+    out = []
+    for i in hits[:settings["limit"]]:
+        row = {"path": idx["files"][i]}
+        if i in lines:
+            row["line"] = lines[i][0]
+            row["text"] = lines[i][1].decode(errors="replace").strip()[:200]
+        out.append(row)
+    return out, len(hits)
+
+def main():
+    settings = _settings()
+    query = os.environ.get("NOMAANOS_FIND", "").strip()
+    t0 = time.perf_counter()
+    with _lock:
+        idx = load(settings["root"])
+        full = not query or time.time() - idx.get("scanned", 0) > settings["rescan"]
+        changed = update(idx, settings, full=full)
+        if changed or full:
+            try:
+                save(idx)
+            except OSError:
+                pass  # read-only cache dir: answer from the in-memory index anyway
+        t1 = time.perf_counter()
+        out = {"root": settings["root"], "indexed": sum(p is not None for p in idx["files"]),
+               "tokens": len(idx["post"]), "changed": changed}
+        if query:
+            results, total = search(idx, settings, query)
+            out.update(query=query, hits=total, results=results)
+    out["ms"] = {"update": round((t1 - t0) * 1000, 2), "query": round((time.perf_counter() - t1) * 1000, 2)}
+    return out
@@ -1,25 +1,15 @@
 """Robust runner: prefer main(); then try run() with no args; then run(name)."""
 from importlib import import_module
-import inspect, os, pkgutil
+import os, time
+
+from nomaanos import history, trace
+from nomaanos.output import is_stream
 
 PKG = "nomaanos.modules"
 
 def list_modules():
-    out = []
-    try:
-        pkg = import_module(PKG)
-        p = os.path.dirname(pkg.__file__)
-        for f in sorted(os.listdir(p)):
-            if f.endswith(".py") and not f.startswith("__") and f != "runner.py":
-                out.append(f[:-3])
-    except Exception:
-        try:
-            for finder, name, ispkg in pkgutil.iter_modules(import_module("nomaanos").__path__):
-                # names may include modules not in modules package; filter later if needed
-                pass
-        except Exception:
-            pass
-    return out
+    from nomaanos import registry
+    return registry.list_modules()
 
 def _import_module_by_name(name):
     if not name:
@@ -41,6 +31,21 @@ def _import_module_by_name(name):
     except Exception as e:
         raise ImportError(f"Could not import module {name}: {last}") from last
 
+def _arity(fn):
+    """Number of parameters fn declares; reads the code object so inspect stays unimported."""
+    code = getattr(fn, "__code__", None)
+    if code is not None and not isinstance(fn, type):
+        n = code.co_argcount + code.co_kwonlyargcount
+        if code.co_flags & 0x04:  # CO_VARARGS
+            n += 1
+        if code.co_flags & 0x08:  # CO_VARKEYWORDS
+            n += 1
+        if getattr(fn, "__self__", None) is not None:
+            n -= 1
+        return n
+    import inspect
+    return len(inspect.signature(fn).parameters)
+
 def _call_entrypoint(mod, name):
     """Call main()/run() in a tolerant order."""
     if mod is None:
@@ -50,8 +55,7 @@ def _call_entrypoint(mod, name):
     if hasattr(mod, "main") and callable(getattr(mod, "main")):
         main_fn = getattr(mod, "main")
         try:
-            sig = inspect.signature(main_fn)
-            if len(sig.parameters) == 0:
+            if _arity(main_fn) == 0:
                 return main_fn()
             else:
                 return main_fn(name)
@@ -82,8 +86,196 @@ def _call_entrypoint(mod, name):
 
     raise RuntimeError(f"No callable entrypoint found in module {mod!r}")
 
+def _call_spec(fn, name, arity):
+    """Call an entry point whose arity the registry already knows."""
+    if arity is None:
+        arity = _arity(fn)
+    if arity == 0:
+        return fn()
+    return fn(name)
+
+_MISS = object()
+
+def _await(result, timeout=None):
+    """Drive the coroutine an `async def` entry point returned on the shared loop."""
+    if hasattr(result, "__await__"):
+        # asyncio only gets imported once a module actually needs it
+        from nomaanos import aio
+        return aio.run(result, timeout)
+    return result
+
+def _run_spec(spec, name, drive=True):
+    """
+    Import and call a registry entry; arity in the manifest only describes the recorded entry.
+    With drive=False an async entry point's coroutine is returned un-awaited.
+    """
+    from nomaanos import registry
+    with trace.span("import", module=spec["module"]):
+        fn = registry.load(spec)
+    if fn is None:
+        return _run_unregistered(name)
+    with trace.span("resolve", entry=spec.get("entry")):
+        arity = spec.get("arity") if getattr(fn, "__name__", None) == spec.get("entry") else None
+        if arity is None:
+            arity = _arity(fn)
+    with trace.span("execute", module=name):
+        res = _call_spec(fn, name, arity)
+        return _await(res) if drive else res
+
+def _run_unregistered(name):
+    with trace.span("import", module=name, candidates=True):
+        mod = _import_module_by_name(name)
+    with trace.span("execute", module=name):
+        return _await(_call_entrypoint(mod, name))
+
 def run(name):
+    if not history.enabled():
+        return _run(name)
+    from nomaanos import registry
+    spec = registry.lookup(name) if name else None
+    if spec is not None and spec.get("inputs"):
+        return _run(name)  # the pipeline records each module it runs
+    t0 = time.time()
+    try:
+        res = _run(name)
+    except BaseException as e:
+        history.record(name, t0, time.time() - t0, "error", f"{type(e).__name__}: {e}")
+        raise
+    history.record(name, t0, time.time() - t0, history.status_of(res), res)
+    return res
+
+def _run(name):
     if not name:
         raise ValueError("module name required, e.g. 'nomaanos run sysinfo'")
-    mod = _import_module_by_name(name)
-    return _call_entrypoint(mod, name)
+    from nomaanos import registry
+    with trace.span("discover", module=name):
+        spec = registry.lookup(name)
+    if spec is None:
+        # not in the registry: keep the old tolerant import path
+        return _run_unregistered(name)
+    if spec.get("inputs"):
+        # consumes other modules' results: run its upstream graph first
+        from nomaanos import pipeline
+        return pipeline.run([name])[name]
+    if not spec.get("cache_ttl"):
+        return _run_spec(spec, name)
+    # CACHE_TTL modules: a hit skips the import as well as the call
+    from nomaanos import cache
+    key = f"run:{name}"
+    hit = cache.get(key, _MISS)
+    if hit is not _MISS:
+        return hit
+    res = _run_spec(spec, name)
+    if is_stream(res):
+        # a stream can only be consumed once; never cache it
+        return res
+    return cache.put(key, res, spec["cache_ttl"])
+
+def _run_async(specs, timeout):
+    """Start every async module in `specs` and await them together on the shared loop."""
+    from nomaanos import aio, cache
+    results, coros = {}, {}
+    for n, spec in specs.items():
+        hit = cache.get(f"run:{n}", _MISS) if spec.get("cache_ttl") else _MISS
+        if hit is not _MISS:
+            results[n] = hit
+            continue
+        try:
+            res = _run_spec(spec, n, drive=False)
+        except BaseException as e:
+            results[n] = {"error": f"{type(e).__name__}: {e}"}
+            continue
+        if hasattr(res, "__await__"):
+            coros[n] = res
+        else:
+            # async generators are streamed by the caller, not awaited here
+            results[n] = res
+    spans = {}  # name -> (start, end) of that coroutine alone
+
+    async def timed(n, coro):
+        t = time.time()
+        try:
+            return await coro
+        finally:
+            spans[n] = (t, time.time())
+
+    t0 = time.time()
+    record = history.enabled()
+    for n, res in aio.gather({n: timed(n, c) for n, c in coros.items()}, timeout).items():
+        results[n] = res
+        if record:
+            start, end = spans.get(n, (t0, time.time()))
+            history.record(n, start, end - start, history.status_of(res), res)
+        if specs[n].get("cache_ttl") and not (isinstance(res, dict) and "error" in res):
+            cache.put(f"run:{n}", res, specs[n]["cache_ttl"])
+    return results
+
+def run_many(names, jobs=None, timeout=None):
+    """
+    Run several modules concurrently, at most `jobs` at a time.
+    Returns {name: result}; a module that raises or exceeds `timeout` seconds
+    gets {"error": ...} instead and never holds up the others.
+    Modules run on daemon threads, so one that hangs past its timeout is
+    abandoned rather than joined and won't keep the CLI from exiting.
+    `async def` modules skip the threads: they are awaited together on the
+    shared event loop and cancelled when their timeout runs out.
+    Without a timeout, names that declare INPUTS run as one pipeline graph.
+    """
+    import threading
+    from nomaanos import registry
+    names = list(dict.fromkeys(n for n in names if n))
+    jobs = max(1, jobs or len(names) or 1)
+    async_specs, piped = {}, False
+    for n in names:
+        spec = registry.lookup(n)
+        if spec is not None and spec.get("async"):
+            async_specs[n] = spec
+        piped = piped or bool(spec and spec.get("inputs"))
+    if piped and timeout is None:
+        # modules with INPUTS: one graph, so shared upstreams run once for all of them
+        from nomaanos import pipeline
+        try:
+            return pipeline.run(names, jobs=jobs)
+        except pipeline.PipelineError as e:
+            return {n: {"error": str(e)} for n in names}
+    queue = [n for n in reversed(names) if n not in async_specs]
+    running = {}  # name -> monotonic start
+    results = {}
+    cond = threading.Condition()
+
+    aio_thread = None
+    if async_specs:
+        aio_thread = threading.Thread(target=lambda: results.update(_run_async(async_specs, timeout)),
+                                      name="nomaanos-run-async", daemon=True)
+        aio_thread.start()
+
+    def work(n):
+        try:
+            res = run(n)
+        except BaseException as e:
+            res = {"error": f"{type(e).__name__}: {e}"}
+        with cond:
+            if n in running:  # not already given up on
+                del running[n]
+                results[n] = res
+            cond.notify()
+
+    with cond:
+        while queue or running:
+            while queue and len(running) < jobs:
+                n = queue.pop()
+                running[n] = time.monotonic()
+                threading.Thread(target=work, args=(n,), name=f"nomaanos-run-{n}", daemon=True).start()
+            if timeout is None:
+                cond.wait()
+                continue
+            now = time.monotonic()
+            expired = [n for n, t0 in running.items() if now - t0 >= timeout]
+            for n in expired:
+                del running[n]
+                results[n] = {"error": f"timed out after {timeout}s"}
+            if not expired:
+                cond.wait(min(running.values()) + timeout - now)
+    if aio_thread is not None:
+        aio_thread.join()
+    return {n: results[n] for n in names}
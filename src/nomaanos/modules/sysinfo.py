@@ -1,8 +1,17 @@
+"""Host facts plus live /proc metrics (NOMAANOS_SYSINFO=cpu,mem,... or 'all' picks groups)."""
+import os, time
+
+from nomaanos import metrics
+from nomaanos.core import host_facts
+
 def main():
-    return {
+    host = host_facts()
+    out = {
         "project": "NomaanOS",
-        "time": "2025-11-22T00:00:00Z",
-        "user": "unknown",
-        "python": __import__("platform").python_version(),
-        "platform": __import__("platform").platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "user": os.getenv("USER", "unknown"),
+        "python": host["python"],
+        "platform": host["platform"],
     }
+    out.update(metrics.snapshot(metrics.parse_groups(os.environ.get("NOMAANOS_SYSINFO"))))
+    return out
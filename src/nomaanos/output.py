@@ -0,0 +1,96 @@
+"""
+Result serialisation for the CLI (`--format repr|json|ndjson`).
+
+  repr    print(result), the historical output (default)
+  json    one JSON document; generators are collected into a list first
+  ndjson  one JSON value per line, written and flushed as each record is
+          produced, so a generator module streams in constant memory
+
+A module streams by returning a generator (or async generator):
+
+    def main():
+        for path in walk():
+            yield {"path": path}
+
+Generator results default to ndjson, since their repr is useless.
+"""
+import sys
+
+FORMATS = ("repr", "json", "ndjson")
+
+class FormatError(ValueError):
+    pass
+
+def pop_format(args):
+    """Strip --format X / --format=X from args; returns (args, format or None)."""
+    out, fmt = [], None
+    it = iter(args)
+    for a in it:
+        if a == "--format":
+            fmt = next(it, None)
+        elif a.startswith("--format="):
+            fmt = a.partition("=")[2]
+        else:
+            out.append(a)
+    if fmt is not None and fmt not in FORMATS:
+        raise FormatError(f"unknown --format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return out, fmt
+
+def next_number(it, flag, kind=float):
+    """The value after `flag` in the arg iterator as kind; ValueError names the flag when it's missing or bad."""
+    value = next(it, None)
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{flag} expects a number, got {value!r}") from None
+
+def is_stream(result):
+    """True for generators / iterators / async generators (not lists, dicts or strings)."""
+    return hasattr(result, "__next__") or hasattr(result, "__anext__")
+
+def iterate(result):
+    """Iterate a stream; async generators are stepped on the shared event loop."""
+    if not hasattr(result, "__anext__"):
+        yield from result
+        return
+    from nomaanos import aio
+    while True:
+        try:
+            yield aio.run(result.__anext__())
+        except StopAsyncIteration:
+            return
+
+def materialise(result):
+    """Turn stream results (also inside a run_many dict) into lists."""
+    if is_stream(result):
+        return list(iterate(result))
+    if isinstance(result, dict):
+        return {k: materialise(v) if is_stream(v) else v for k, v in result.items()}
+    return result
+
+def _dumps(obj):
+    import json
+    return json.dumps(obj, default=str, separators=(",", ":"))
+
+def emit(result, fmt=None, out=None, label=None):
+    """Write result to out (stdout) in fmt; label prefixes repr output only."""
+    out = out or sys.stdout
+    if fmt is None:
+        fmt = "ndjson" if is_stream(result) else "repr"
+    if fmt == "repr":
+        result = materialise(result)
+        out.write((f"{label} {result!r}" if label else f"{result}") + "\n")
+    elif fmt == "json":
+        import json
+        out.write(json.dumps(materialise(result), default=str) + "\n")
+    else:
+        if is_stream(result):
+            records = iterate(result)
+        elif isinstance(result, (list, tuple)):
+            records = result
+        else:
+            records = (result,)
+        for rec in records:
+            out.write(_dumps(rec) + "\n")
+            out.flush()
+    out.flush()
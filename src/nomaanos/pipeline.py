@@ -0,0 +1,227 @@
+"""
+Module pipelines: modules consume other modules' results in-process.
+
+A module declares what it needs with a top-level INPUTS; its entry point
+gets one keyword argument per input, holding that module's result object:
+
+    # modules/report.py
+    INPUTS = ("sysinfo", "netstat")
+
+    def main(sysinfo, netstat):
+        return {"host": sysinfo["platform"], "conns": len(netstat)}
+
+`nomaanos run report` and `nomaanos pipe report` build the dependency graph,
+run every upstream exactly once, run independent branches in parallel and
+hand results over as Python objects (no printing, no re-parsing). Streamed
+upstream results are collected into lists before they are shared.
+
+Named pipelines live in config under "pipelines", either a list of targets
+or a dict that also wires modules which don't declare INPUTS themselves:
+    {"daily": ["report", "backup_check"],
+     "quick": {"run": ["summary"], "inputs": {"summary": ["sysinfo", "hello"]}}}
+
+  nomaanos pipe <pipeline|module> [--all] [--jobs N] [--format json]
+  nomaanos pipe list | show <name> | add <name> <module> ... | remove <name>
+"""
+import threading, time
+
+from nomaanos import trace
+
+class PipelineError(ValueError):
+    pass
+
+def _declared_inputs(name, spec):
+    if spec.get("source") == "entry_point":
+        # third-party modules aren't parsed ahead of time; ask the module itself
+        from importlib import import_module
+        try:
+            return list(getattr(import_module(spec["module"]), "INPUTS", ()) or ())
+        except Exception:
+            return []
+    return list(spec.get("inputs") or ())
+
+def graph(targets, extra=None):
+    """{module: [inputs]} for everything `targets` needs; raises PipelineError on cycles/unknowns."""
+    from nomaanos import registry
+    extra = extra or {}
+    deps, state = {}, {}  # state: 1 = visiting, 2 = done
+
+    def visit(n, path):
+        if state.get(n) == 2:
+            return
+        if state.get(n) == 1:
+            raise PipelineError("dependency cycle: " + " -> ".join(path[path.index(n):] + [n]))
+        state[n] = 1
+        spec = registry.lookup(n)
+        if spec is None:
+            raise PipelineError(f"unknown module {n!r}" + (f" (input of {path[-1]!r})" if path else ""))
+        ins = list(dict.fromkeys(_declared_inputs(n, spec) + list(extra.get(n, ()))))
+        deps[n] = ins
+        for i in ins:
+            visit(i, path + [n])
+        state[n] = 2
+
+    for t in targets:
+        visit(t, [])
+    return deps
+
+def levels(deps):
+    """Topological layers: every module only depends on earlier layers."""
+    out, done = [], set()
+    left = dict(deps)
+    while left:
+        layer = sorted(n for n, ins in left.items() if all(i in done for i in ins))
+        out.append(layer)
+        done.update(layer)
+        for n in layer:
+            del left[n]
+    return out
+
+def _call(name, inputs):
+    """Run one node: plain modules go through runner.run (cache, history); others get their inputs."""
+    from nomaanos.modules import runner
+    if not inputs:
+        return runner.run(name)
+    from nomaanos import history, registry
+    spec = registry.lookup(name)
+    t0 = time.time()
+    try:
+        with trace.span("import", module=spec["module"]):
+            fn = registry.load(spec)
+        if fn is None:
+            raise RuntimeError(f"No callable entrypoint found in module {name}")
+        with trace.span("execute", module=name, inputs=",".join(inputs)):
+            res = runner._await(fn(**inputs))
+    except BaseException as e:
+        if history.enabled():
+            history.record(name, t0, time.time() - t0, "error", f"{type(e).__name__}: {e}")
+        raise
+    if history.enabled():
+        history.record(name, t0, time.time() - t0, history.status_of(res), res)
+    return res
+
+def run(targets, extra=None, jobs=None, keep_all=False):
+    """
+    Execute the graph behind `targets`; returns {target: result} (every node with keep_all).
+    A node that fails yields {"error": ...} and its dependents are skipped with an
+    {"error": "upstream ... failed"} instead of being called with bad input.
+    """
+    from nomaanos.output import is_stream, materialise
+    deps = graph(targets, extra)
+    users = {n: [] for n in deps}
+    for n, ins in deps.items():
+        for i in ins:
+            users[i].append(n)
+    waiting = {n: len(ins) for n, ins in deps.items()}
+    results, failed = {}, set()
+    jobs = max(1, jobs or len(deps))
+    cond = threading.Condition()
+    ready = [n for n, c in waiting.items() if c == 0]
+    running = [0]
+
+    def work(n):
+        bad = [i for i in deps[n] if i in failed]
+        if bad:
+            res, ok = {"error": f"upstream {', '.join(bad)} failed"}, False
+        else:
+            try:
+                res = _call(n, {i: results[i] for i in deps[n]})
+                if users[n] and is_stream(res):
+                    res = materialise(res)  # shared by downstream modules: consume once
+                ok = not (isinstance(res, dict) and "error" in res and users[n])
+            except BaseException as e:
+                res, ok = {"error": f"{type(e).__name__}: {e}"}, False
+        with cond:
+            results[n] = res
+            if not ok:
+                failed.add(n)
+            for u in users[n]:
+                waiting[u] -= 1
+                if waiting[u] == 0:
+                    ready.append(u)
+            running[0] -= 1
+            cond.notify()
+
+    with cond:
+        while ready or running[0]:
+            while ready and running[0] < jobs:
+                n = ready.pop()
+                running[0] += 1
+                threading.Thread(target=work, args=(n,), name=f"nomaanos-pipe-{n}", daemon=True).start()
+            if running[0]:
+                cond.wait()
+    keep = deps if keep_all else targets
+    return {n: results[n] for n in keep}
+
+def definition(name, cfg=None):
+    """(targets, extra inputs) for a configured pipeline, or the module `name` on its own."""
+    from nomaanos import config
+    pipes = (cfg if cfg is not None else config.load()).get("pipelines") or {}
+    d = pipes.get(name)
+    if d is None:
+        return [name], {}
+    if isinstance(d, str):
+        d = [d]
+    if isinstance(d, list):
+        return list(d), {}
+    return list(d.get("run") or []), dict(d.get("inputs") or {})
+
+def cli(args):
+    """Handler for `nomaanos pipe ...`."""
+    from nomaanos import config
+    from nomaanos.output import emit, next_number, pop_format
+    args, fmt = pop_format(args)
+    keep_all, jobs, rest = False, None, []
+    it = iter(args)
+    try:
+        for a in it:
+            if a == "--all":
+                keep_all = True
+            elif a in ("--jobs", "-j"):
+                jobs = next_number(it, a, int) or None
+            else:
+                rest.append(a)
+    except ValueError as e:
+        print(f"[ERROR] pipe: {e}")
+        return 2
+    usage = "Usage: nomaanos pipe <pipeline|module> [--all] [--jobs N] | list | show <name> | add <name> <module>... | remove <name>"
+    if not rest:
+        print(usage)
+        return 1
+    sub = rest[0]
+    try:
+        if sub == "list":
+            emit(config.get("pipelines") or {}, fmt)
+        elif sub == "show":
+            if len(rest) < 2:
+                raise PipelineError(usage)
+            deps = graph(*definition(rest[1]))
+            for i, layer in enumerate(levels(deps)):
+                print(f"stage {i}: " + "  ".join(f"{n}" + (f" <- {','.join(deps[n])}" if deps[n] else "")
+                                                   for n in layer))
+        elif sub == "add":
+            if len(rest) < 3:
+                raise PipelineError(usage)
+            graph(rest[2:])  # validate before saving
+            pipes = dict(config.get("pipelines") or {})
+            pipes[rest[1]] = rest[2:]
+            config.update({"pipelines": pipes})
+            print(f"Pipeline {rest[1]}: {rest[2:]}")
+        elif sub == "remove":
+            pipes = dict(config.get("pipelines") or {})
+            if len(rest) < 2 or pipes.pop(rest[1], None) is None:
+                raise PipelineError(f"no such pipeline {rest[1] if len(rest) > 1 else ''!r}")
+            config.update({"pipelines": pipes})
+            print(f"Removed {rest[1]}")
+        else:
+            targets, extra = definition(sub)
+            result = run(targets, extra, jobs=jobs, keep_all=keep_all)
+            with trace.span("serialise"):
+                if fmt == "ndjson":
+                    from nomaanos.output import materialise
+                    result = [{"module": n, "result": materialise(v)} for n, v in result.items()]
+                emit(result, fmt)
+    except PipelineError as e:
+        print(f"[ERROR] pipe: {e}")
+        return 1
+    return 0
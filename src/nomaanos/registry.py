@@ -0,0 +1,268 @@
+"""
+Module registry for nomaanos.
+One source of truth for which modules exist and how to call them, backed by
+an on-disk manifest so `modules` and `run` don't re-scan and trial-import.
+
+Manifest entry per module:
+    {"module": "nomaanos.modules.sysinfo", "entry": "main", "arity": 0,
+     "doc": "...", "cache_ttl": None, "inputs": [], "source": "builtin", "stat": [mtime_ns, size]}
+
+A module opts into result caching with a top-level `CACHE_TTL = <seconds>`,
+and consumes other modules' results with `INPUTS = ("sysinfo", ...)`; its
+entry point then gets one keyword argument per input (see pipeline.py).
+
+Built-in modules live in nomaanos/modules/*.py. Third-party packages can add
+modules through the "nomaanos.modules" entry-point group:
+    [options.entry_points]
+    nomaanos.modules =
+        weather = mypkg.weather          # module with main()/run()
+        ping = mypkg.net:ping            # explicit callable
+
+Inside a `nomaanos bundle` zipapp the built-in entries come from the manifest
+frozen at build time (nomaanos._bundled); nothing there can change, so the
+directory scan and per-file stat checks are skipped.
+"""
+import json, os
+
+from nomaanos.config import CACHE_DIR
+
+MANIFEST_VERSION = 3
+MANIFEST_FILE = os.environ.get("NOMAANOS_MANIFEST", os.path.join(CACHE_DIR, "manifest.json"))
+MODULE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modules")
+PKG = "nomaanos.modules"
+ENTRY_POINT_GROUP = "nomaanos.modules"
+EXCLUDE = ("__init__.py", "runner.py")
+
+_manifest = None
+
+try:
+    from nomaanos._bundled import MANIFEST as BUNDLED
+except ImportError:
+    BUNDLED = None
+
+def _stat_key(st):
+    return [st.st_mtime_ns, st.st_size]
+
+def _entry_arity(fn):
+    a = fn.args
+    n = len(getattr(a, "posonlyargs", [])) + len(a.args) + len(a.kwonlyargs)
+    if a.vararg is not None:
+        n += 1
+    if a.kwarg is not None:
+        n += 1
+    return n
+
+def analyse_file(path):
+    """Read entry point, arity and docstring from source without importing it."""
+    import ast
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    funcs = {}
+    cache_ttl = None
+    inputs = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            funcs[node.name] = node
+        elif (isinstance(node, ast.Assign) and len(node.targets) == 1
+              and isinstance(node.targets[0], ast.Name)):
+            target, value = node.targets[0].id, node.value
+            if (target == "CACHE_TTL" and isinstance(value, ast.Constant)
+                    and isinstance(value.value, (int, float))):
+                cache_ttl = value.value
+            elif target == "INPUTS" and isinstance(value, (ast.Tuple, ast.List)):
+                inputs = [e.value for e in value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    entry = arity = None
+    is_async = False
+    for attr in ("main", "run"):
+        if attr in funcs:
+            node = funcs[attr]
+            entry, arity = attr, _entry_arity(node)
+            is_async = isinstance(node, ast.AsyncFunctionDef)
+            break
+    doc = ast.get_docstring(tree)
+    if doc is None and entry is not None:
+        doc = ast.get_docstring(funcs[entry])
+    return {"entry": entry, "arity": arity, "async": is_async, "doc": doc, "cache_ttl": cache_ttl, "inputs": inputs}
+
+def _scan_dir(old=None):
+    """Scan MODULE_DIR, re-analysing only files whose stat changed since `old`."""
+    if BUNDLED is not None:
+        return BUNDLED["modules"]
+    old = old or {}
+    found = {}
+    with os.scandir(MODULE_DIR) as it:
+        for e in it:
+            n = e.name
+            if not n.endswith(".py") or n in EXCLUDE or n.startswith("_"):
+                continue
+            name = n[:-3]
+            key = _stat_key(e.stat())
+            prev = old.get(name)
+            if prev is not None and prev.get("source") == "builtin" and prev.get("stat") == key:
+                found[name] = prev
+                continue
+            try:
+                spec = analyse_file(e.path)
+            except Exception as ex:
+                spec = {"entry": None, "arity": None, "async": False, "doc": None, "cache_ttl": None,
+                        "inputs": [], "error": str(ex)}
+            spec.update({"module": f"{PKG}.{name}", "source": "builtin", "stat": key})
+            found[name] = spec
+    return found
+
+def _path_signature():
+    """mtimes of sys.path directories; installing a distribution bumps one of them."""
+    import sys
+    sig = []
+    for p in sys.path:
+        if not p:
+            continue
+        try:
+            sig.append([p, os.stat(p).st_mtime_ns])
+        except OSError:
+            continue
+    return sig
+
+def _scan_entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return {}
+    try:
+        eps = entry_points()
+        group = eps.select(group=ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(ENTRY_POINT_GROUP, [])
+    except Exception:
+        return {}
+    found = {}
+    for ep in group:
+        module, _, attr = ep.value.partition(":")
+        found[ep.name] = {
+            "module": module.strip(),
+            "entry": attr.strip() or None,
+            "arity": None,
+            "async": False,
+            "doc": None,
+            "cache_ttl": None,
+            "inputs": [],
+            "source": "entry_point",
+        }
+    return found
+
+def _dir_mtime():
+    if BUNDLED is not None:
+        return BUNDLED["built"]
+    try:
+        return os.stat(MODULE_DIR).st_mtime_ns
+    except OSError:
+        return None
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_FILE) as f:
+            data = json.load(f)
+    except Exception:
+        return None
+    if data.get("version") != MANIFEST_VERSION or data.get("dir") != MODULE_DIR:
+        return None
+    return data
+
+def _write_manifest(data):
+    import tempfile
+    tmp = None
+    try:
+        os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+        # a unique name per writer: two threads or processes never share a tmp file
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(MANIFEST_FILE) + ".",
+                                   suffix=".tmp", dir=os.path.dirname(MANIFEST_FILE))
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, MANIFEST_FILE)
+    except OSError:
+        # read-only home: run from the in-process copy only
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+def build(old=None):
+    """Rebuild the manifest (reusing unchanged entries from `old`) and persist it."""
+    old = old or {}
+    builtin = _scan_dir(old.get("modules"))
+    sig = _path_signature()
+    if old.get("path_sig") == sig and "entry_points" in old:
+        eps = old["entry_points"]
+    else:
+        eps = _scan_entry_points()
+    data = {
+        "version": MANIFEST_VERSION,
+        "dir": MODULE_DIR,
+        "dir_mtime": _dir_mtime(),
+        "path_sig": sig,
+        "modules": builtin,
+        "entry_points": eps,
+    }
+    _write_manifest(data)
+    return data
+
+def manifest(refresh=False):
+    """Return the current manifest, rebuilding only when the module dir changed."""
+    global _manifest
+    data = _manifest if _manifest is not None else _read_manifest()
+    if refresh or data is None or data.get("dir_mtime") != _dir_mtime():
+        data = build(data if not refresh else None)
+    _manifest = data
+    return data
+
+def _all(data):
+    out = dict(data.get("entry_points", {}))
+    out.update(data.get("modules", {}))  # built-ins win over third-party names
+    return out
+
+def list_modules(refresh=False):
+    """Sorted names of all runnable modules."""
+    try:
+        return sorted(_all(manifest(refresh)))
+    except Exception:
+        return []
+
+def lookup(name):
+    """Return the manifest entry for `name`, or None if no such module is known."""
+    global _manifest
+    data = manifest()
+    spec = _all(data).get(name)
+    if spec is None or spec.get("source") != "builtin" or BUNDLED is not None:
+        return spec
+    # edits in place don't touch the directory mtime; check this one file
+    try:
+        key = _stat_key(os.stat(os.path.join(MODULE_DIR, name + ".py")))
+    except OSError:
+        return None
+    if key != spec.get("stat"):
+        data = _manifest = build(data)
+        spec = data["modules"].get(name)
+    return spec
+
+def describe(name):
+    """Name, entry, arity and doc for one module (as shown by `nomaanos modules -v`)."""
+    spec = lookup(name)
+    if spec is None:
+        return None
+    return {"name": name, "module": spec["module"], "entry": spec.get("entry"),
+            "arity": spec.get("arity"), "async": spec.get("async", False),
+            "doc": spec.get("doc"), "inputs": spec.get("inputs", []), "source": spec.get("source")}
+
+def load(spec):
+    """Import the module behind `spec` and return its entry callable (or None)."""
+    from importlib import import_module
+    mod = import_module(spec["module"])
+    entry = spec.get("entry")
+    if entry:
+        fn = getattr(mod, entry, None)
+        if callable(fn):
+            return fn
+    for attr in ("main", "run"):
+        fn = getattr(mod, attr, None)
+        if callable(fn):
+            return fn
+    return None
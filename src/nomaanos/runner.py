@@ -5,32 +5,26 @@ Provides:
  - run(name=None) -> if name is None return info, else run named module
  - info() -> returns dict with basic info (printed as JSON by caller)
 """
-import json, time, platform
+import json, time
 
 def list_modules():
-    # discover modules under the package that are importable
+    # same answer as `nomaanos modules`: ask the module registry
     try:
-        import pkgutil, importlib
-        pkg = importlib.import_module("nomaanos")
-        pkgpath = getattr(pkg, "__path__", [])
-        names = []
-        for finder, name, ispkg in pkgutil.iter_modules(pkgpath):
-            if name.startswith("_"):
-                continue
-            # only top-level modules representing commands
-            names.append(name)
-        return sorted(names)
+        from nomaanos import registry
+        return registry.list_modules()
     except Exception:
         # fallback: hardcode common ones if discovery fails
         return ["hello", "sysinfo"]
 
 def info():
+    from nomaanos.core import host_facts
+    host = host_facts()
     return {
         "project": "NomaanOS",
         "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         "user": "unknown",
-        "python": platform.python_version(),
-        "platform": platform.platform(),
+        "python": host["python"],
+        "platform": host["platform"],
     }
 
 def run(name=None):
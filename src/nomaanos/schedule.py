@@ -0,0 +1,325 @@
+"""
+`nomaanos schedule`: run modules and backups periodically from one process.
+
+Jobs live in config under "schedule":
+    {"snap": {"run": "sysinfo", "every": "5m", "jitter": 10},
+     "backup": {"run": "@backup", "cron": "30 3 * * *", "max_concurrency": 1}}
+
+  run              module name, or "@backup" (incremental backup + prune)
+  every / cron     interval ("90", "5m", "2h", "1d") or 5-field cron expression
+  jitter           random 0..N seconds added to each due time
+  max_concurrency  overlapping runs allowed (default 1); extra ticks are skipped
+  isolate          run the module in a limited child process (see isolate.py)
+
+Due times sit in a heap and the loop sleeps until the earliest one. After a
+missed stretch (phone asleep, scheduler stopped) a job runs once, not once
+per missed tick: the next due time is always computed from now. Last-run
+state persists in config under "schedule_state", so a restart keeps the
+cadence instead of firing everything again.
+
+  nomaanos schedule                      run the scheduler in the foreground
+  nomaanos schedule list                 jobs, last run and next due time
+  nomaanos schedule add NAME MODULE (--every 5m | --cron "*/5 * * * *")
+                        [--jitter S] [--max N] [--isolate]
+  nomaanos schedule remove NAME
+"""
+import heapq, random, threading, time
+
+MAX_SLEEP = 60.0  # re-read the wall clock at least this often (suspend/resume)
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+class ScheduleError(ValueError):
+    pass
+
+def parse_interval(spec):
+    """'90' / '90s' / '5m' / '2h' / '1d' -> seconds."""
+    s = str(spec).strip()
+    mult = UNITS.get(s[-1:].lower())
+    try:
+        secs = float(s[:-1]) * mult if mult else float(s)
+    except ValueError:
+        raise ScheduleError(f"bad interval {spec!r}; expected e.g. 90, 5m, 2h, 1d") from None
+    if secs <= 0:
+        raise ScheduleError(f"interval must be positive, got {spec!r}")
+    return secs
+
+def _cron_field(field, lo, hi):
+    out = set()
+    for part in field.split(","):
+        rng, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a, b = (int(x) for x in rng.split("-", 1))
+        else:
+            a = b = int(rng)
+            if step != 1:
+                b = hi
+        if a < lo or b > hi or a > b or step < 1:
+            raise ValueError(part)
+        out.update(range(a, b + 1, step))
+    return frozenset(out)
+
+class Cron:
+    """Standard 5-field cron (minute hour day-of-month month day-of-week), local time."""
+
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ScheduleError(f"cron needs 5 fields, got {expr!r}")
+        try:
+            self.minute, self.hour, self.dom, self.month, dow = (
+                _cron_field(f, lo, hi) for f, (lo, hi) in zip(fields, CRON_RANGES))
+        except ValueError as e:
+            raise ScheduleError(f"bad cron field {e} in {expr!r}") from None
+        self.dow = frozenset(0 if d == 7 else d for d in dow)  # 7 is Sunday as well
+        # cron ORs day-of-month and day-of-week when both are restricted
+        self._dom_any = fields[2].startswith("*")
+        self._dow_any = fields[4].startswith("*")
+        self.expr = expr
+
+    def _day_ok(self, tm):
+        dom = tm.tm_mday in self.dom
+        dow = (tm.tm_wday + 1) % 7 in self.dow  # tm_wday: Monday=0; cron: Sunday=0
+        if self._dom_any or self._dow_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, t):
+        """First matching minute strictly after t (epoch seconds)."""
+        t = (int(t) // 60 + 1) * 60
+        limit = t + 366 * 86400 * 5
+        while t < limit:
+            tm = time.localtime(t)
+            if tm.tm_mon not in self.month or not self._day_ok(tm):
+                # jump to the next local midnight (mktime normalises day + 1, DST included)
+                t = int(time.mktime((tm.tm_year, tm.tm_mon, tm.tm_mday + 1, 0, 0, 0, 0, 0, -1)))
+                continue
+            if tm.tm_hour not in self.hour:
+                t += 3600 - tm.tm_min * 60
+                continue
+            if tm.tm_min not in self.minute:
+                t += 60
+                continue
+            return float(t)
+        raise ScheduleError(f"cron {self.expr!r} never matches")
+
+class Job:
+    def __init__(self, name, spec):
+        self.name = name
+        self.target = spec.get("run") or spec.get("module")
+        if not self.target:
+            raise ScheduleError(f"job {name!r} has no 'run' target")
+        if "cron" in spec:
+            self.cron, self.every = Cron(spec["cron"]), None
+        elif "every" in spec:
+            self.cron, self.every = None, parse_interval(spec["every"])
+        else:
+            raise ScheduleError(f"job {name!r} needs 'every' or 'cron'")
+        self.jitter = float(spec.get("jitter", 0))
+        self.max_concurrency = max(1, int(spec.get("max_concurrency", 1)))
+        self.isolate = bool(spec.get("isolate", False))
+        self.running = 0
+
+    def next_due(self, after):
+        """Next due time after `after`, jitter included."""
+        base = self.cron.next_after(after) if self.cron else after + self.every
+        return base + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def first_due(self, last_run, now):
+        """Resume from persisted state; an overdue job runs once, right away."""
+        if last_run is None:
+            return now if self.every else self.next_due(now)
+        due = self.next_due(last_run)
+        return now if due <= now else due
+
+def load_jobs(cfg=None):
+    from nomaanos import config
+    cfg = cfg if cfg is not None else config.load()
+    return {name: Job(name, spec) for name, spec in (cfg.get("schedule") or {}).items()}
+
+def _execute(job):
+    """Run the job's target once; returns (status, detail)."""
+    if job.target == "@backup":
+        from nomaanos import backup
+        res = backup.backup()
+        if "error" in res:
+            return "error", res["error"]
+        backup.prune()
+        return "ok", res.get("snapshot")
+    if job.isolate:
+        from nomaanos import isolate
+        res = isolate.run(job.target, **isolate.limits())
+        return res["status"], res.get("error")
+    from nomaanos.modules.runner import run
+    from nomaanos.output import materialise
+    res = materialise(run(job.target))
+    if isinstance(res, dict) and "error" in res:
+        return "error", res["error"]
+    return "ok", None
+
+class Scheduler:
+    def __init__(self, jobs, state=None, out=None):
+        import sys
+        self.jobs = jobs
+        self.state = dict(state or {})
+        self.out = out or sys.stdout
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._write_lock = threading.Lock()  # serialises config writes, outside _cond
+        self._version = 0   # bumped per state change
+        self._written = 0   # newest version on disk
+
+    def _push(self, due, name):
+        self._seq += 1
+        heapq.heappush(self._heap, (due, self._seq, name))
+
+    def _log(self, msg):
+        with self._cond:
+            self.out.write(time.strftime("%Y-%m-%d %H:%M:%S ") + msg + "\n")
+            self.out.flush()
+
+    def _persist(self, name, entry):
+        """Store a finished run (its "runs" count continues the stored one) and write the state out."""
+        from nomaanos import config
+        with self._cond:
+            # count and snapshot under one lock: overlapping runs of a job never lose an increment
+            entry = dict(entry, runs=self.state.get(name, {}).get("runs", 0) + 1)
+            self.state[name] = entry
+            self._version += 1
+            version, snapshot = self._version, dict(self.state)
+        # the file write runs without _cond so the dispatch loop never waits on disk;
+        # a snapshot older than one already written is dropped, never written over it
+        with self._write_lock:
+            if version <= self._written:
+                return
+            try:
+                config.update({"schedule_state": snapshot})
+            except OSError as e:
+                self._log(f"[WARN] could not persist schedule state: {e}")
+                return
+            self._written = version
+
+    def _run(self, job, missed):
+        t0 = time.time()
+        try:
+            status, detail = _execute(job)
+        except Exception as e:
+            status, detail = "error", f"{type(e).__name__}: {e}"
+        dur = time.time() - t0
+        with self._cond:
+            job.running -= 1
+        self._log(f"{job.name}: {job.target} {status} in {dur:.2f}s"
+                  + (f" ({missed} missed runs coalesced)" if missed else "")
+                  + (f" - {detail}" if detail and status != "ok" else ""))
+        self._persist(job.name, {"last_run": t0, "last_status": status, "last_duration": round(dur, 3)})
+
+    def _missed(self, job, due, now):
+        """How many extra ticks fell between due and now (they collapse into this run)."""
+        if job.every:
+            return int((now - due) // job.every)
+        return 0
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def run(self):
+        now = time.time()
+        for name, job in self.jobs.items():
+            self._push(job.first_due(self.state.get(name, {}).get("last_run"), now), name)
+        with self._cond:
+            while not self._stopped and self._heap:
+                due = self._heap[0][0]
+                now = time.time()
+                if due > now:
+                    self._cond.wait(min(due - now, MAX_SLEEP))
+                    continue
+                _, _, name = heapq.heappop(self._heap)
+                job = self.jobs[name]
+                # coalesce: the next tick is counted from now, not from the missed due time
+                self._push(job.next_due(now), name)
+                if job.running >= job.max_concurrency:
+                    self._log(f"{name}: skipped, {job.running} run(s) still active")
+                    continue
+                job.running += 1
+                threading.Thread(target=self._run, args=(job, self._missed(job, due, now)),
+                                 name=f"nomaanos-schedule-{name}", daemon=True).start()
+
+    def upcoming(self):
+        return sorted((due, name) for due, _, name in self._heap)
+
+def _fmt_time(t):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t)) if t else "-"
+
+def _list(cfg):
+    jobs = load_jobs(cfg)
+    state = cfg.get("schedule_state") or {}
+    if not jobs:
+        print("No scheduled jobs; add one with `nomaanos schedule add NAME MODULE --every 5m`")
+    now = time.time()
+    for name, job in sorted(jobs.items()):
+        st = state.get(name, {})
+        when = job.cron.expr if job.cron else f"every {job.every:g}s"
+        print(f"{name:16} {job.target:12} {when:18} last {_fmt_time(st.get('last_run'))} "
+              f"({st.get('last_status', '-')})  next {_fmt_time(job.first_due(st.get('last_run'), now))}")
+
+def cli(args):
+    """Handler for `nomaanos schedule ...`."""
+    from nomaanos import config
+    sub = args[0] if args else None
+    try:
+        if sub == "list":
+            _list(config.load())
+        elif sub == "add":
+            if len(args) < 3:
+                raise ScheduleError("usage: nomaanos schedule add NAME MODULE (--every 5m | --cron EXPR)")
+            spec, it = {"run": args[2]}, iter(args[3:])
+            for a in it:
+                if a == "--cron":
+                    spec["cron"] = next(it, "")
+                elif a in ("--every", "--jitter"):
+                    spec[a[2:]] = config.coerce(next(it, ""))
+                elif a == "--max":
+                    spec["max_concurrency"] = int(next(it, "1"))
+                elif a == "--isolate":
+                    spec["isolate"] = True
+                else:
+                    raise ScheduleError(f"unknown option {a!r}")
+            Job(args[1], spec)  # validate before saving
+            jobs = dict(config.get("schedule") or {})
+            jobs[args[1]] = spec
+            config.update({"schedule": jobs})
+            print(f"Scheduled {args[1]}: {spec}")
+        elif sub == "remove":
+            jobs = dict(config.get("schedule") or {})
+            if len(args) < 2 or jobs.pop(args[1], None) is None:
+                raise ScheduleError(f"no such job {args[1] if len(args) > 1 else ''!r}")
+            state = dict(config.get("schedule_state") or {})
+            state.pop(args[1], None)
+            config.update({"schedule": jobs, "schedule_state": state})
+            print(f"Removed {args[1]}")
+        elif sub is None:
+            import signal
+            cfg = config.load()
+            sched = Scheduler(load_jobs(cfg), cfg.get("schedule_state"))
+            if not sched.jobs:
+                print("No scheduled jobs; add one with `nomaanos schedule add NAME MODULE --every 5m`")
+                return 1
+            signal.signal(signal.SIGTERM, lambda *a: sched.stop())
+            print(f"nomaanos scheduler running {len(sched.jobs)} job(s); Ctrl-C to stop")
+            try:
+                sched.run()
+            except KeyboardInterrupt:
+                sched.stop()
+        else:
+            raise ScheduleError("usage: nomaanos schedule [list | add NAME MODULE ... | remove NAME]")
+    except ScheduleError as e:
+        print(f"[ERROR] schedule: {e}")
+        return 1
+    return 0
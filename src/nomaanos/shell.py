@@ -0,0 +1,214 @@
+"""
+`nomaanos shell`: interactive prompt over the same subcommands as the CLI.
+
+    nomaanos> run sysinfo --format json
+    nomaanos> modules -v
+    nomaanos> history sysinfo --since 1h
+    nomaanos> NOMAANOS_FIND="backup prune" run find
+
+One interpreter for the whole session: the registry, config and every module
+stay imported. Before each command the shell stats the source of each loaded
+module and importlib.reload()s only the ones whose mtime changed (dropping
+their cached results), so an edit-and-run cycle costs the module's own
+import and call, not a full start. Each command prints its wall time.
+
+Shell-only commands: reload [module] (force), timing on|off, help, exit.
+History is kept in CACHE_DIR/shell_history (readline, where available).
+"""
+import os, shlex, sys, time
+
+from nomaanos.config import CACHE_DIR
+
+HISTORY_FILE = os.path.join(CACHE_DIR, "shell_history")
+HISTORY_LENGTH = 1000
+PROMPT = "nomaanos> "
+# commands that would block the prompt or nest the shell
+REFUSED = ("shell", "serve", "agent")
+
+class Reloader:
+    """Tracks source mtimes of imported modules and reloads the changed ones."""
+
+    def __init__(self):
+        self._seen = {}  # module name -> (path, mtime_ns)
+
+    def _candidates(self):
+        from nomaanos import registry
+        data = registry.manifest()
+        for name, spec in registry._all(data).items():
+            mod = sys.modules.get(spec["module"])
+            path = getattr(mod, "__file__", None) if mod is not None else None
+            if path and path.endswith(".py"):
+                yield name, mod, path
+
+    def track(self):
+        for name, mod, path in self._candidates():
+            if mod.__name__ not in self._seen:
+                try:
+                    self._seen[mod.__name__] = (path, os.stat(path).st_mtime_ns)
+                except OSError:
+                    continue
+
+    def reload_changed(self, force=None):
+        """Reload modules whose source changed (or the `force` ones); returns their names."""
+        import importlib
+        done = []
+        for name, mod, path in list(self._candidates()):
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            seen = self._seen.get(mod.__name__)
+            if seen is None:
+                self._seen[mod.__name__] = (path, mtime)
+                if force is None or name not in force:
+                    continue
+            elif seen[1] == mtime and (force is None or name not in force):
+                continue
+            try:
+                importlib.reload(mod)
+            except Exception as e:
+                print(f"[ERROR] reload {name}: {type(e).__name__}: {e}")
+            self._seen[mod.__name__] = (path, mtime)
+            from nomaanos import cache
+            cache.invalidate(f"run:{name}")
+            done.append(name)
+        return done
+
+def _setup_readline():
+    try:
+        import readline
+    except ImportError:
+        return None
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+
+    def complete(text, state):
+        from nomaanos.main import COMMANDS
+        buf = readline.get_line_buffer().split()
+        if len(buf) <= 1 and not readline.get_line_buffer().endswith(" "):
+            opts = sorted(list(COMMANDS) + ["reload", "timing", "help", "exit"])
+        else:
+            from nomaanos.modules import list_modules
+            opts = list_modules()
+        matches = [o for o in opts if o.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+    return readline
+
+def _save_history(readline):
+    if readline is None:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+class Shell:
+    def __init__(self):
+        self.reloader = Reloader()
+        self.timing = True
+
+    def execute(self, line):
+        """Run one shell line; returns False when the shell should exit."""
+        from nomaanos.main import USAGE, main
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return True
+        if not argv:
+            return True
+        # leading NAME=value words set environment variables for this command only
+        env = {}
+        while argv and "=" in argv[0] and argv[0].partition("=")[0].isidentifier():
+            k, _, v = argv.pop(0).partition("=")
+            env[k] = v
+        if not argv:
+            print("[ERROR] nothing to run after the variable assignments")
+            return True
+        cmd = argv[0]
+        if cmd in ("exit", "quit"):
+            return False
+        if cmd == "help":
+            print(USAGE)
+            print("In the shell also: 'reload [module ...]', 'timing on|off', 'exit'")
+            return True
+        if cmd == "timing":
+            self.timing = argv[1:] != ["off"]
+            return True
+        if cmd in REFUSED:
+            print(f"'{cmd}' is not available inside the shell; run it from a terminal")
+            return True
+        if cmd == "reload":
+            force = set(argv[1:]) or {n for n, _, _ in self.reloader._candidates()}
+            done = self.reloader.reload_changed(force)
+            print(f"Reloaded: {', '.join(done) or '(nothing)'}")
+            return True
+        t0 = time.perf_counter()
+        reloaded = self.reloader.reload_changed()
+        no_cache = os.environ.get("NOMAANOS_NO_CACHE")
+        saved = {k: os.environ.get(k) for k in env}
+        os.environ.update(env)
+        try:
+            # through main() so --trace[=FILE] is stripped and traces this command
+            main(argv)
+        except KeyboardInterrupt:
+            print("^C")
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"[ERROR] {cmd}: {type(e).__name__}: {e}")
+        finally:
+            # --no-cache applies to this command only
+            if no_cache is None:
+                os.environ.pop("NOMAANOS_NO_CACHE", None)
+            for k, v in saved.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+            sys.stdout.flush()
+        self.reloader.track()
+        if self.timing:
+            note = f", reloaded {', '.join(reloaded)}" if reloaded else ""
+            sys.stderr.write(f"({(time.perf_counter() - t0) * 1000:.2f} ms{note})\n")
+        return True
+
+    def run(self):
+        """The read-eval loop; returns the exit code."""
+        from nomaanos import daemon
+        # every command runs here, in the warm process, never via a daemon
+        os.environ["NOMAANOS_NO_DAEMON"] = "1"
+        t0 = time.perf_counter()
+        daemon._warm()
+        self.reloader.track()
+        readline = _setup_readline()
+        print(f"NomaanOS shell ({(time.perf_counter() - t0) * 1000:.0f} ms warm-up); 'help' for commands, Ctrl-D to exit")
+        try:
+            while True:
+                try:
+                    line = input(PROMPT)
+                except KeyboardInterrupt:
+                    print()
+                    continue
+                except EOFError:
+                    print()
+                    break
+                if not self.execute(line):
+                    break
+        finally:
+            _save_history(readline)
+        return 0
+
+def cli(args):
+    """Handler for `nomaanos shell`."""
+    if args:
+        print("Usage: nomaanos shell")
+        return 1
+    return Shell().run()
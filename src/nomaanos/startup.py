@@ -0,0 +1,64 @@
+"""
+Cold-start profiler for the nomaanos entry point.
+Runs `python -X importtime -m nomaanos <cmd>` in a fresh interpreter and
+summarises where the import time went.
+Use: nomaanos --importtime [--budget MS] [cmd ...]
+"""
+import os, subprocess, sys, time
+
+BUDGET_MS = float(os.environ.get("NOMAANOS_START_BUDGET_MS", "50"))
+
+def parse_importtime(text):
+    """Parse `-X importtime` stderr into a list of (self_us, cumulative_us, name)."""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((int(parts[0]), int(parts[1]), parts[2][1:].rstrip()))
+        except ValueError:
+            # header line ("self [us] | cumulative | imported package")
+            continue
+    return rows
+
+def profile(argv=(), top=10):
+    """Run one cold start of `nomaanos <argv>` and return a timing breakdown dict."""
+    env = dict(os.environ)
+    pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (pkg_root, env.get("PYTHONPATH")) if p)
+    cmd = [sys.executable, "-X", "importtime", "-m", "nomaanos"] + list(argv)
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env)
+    wall_ms = (time.perf_counter() - t0) * 1000.0
+    rows = parse_importtime(proc.stderr.decode(errors="replace"))
+    # top-level imports (no leading indent) are the ones the entry point pulled in
+    toplevel = [r for r in rows if not r[2].startswith(" ")]
+    import_ms = sum(r[1] for r in toplevel) / 1000.0
+    slowest = sorted(toplevel, key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "argv": list(argv),
+        "returncode": proc.returncode,
+        "wall_ms": round(wall_ms, 2),
+        "import_ms": round(import_ms, 2),
+        "top_imports": [{"module": r[2].strip(), "cumulative_ms": round(r[1] / 1000.0, 2)} for r in slowest],
+    }
+
+def report(args):
+    """CLI handler for `nomaanos --importtime`. Returns 1 when over budget."""
+    budget = BUDGET_MS
+    args = list(args)
+    if len(args) >= 2 and args[0] == "--budget":
+        budget = float(args[1])
+        args = args[2:]
+    res = profile(args)
+    res["budget_ms"] = budget
+    res["within_budget"] = res["import_ms"] <= budget
+    print(f"cold start: nomaanos {' '.join(args)}".rstrip())
+    print(f"  wall {res['wall_ms']:.1f} ms, imports {res['import_ms']:.1f} ms (budget {budget:.0f} ms)")
+    for row in res["top_imports"]:
+        print(f"  {row['cumulative_ms']:8.2f} ms  {row['module']}")
+    print("  OK" if res["within_budget"] else "  OVER BUDGET")
+    return 0 if res["within_budget"] else 1
@@ -0,0 +1,105 @@
+"""
+Per-phase timing spans for the dispatch pipeline.
+
+    with trace.span("import", module=name):
+        ...
+
+Disabled (the default) a span is one shared no-op object, so the
+instrumentation costs a function call. Enable it with `nomaanos --trace[=FILE] ...`
+or NOMAANOS_TRACE=1 / NOMAANOS_TRACE=<file>; at exit the spans are written as
+a Chrome trace-event file (open in chrome://tracing or Perfetto) and a
+one-line per-phase summary goes to stderr.
+"""
+import os, time
+from _thread import get_ident
+
+DEFAULT_FILE = "nomaanos-trace.json"
+# summary column order; other span names are appended after these
+PHASES = ("init", "discover", "import", "resolve", "execute", "serialise")
+
+_path = None
+_events = []   # (name, start_ns, end_ns, thread id, args)
+_early = []    # spans recorded before we knew whether tracing is on
+
+def enabled():
+    return _path is not None
+
+def enable(path=None):
+    global _path
+    _path = path or DEFAULT_FILE
+    _events.extend(_early)
+    del _early[:]
+
+class _Noop:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NOOP = _Noop()
+
+class _Span:
+    __slots__ = ("name", "args", "t0")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        _events.append((self.name, self.t0, time.perf_counter_ns(), get_ident(), self.args))
+        return False
+
+def span(name, **args):
+    if _path is None:
+        return _NOOP
+    return _Span(name, args)
+
+def record(name, start_ns, end_ns, **args):
+    """Add a span measured by hand; kept aside until enable() if tracing is still off."""
+    (_events if _path is not None else _early).append((name, start_ns, end_ns, get_ident(), args))
+
+def summary():
+    """{span name: total ms}, in pipeline order."""
+    totals = {}
+    for name, t0, t1, _, _ in _events:
+        totals[name] = totals.get(name, 0.0) + (t1 - t0) / 1e6
+    order = [p for p in PHASES if p in totals] + sorted(n for n in totals if n not in PHASES)
+    return {n: round(totals[n], 3) for n in order}
+
+def finish():
+    """Write the Chrome trace file and print the summary line; returns the file path."""
+    global _path
+    if _path is None:
+        return None
+    import json, sys
+    pid = os.getpid()
+    base = min((e[1] for e in _events), default=0)
+    events = [{
+        "name": name,
+        "cat": "nomaanos",
+        "ph": "X",
+        "ts": (t0 - base) / 1000.0,
+        "dur": (t1 - t0) / 1000.0,
+        "pid": pid,
+        "tid": tid,
+        "args": {k: str(v) for k, v in args.items()},
+    } for name, t0, t1, tid, args in _events]
+    path = _path
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    cols = "  ".join(f"{n} {ms:.2f}ms" for n, ms in summary().items())
+    sys.stderr.write(f"trace: {cols}  -> {path}\n")
+    _path = None
+    del _events[:]
+    return path
+
+_env = os.environ.get("NOMAANOS_TRACE")
+if _env:
+    enable(DEFAULT_FILE if _env == "1" else _env)
@@ -0,0 +1,213 @@
+"""
+`nomaanos watch <module>`: sample a module's entry point at a fixed interval
+inside one process and keep a compact time series of its numeric fields.
+
+Every numeric field of the result (nested dicts flattened to "a.b") gets a
+fixed-size RingBuffer backed by array('d'), so hours of sub-second samples use
+the same memory as the first minute. Each tick prints the value, delta, rate
+per second and min/avg/max over the last `window` samples.
+
+  nomaanos watch sysinfo [--interval 0.5] [--count N] [--window 60]
+                         [--fields cpu,mem] [--format ndjson]
+"""
+import math, sys, time
+from array import array
+
+class RingBuffer:
+    """Fixed-capacity float series; the oldest sample is overwritten when full."""
+
+    __slots__ = ("_buf", "_cap", "_head", "_len")
+
+    def __init__(self, capacity):
+        self._cap = max(1, int(capacity))
+        self._buf = array("d", bytes(8 * self._cap))
+        self._head = 0  # next slot to write
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, value):
+        self._buf[self._head] = value
+        self._head = (self._head + 1) % self._cap
+        if self._len < self._cap:
+            self._len += 1
+
+    def last(self, n=1):
+        """The newest n samples, oldest first."""
+        n = min(n, self._len)
+        start = self._head - n
+        if start >= 0:
+            return self._buf[start:self._head]
+        return self._buf[start:] + self._buf[:self._head]
+
+    def stats(self, window):
+        w = self.last(window)
+        if not w:
+            return None
+        return {"min": min(w), "avg": sum(w) / len(w), "max": max(w)}
+
+def flatten(result, prefix=""):
+    """Numeric leaves of a (nested) dict as {"a.b": float}; bools and strings are skipped."""
+    out = {}
+    if not isinstance(result, dict):
+        if isinstance(result, (int, float)) and not isinstance(result, bool):
+            out[prefix or "value"] = float(result)
+        return out
+    for k, v in result.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        if isinstance(v, dict):
+            out.update(flatten(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = float(v)
+    return out
+
+class Series:
+    """One RingBuffer per numeric field, plus the sample timestamps."""
+
+    def __init__(self, capacity=3600):
+        self.capacity = capacity
+        self.times = RingBuffer(capacity)
+        self.fields = {}
+        self._stamps = {}   # field -> (previous, newest) time it was sampled
+        self._current = ()  # fields present in the newest sample
+
+    def add(self, t, values):
+        self.times.append(t)
+        for k, v in values.items():
+            ring = self.fields.get(k)
+            if ring is None:
+                ring = self.fields[k] = RingBuffer(self.capacity)
+            ring.append(v)
+            self._stamps[k] = (self._stamps.get(k, (t, t))[1], t)
+        self._current = tuple(values)
+
+    def row(self, window, only=None):
+        """{field: {value, delta, rate, min, avg, max}} for the fields in the newest sample."""
+        out = {}
+        for k in self._current:
+            if only and not any(k == f or k.startswith(f + ".") for f in only):
+                continue
+            ring = self.fields[k]
+            # a field can skip samples: its rate spans its own last two readings
+            prev, t = self._stamps[k]
+            dt = t - prev
+            pair = ring.last(2)
+            delta = pair[-1] - pair[0] if len(pair) == 2 else 0.0
+            st = ring.stats(window)
+            out[k] = {
+                "value": pair[-1],
+                "delta": delta,
+                "rate": delta / dt if dt > 0 else 0.0,
+                "min": st["min"], "avg": st["avg"], "max": st["max"],
+            }
+        return out
+
+def _sampler(name):
+    """Resolve the module's entry point once; returns a zero-arg callable."""
+    from nomaanos import registry
+    from nomaanos.modules import runner
+    spec = registry.lookup(name)
+    if spec is None:
+        mod = runner._import_module_by_name(name)
+        return lambda: runner._await(runner._call_entrypoint(mod, name))
+    fn = registry.load(spec)
+    if fn is None:
+        raise RuntimeError(f"No callable entrypoint found in module {name}")
+    arity = spec.get("arity") if getattr(fn, "__name__", None) == spec.get("entry") else None
+    if arity is None:
+        arity = runner._arity(fn)
+    if arity == 0:
+        return lambda: runner._await(fn())
+    return lambda: runner._await(fn(name))
+
+def _fmt_num(v):
+    if not math.isfinite(v):
+        return str(v)  # nan, inf, -inf
+    return f"{v:.0f}" if abs(v) >= 1000 or v == int(v) else f"{v:.3g}"
+
+def _print_row(t, row, out):
+    parts = [f"t={t:7.2f}s"]
+    if not row:
+        parts.append("(no numeric fields)")
+    for k, r in row.items():
+        parts.append(f"{k}={_fmt_num(r['value'])} ({r['delta']:+.3g}, {r['rate']:.3g}/s)"
+                     f" [{_fmt_num(r['min'])}/{_fmt_num(r['avg'])}/{_fmt_num(r['max'])}]")
+    out.write("  ".join(parts) + "\n")
+    out.flush()
+
+def watch(name, interval=1.0, count=None, window=60, capacity=3600, fields=None, fmt=None, out=None):
+    """Sample `name` every `interval` seconds until count samples or Ctrl-C; returns the Series."""
+    out = out or sys.stdout
+    sample = _sampler(name)
+    series = Series(capacity)
+    t_start = time.monotonic()
+    deadline = t_start
+    n = 0
+    try:
+        while count is None or n < count:
+            now = time.monotonic()
+            try:
+                result = sample()
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            t = now - t_start
+            series.add(t, flatten(result))
+            row = series.row(window, fields)
+            error = result.get("error") if isinstance(result, dict) else None
+            if fmt == "ndjson":
+                from nomaanos.output import emit
+                rec = {"t": round(t, 3), "fields": row}
+                if error is not None:
+                    rec["error"] = error
+                emit(rec, "ndjson", out)
+            elif error is not None:
+                out.write(f"t={t:7.2f}s  [ERROR] {error}\n")
+                if row:
+                    _print_row(t, row, out)
+            else:
+                _print_row(t, row, out)
+            n += 1
+            # fixed-rate schedule: a slow sample shortens the next sleep instead of drifting
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay > 0 and (count is None or n < count):
+                time.sleep(delay)
+            elif delay <= 0:
+                deadline = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    return series
+
+def cli(args):
+    """Handler for `nomaanos watch ...`."""
+    from nomaanos.output import next_number, pop_format
+    args, fmt = pop_format(args)
+    opts, names = {"interval": 1.0, "count": None, "window": 60, "capacity": 3600, "fields": None}, []
+    it = iter(args)
+    try:
+        for a in it:
+            if a in ("--interval", "-i"):
+                opts["interval"] = next_number(it, a, float)
+            elif a in ("--count", "-n"):
+                opts["count"] = next_number(it, a, int) or None
+            elif a == "--window":
+                opts["window"] = next_number(it, a, int)
+            elif a == "--capacity":
+                opts["capacity"] = next_number(it, a, int)
+            elif a == "--fields":
+                opts["fields"] = [f for f in next(it, "").split(",") if f]
+            else:
+                names.append(a)
+    except ValueError as e:
+        print(f"[ERROR] watch: {e}")
+        return 2
+    if len(names) != 1:
+        print("Usage: nomaanos watch <module> [--interval S] [--count N] [--window N] [--fields a,b] [--format ndjson]")
+        return 1
+    try:
+        watch(names[0], fmt=fmt, **opts)
+    except (ImportError, RuntimeError) as e:
+        print(f"[ERROR] watch {names[0]}: {e}")
+        return 1
+    return 0
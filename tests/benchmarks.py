@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+NomaanOS benchmark suite.
+
+Measures CLI cold/warm start (nomaanos.main and nomaan.py), module discovery
+at several directory sizes, entry-point resolution in modules/runner and
+config load/save. Results are written as JSON and, if a baseline exists,
+compared against it.
+
+  python -m tests.benchmarks                      # run, write bench_results.json
+  python -m tests.benchmarks --save-baseline      # also store as the baseline
+  python -m tests.benchmarks --threshold 0.10     # fail on >10% slower medians
+  python -m tests.benchmarks --only config --sizes 10,1000
+
+Exit code 1 means at least one benchmark regressed past the threshold.
+"""
+import contextlib, io, json, os, shutil, statistics, subprocess, sys, tempfile, time, types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+BASELINE = os.path.join(ROOT, "tests", "bench_baseline.json")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+CLI_CASES = (["info"], ["modules"], ["run", "sysinfo"])
+
+def measure(fn, repeat=20, warmup=2):
+    """Time fn() `repeat` times; returns stats in microseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - t0) / 1000.0)
+    return {
+        "n": repeat,
+        "min_us": round(min(samples), 2),
+        "median_us": round(statistics.median(samples), 2),
+        "mean_us": round(statistics.fmean(samples), 2),
+    }
+
+def _env(tmp):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (SRC, env.get("PYTHONPATH")) if p)
+    env["NOMAANOS_CACHE_DIR"] = os.path.join(tmp, "cache")
+    env["NOMAANOS_CONFIG"] = os.path.join(tmp, "config.json")
+    env["NOMAANOS_NO_DAEMON"] = "1"
+    return env
+
+def bench_cli(tmp, repeat):
+    out = {}
+    env = _env(tmp)
+    entry_points = {
+        "nomaanos.main": [sys.executable, "-m", "nomaanos"],
+        "nomaan.py": [sys.executable, os.path.join(ROOT, "nomaan.py")],
+    }
+    for label, prefix in entry_points.items():
+        for argv in CLI_CASES:
+            cmd = prefix + argv
+            run = lambda: subprocess.run(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL,
+                                         stderr=subprocess.DEVNULL, check=False)
+            out[f"cli.cold.{label}.{'_'.join(argv)}"] = measure(run, repeat=max(3, repeat // 4), warmup=1)
+
+    # warm: same process, everything already imported
+    from importlib import import_module
+    nmain = import_module("nomaanos.main")
+    sys.path.insert(0, ROOT)
+    try:
+        import nomaan
+    finally:
+        sys.path.remove(ROOT)
+    sink = io.StringIO()
+    for argv in CLI_CASES:
+        def warm_main(argv=argv):
+            with contextlib.redirect_stdout(sink):
+                nmain.main(argv)
+            sink.seek(0)
+            sink.truncate()
+        out[f"cli.warm.nomaanos.main.{'_'.join(argv)}"] = measure(warm_main, repeat)
+
+        def warm_script(argv=argv):
+            saved = sys.argv
+            sys.argv = ["nomaan.py"] + argv
+            try:
+                with contextlib.redirect_stdout(sink):
+                    nomaan.main()
+            finally:
+                sys.argv = saved
+            sink.seek(0)
+            sink.truncate()
+        out[f"cli.warm.nomaan.py.{'_'.join(argv)}"] = measure(warm_script, repeat)
+    return out
+
+def _make_module_dir(path, count):
+    os.makedirs(path, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(path, f"mod{i:05d}.py"), "w") as f:
+            f.write(f'"""Generated module {i}."""\n\ndef main():\n    return {i}\n')
+
+def bench_discovery(tmp, repeat, sizes):
+    from nomaanos import registry
+    out = {}
+    saved = (registry.MODULE_DIR, registry.MANIFEST_FILE, registry._manifest)
+    try:
+        for size in sizes:
+            d = os.path.join(tmp, f"modules_{size}")
+            _make_module_dir(d, size)
+            registry.MODULE_DIR = d
+            registry.MANIFEST_FILE = os.path.join(tmp, f"manifest_{size}.json")
+            reps = repeat if size <= 1000 else max(3, repeat // 5)
+
+            def cold():
+                # no manifest on disk: full scan + ast analysis
+                registry._manifest = None
+                try:
+                    os.unlink(registry.MANIFEST_FILE)
+                except OSError:
+                    pass
+                registry.list_modules()
+
+            def disk():
+                # fresh process view: manifest read from disk, dir mtime checked
+                registry._manifest = None
+                registry.list_modules()
+
+            out[f"discovery.cold.{size}"] = measure(cold, max(3, reps // 4), warmup=1)
+            out[f"discovery.manifest.{size}"] = measure(disk, reps)
+            out[f"discovery.warm.{size}"] = measure(registry.list_modules, reps)
+            out[f"discovery.lookup.{size}"] = measure(lambda: registry.lookup("mod00000"), reps)
+    finally:
+        registry.MODULE_DIR, registry.MANIFEST_FILE, registry._manifest = saved
+    return out
+
+def bench_entrypoint(tmp, repeat):
+    from nomaanos.modules import runner
+    cases = {}
+    m = types.ModuleType("bench_main0"); m.main = lambda: 1; cases["main0"] = m
+    m = types.ModuleType("bench_main1"); m.main = lambda name: name; cases["main1"] = m
+    m = types.ModuleType("bench_run0"); m.run = lambda: 1; cases["run0"] = m
+    m = types.ModuleType("bench_run1"); m.run = lambda name: name; cases["run1"] = m
+    out = {}
+    for label, mod in cases.items():
+        def call(mod=mod):
+            for _ in range(1000):
+                runner._call_entrypoint(mod, "bench")
+        stats = measure(call, repeat)
+        # report per call, not per batch of 1000
+        out[f"entrypoint.{label}"] = {k: (round(v / 1000.0, 4) if k.endswith("_us") else v) for k, v in stats.items()}
+    return out
+
+def bench_config(tmp, repeat):
+    from nomaanos import config
+    saved = (config.CONFIG_FILE, config._cache)
+    config.CONFIG_FILE = os.path.join(tmp, "bench_config.json")
+    cfg = dict(config.default_config, **{f"key{i}": i for i in range(50)})
+    out = {}
+    try:
+        config.save(cfg)
+
+        def uncached():
+            config._cache = None
+            config.load()
+
+        out["config.load.cold"] = measure(uncached, repeat)
+        out["config.load.cached"] = measure(config.load, repeat)
+        out["config.save"] = measure(lambda: config.save(cfg), repeat)
+        out["config.update"] = measure(lambda: config.update({"key0": 1}), repeat)
+    finally:
+        config.CONFIG_FILE, config._cache = saved
+    return out
+
+def compare(results, baseline, threshold):
+    """Return a list of (name, baseline_us, current_us, ratio) that got slower than allowed."""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        cur = results["results"].get(name)
+        if cur is None or not base.get("median_us"):
+            continue
+        ratio = cur["median_us"] / base["median_us"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base["median_us"], cur["median_us"], round(ratio, 2)))
+    return regressions
+
+def main(argv=None):
+    import argparse
+    p = argparse.ArgumentParser(description="NomaanOS benchmarks")
+    p.add_argument("--out", default=os.path.join(ROOT, "bench_results.json"))
+    p.add_argument("--baseline", default=BASELINE)
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed median slowdown (0.25 = 25%%)")
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--sizes", default="10,1000,10000", help="module dir sizes for discovery")
+    p.add_argument("--only", default="", help="comma list of: cli,discovery,entrypoint,config")
+    a = p.parse_args(argv)
+
+    groups = {
+        "cli": lambda tmp: bench_cli(tmp, a.repeat),
+        "discovery": lambda tmp: bench_discovery(tmp, a.repeat, [int(s) for s in a.sizes.split(",") if s]),
+        "entrypoint": lambda tmp: bench_entrypoint(tmp, a.repeat),
+        "config": lambda tmp: bench_config(tmp, a.repeat),
+    }
+    wanted = [g for g in a.only.split(",") if g] or list(groups)
+
+    import platform
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+    tmp = tempfile.mkdtemp(prefix="nomaanos-bench-")
+    # keep the real ~/.cache/nomaanos and config untouched (nomaanos.* reads these at import)
+    os.environ.update({k: v for k, v in _env(tmp).items() if k.startswith("NOMAANOS_")})
+    try:
+        for g in wanted:
+            res = groups[g](tmp)
+            results["results"].update(res)
+            for name, st in res.items():
+                print(f"{name:48} median {st['median_us']:>12.2f} us   min {st['min_us']:>12.2f} us")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    with open(a.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print("results written to", a.out)
+
+    if a.save_baseline:
+        shutil.copyfile(a.out, a.baseline)
+        print("baseline saved to", a.baseline)
+        return 0
+    if not os.path.exists(a.baseline):
+        print("no baseline at", a.baseline, "(run with --save-baseline to create one)")
+        return 0
+    with open(a.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, a.threshold)
+    for name, base, cur, ratio in regressions:
+        print(f"REGRESSION {name}: {base:.2f} -> {cur:.2f} us (x{ratio})")
+    if not regressions:
+        print(f"no regressions beyond {a.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
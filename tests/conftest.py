@@ -0,0 +1,57 @@
+"""
+Shared setup for the behaviour tests: import nomaanos from src/ and point its
+config, cache and socket at a throwaway directory before anything reads them.
+"""
+import os, shutil, sys, tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+_HOME = tempfile.mkdtemp(prefix="nomaanos-test-")
+os.environ["NOMAANOS_CONFIG"] = os.path.join(_HOME, "config.json")
+os.environ["NOMAANOS_CACHE_DIR"] = os.path.join(_HOME, "cache")
+os.environ["NOMAANOS_SOCKET"] = os.path.join(_HOME, "nomaanos.sock")
+os.environ["NOMAANOS_NO_DAEMON"] = "1"
+os.environ.pop("NOMAANOS_HISTORY", None)
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_HOME, ignore_errors=True)
+
+@pytest.fixture
+def home():
+    """The per-session NOMAANOS_* directory."""
+    return _HOME
+
+@pytest.fixture
+def module_file(tmp_path, monkeypatch):
+    """
+    Write throwaway modules into a private module dir: the registry scans it,
+    the manifest lives beside it and nomaanos.modules imports from it too.
+    """
+    from nomaanos import modules, registry
+    mod_dir = tmp_path / "modules"
+    mod_dir.mkdir()
+    monkeypatch.setattr(registry, "MODULE_DIR", str(mod_dir))
+    monkeypatch.setattr(registry, "MANIFEST_FILE", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(registry, "_manifest", None)
+    monkeypatch.setattr(modules, "__path__", list(modules.__path__) + [str(mod_dir)])
+    made = set()
+
+    def write(name, source, bump=0):
+        path = os.path.join(mod_dir, name + ".py")
+        with open(path, "w") as f:
+            f.write(source)
+        if bump:
+            # mtime granularity: make an edit visible even within the same tick
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+        made.add(name)
+        return path
+
+    yield write
+    for name in made:
+        sys.modules.pop(f"{registry.PKG}.{name}", None)
@@ -0,0 +1,41 @@
+import asyncio, threading, time
+
+import pytest
+
+from nomaanos import aio
+
+def test_one_shared_loop_off_the_calling_thread():
+    async def where():
+        return threading.current_thread().name, asyncio.get_running_loop()
+    name, loop = aio.run(where())
+    assert name == "nomaanos-aio" and loop is aio.loop()
+    # every caller thread lands on the same loop
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(aio.run(where())[1]))
+    t.start()
+    t.join()
+    assert seen == [loop]
+
+def test_gather_runs_concurrently_with_per_item_timeouts():
+    async def sleep(s, v):
+        await asyncio.sleep(s)
+        return v
+
+    async def boom():
+        raise KeyError("x")
+    t0 = time.monotonic()
+    res = aio.gather({"a": sleep(0.2, 1), "b": sleep(0.2, 2), "slow": sleep(5, 3), "bad": boom()}, timeout=0.5)
+    assert time.monotonic() - t0 < 1.5
+    assert res == {"a": 1, "b": 2, "slow": {"error": "timed out after 0.5s"}, "bad": {"error": "KeyError: 'x'"}}
+
+def test_blocking_from_inside_the_loop_is_refused():
+    async def nested():
+        return aio.run(asyncio.sleep(0))
+    with pytest.raises(RuntimeError, match="from inside it"):
+        aio.run(nested())
+
+def test_async_module_runs_through_the_runner(module_file, monkeypatch):
+    from nomaanos.modules import run
+    monkeypatch.setenv("NOMAANOS_NO_CACHE", "1")
+    module_file("zz_async", "import asyncio\nasync def main():\n    await asyncio.sleep(0)\n    return {'async': True}\n")
+    assert run("zz_async") == {"async": True}
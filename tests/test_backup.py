@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from nomaanos import backup
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # 4-byte chunks so a small edit touches exactly one of several chunks
+    monkeypatch.setattr(backup, "CHUNK_SIZE", 4)
+    src, dest = tmp_path / "src", tmp_path / "store"
+    (src / "sub").mkdir(parents=True)
+    (src / "a.txt").write_bytes(b"aaaabbbbcccc")
+    (src / "sub" / "b.bin").write_bytes(bytes(range(10)))
+    os.chmod(src / "sub" / "b.bin", 0o640)
+    return src, dest
+
+def _chunks(dest):
+    return {n for _, _, files in os.walk(dest / "chunks") for n in files}
+
+def _edit(path, data):
+    st = os.stat(path)
+    path.write_bytes(data)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+def test_second_backup_stores_only_changed_chunks(store):
+    src, dest = store
+    first = backup.backup(str(src), str(dest))
+    assert (first["files"], first["changed"]) == (2, 2)
+    before = _chunks(dest)
+
+    again = backup.backup(str(src), str(dest))
+    assert (again["changed"], again["bytes_read"], again["bytes_stored"]) == (0, 0, 0)
+
+    _edit(src / "a.txt", b"aaaaXXXXcccc")
+    third = backup.backup(str(src), str(dest))
+    assert (third["changed"], third["bytes_read"]) == (1, 12)
+    assert len(_chunks(dest) - before) == 1
+
+def test_restore_is_byte_identical(store, tmp_path):
+    src, dest = store
+    backup.backup(str(src), str(dest))
+    res = backup.restore("latest", str(tmp_path / "out"), dest=str(dest))
+    assert res["restored"] == 2
+    for rel in ("a.txt", os.path.join("sub", "b.bin")):
+        orig, copy = src / rel, tmp_path / "out" / rel
+        assert copy.read_bytes() == orig.read_bytes()
+        assert os.stat(copy).st_mode == os.stat(orig).st_mode
+        assert os.stat(copy).st_mtime_ns == os.stat(orig).st_mtime_ns
+
+def test_prune_keeps_chunks_still_in_use(store, tmp_path):
+    src, dest = store
+    old = backup.backup(str(src), str(dest))["snapshot"]
+    _edit(src / "a.txt", b"aaaaXXXXcccc")
+    new = backup.backup(str(src), str(dest))["snapshot"]
+
+    res = backup.prune(keep=1, dest=str(dest))
+    assert (res["kept"], res["dropped"], res["chunks_removed"]) == ([new], [old], 1)
+    assert backup.restore(old, str(tmp_path / "gone"), dest=str(dest)) == {"error": f"no such snapshot: {old}"}
+    backup.restore("latest", str(tmp_path / "out"), dest=str(dest))
+    assert (tmp_path / "out" / "a.txt").read_bytes() == b"aaaaXXXXcccc"
+    assert (tmp_path / "out" / "sub" / "b.bin").read_bytes() == bytes(range(10))
+
+@pytest.mark.parametrize("args, flag", [(["--jobs", "x"], "--jobs"), (["prune", "--keep", "many"], "--keep"),
+                                        (["--jobs"], "--jobs")])
+def test_cli_rejects_bad_numbers(args, flag, capsys):
+    assert backup.cli(args) == 2
+    assert capsys.readouterr().out.startswith(f"[ERROR] backup: {flag} expects a number")
@@ -0,0 +1,28 @@
+import subprocess, sys
+
+import pytest
+
+from nomaanos import bundle
+
+def test_bundle_runs_and_records_python(tmp_path):
+    out = str(tmp_path / "nomaanos.pyz")
+    res = bundle.build(out=out)
+    assert res["path"] == out
+    proc = subprocess.run([sys.executable, out, "run", "hello"], capture_output=True, text=True,
+                          env={"NOMAANOS_NO_DAEMON": "1", "NOMAANOS_CACHE_DIR": str(tmp_path / "cache"),
+                               "NOMAANOS_CONFIG": str(tmp_path / "config.json")})
+    assert proc.stdout.strip() == "{'hello': 'world'}"
+    assert bundle._frozen_manifest(bundle.PKG_DIR)["python"] == tuple(sys.version_info[:2])
+
+def test_bundle_main_refuses_other_python():
+    src = bundle.MAIN.format(version=(2, 7), built="2.7")
+    with pytest.raises(SystemExit) as e:
+        exec(compile(src, "__main__.py", "exec"), {})
+    assert "built for Python 2.7" in str(e.value.code)
+
+@pytest.mark.parametrize("args, msg", [(["--optimize", "max"], "--optimize expects a number, got 'max'"),
+                                       (["--optimize"], "--optimize expects a number, got None"),
+                                       (["--optimize", "3"], "--optimize expects 0, 1 or 2, got 3")])
+def test_cli_rejects_bad_optimize(args, msg, capsys):
+    assert bundle.cli(args) == 2
+    assert capsys.readouterr().out.strip() == f"[ERROR] bundle: {msg}"
@@ -0,0 +1,36 @@
+import threading
+
+from nomaanos import cache
+
+def test_concurrent_get_put_flush():
+    cache.invalidate()
+    errors = []
+
+    def hammer(n):
+        try:
+            for i in range(3000):
+                key = f"stress:{n}:{i % (cache.MAX_ENTRIES * 2)}"
+                cache.put(key, i, 60)
+                cache.get(f"stress:{(n + 1) % 4}:{i % 97}")
+                if i % 500 == 0:
+                    cache.flush()
+                    cache.stats()
+        except Exception as e:  # pragma: no cover - the failure being tested for
+            errors.append(e)
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert cache.stats()["entries"] <= cache.MAX_ENTRIES
+    cache.invalidate("stress:")
+
+def test_cached_round_trip():
+    calls = []
+    fn = lambda: calls.append(1) or "v"
+    assert cache.cached("rt:key", fn, 60) == "v"
+    assert cache.cached("rt:key", fn, 60) == "v"
+    assert calls == [1]
+    assert cache.invalidate("rt:") == 1
@@ -0,0 +1,19 @@
+import pytest
+
+from nomaanos.main import cmd_run
+
+@pytest.mark.parametrize("flag", ["--jobs", "--timeout", "--cpu", "--mem"])
+def test_run_reports_bad_numbers_as_usage_errors(flag, capsys):
+    assert cmd_run(["hello", flag, "x"]) == 2
+    assert capsys.readouterr().out.strip() == f"[ERROR] run: {flag} expects a number, got 'x'"
+
+def test_run_reports_missing_number(capsys):
+    assert cmd_run(["hello", "--timeout"]) == 2
+    assert "--timeout expects a number, got None" in capsys.readouterr().out
+
+def test_set_rejects_a_key_without_value(capsys):
+    from nomaanos import config
+    from nomaanos.main import cmd_set
+    assert cmd_set(["zz_a", "1", "zz_b"]) == 2
+    assert capsys.readouterr().out.strip() == "[ERROR] set: no value for key 'zz_b'"
+    assert config.get("zz_a") is None
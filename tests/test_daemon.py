@@ -0,0 +1,99 @@
+import os, subprocess, sys, time
+
+from tests.conftest import SRC
+
+from nomaanos import daemon
+
+PROBE = '''import os
+def main():
+    return {{"v": {v}, "cwd": os.getcwd(), "probe": os.environ.get("NOMAANOS_PROBE")}}
+'''
+
+# `nomaanos serve` with the registry pointed at the test's module dir
+SERVE = """import sys
+from nomaanos import modules, registry
+registry.MODULE_DIR, registry.MANIFEST_FILE = sys.argv[1:3]
+modules.__path__.append(sys.argv[1])
+from nomaanos.main import main
+sys.exit(main(["serve"]))
+"""
+
+def _start(home):
+    from nomaanos import registry
+    env = dict(os.environ, PYTHONPATH=SRC)
+    env.pop("NOMAANOS_NO_DAEMON", None)
+    proc = subprocess.Popen([sys.executable, "-c", SERVE, registry.MODULE_DIR, registry.MANIFEST_FILE], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=home)
+    deadline = time.time() + 10
+    while not os.path.exists(daemon.SOCKET_PATH):
+        assert proc.poll() is None, proc.stdout.read()
+        assert time.time() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    return proc
+
+def _run(name):
+    rc, out = daemon.call(["run", name, "--format", "json"])
+    assert rc == 0, out
+    import json
+    return json.loads(out)
+
+def test_daemon_reloads_edited_module_and_uses_client_context(home, module_file, tmp_path, monkeypatch):
+    module_file("zz_probe", PROBE.format(v=1))
+    proc = _start(home)
+    try:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("NOMAANOS_PROBE", "from-client")
+        first = _run("zz_probe")
+        assert first == {"v": 1, "cwd": str(tmp_path), "probe": "from-client"}
+
+        module_file("zz_probe", PROBE.format(v=2), bump=2)
+        assert _run("zz_probe")["v"] == 2
+
+        monkeypatch.delenv("NOMAANOS_PROBE")
+        monkeypatch.chdir(home)
+        again = _run("zz_probe")
+        assert again["probe"] is None and again["cwd"] == home
+    finally:
+        daemon.stop()
+        proc.wait(timeout=10)
+
+TICKER = """import time
+def main():
+    for i in range(3):
+        if i:
+            time.sleep(0.5)
+        yield {"i": i}
+"""
+
+class _Arrivals:
+    def __init__(self):
+        self.lines = []  # (seconds since start, text)
+        self.t0 = time.monotonic()
+
+    def write(self, s):
+        self.lines.append((time.monotonic() - self.t0, s))
+
+    def flush(self):
+        pass
+
+def test_ndjson_streams_through_the_daemon(home, module_file):
+    module_file("zz_ticker", TICKER)
+    proc = _start(home)
+    try:
+        sink = _Arrivals()
+        rc, out = daemon.call(["run", "zz_ticker", "--format", "ndjson"], out=sink)
+        done = time.monotonic() - sink.t0
+        assert (rc, out) == (0, "")
+        assert "".join(s for _, s in sink.lines) == '{"i":0}\n{"i":1}\n{"i":2}\n'
+        # the first record arrives while the module is still sleeping
+        assert done >= 1.0 and sink.lines[0][0] < done - 0.8
+        # the exit code still comes back, in the trailer
+        assert daemon.call(["run", "zz_ticker", "--jobs", "x"]) == (2, "[ERROR] run: --jobs expects a number, got 'x'\n")
+    finally:
+        daemon.stop()
+        proc.wait(timeout=10)
+
+def test_request_roundtrip_keeps_empty_argv_fields_out():
+    cwd, env, argv = daemon._decode_request(b"/w\0NOMAANOS_A=1=2\0\0run\0sysinfo")
+    assert (cwd, env, argv) == ("/w", {"NOMAANOS_A": "1=2"}, ["run", "sysinfo"])
+    assert daemon._decode_request(b"run\0hello") == (None, {}, ["run", "hello"])
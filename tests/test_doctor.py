@@ -0,0 +1,64 @@
+import os, threading
+
+from nomaanos import cache, doctor
+
+def _by_name(results):
+    return {r["check"]: r for r in results}
+
+def test_diagnose_runs_every_check_and_caches_passes():
+    first = _by_name(doctor.diagnose())
+    assert "build copy" not in first
+    assert {"entry points", "config", "import hello", "json output"} <= set(first)
+    assert first["import hello"]["status"] == "ok"
+    hashed = {c.name for c in doctor.checks() if c.files is not None}
+    again = _by_name(doctor.diagnose())
+    assert again["import hello"]["detail"] == "unchanged since last pass"
+    for name, r in first.items():
+        assert again[name]["cached"] == (r["status"] == "ok" and name in hashed), name
+
+def test_checks_run_concurrently(monkeypatch):
+    # both checks must be inside fn() at once to get past the barrier
+    meet = threading.Barrier(2, timeout=5)
+
+    def fn():
+        meet.wait()
+        return "met"
+    monkeypatch.setattr(doctor, "checks", lambda: [doctor.Check("one", fn), doctor.Check("two", fn)])
+    assert [(r["check"], r["status"], r["detail"]) for r in doctor.diagnose()] == [
+        ("one", "ok", "met"), ("two", "ok", "met")]
+
+def test_cached_pass_is_invalidated_by_editing_a_tracked_file(tmp_path, monkeypatch):
+    tracked = tmp_path / "tracked.py"
+    tracked.write_text("x = 1\n")
+    calls = []
+
+    def fn():
+        calls.append(tracked.read_text())
+        return "fine"
+    cache.invalidate("doctor:")
+    monkeypatch.setattr(doctor, "checks", lambda: [doctor.Check("probe", fn, [str(tracked)])])
+
+    assert _by_name(doctor.diagnose())["probe"]["cached"] is False
+    second = _by_name(doctor.diagnose())["probe"]
+    assert second["cached"] is True and second["status"] == "ok"
+    assert calls == ["x = 1\n"]
+
+    tracked.write_text("x = 22\n")
+    st = os.stat(tracked)
+    os.utime(tracked, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+    third = _by_name(doctor.diagnose())["probe"]
+    assert third["cached"] is False and calls == ["x = 1\n", "x = 22\n"]
+    assert _by_name(doctor.diagnose())["probe"]["cached"] is True
+
+def test_failures_and_warnings_are_never_cached(monkeypatch):
+    def warn():
+        raise doctor.DoctorWarning("look at this")
+
+    def fail():
+        raise doctor.DoctorError("broken")
+    monkeypatch.setattr(doctor, "checks", lambda: [doctor.Check("w", warn, []), doctor.Check("f", fail, [])])
+    for _ in range(2):
+        res = _by_name(doctor.diagnose())
+        assert (res["w"]["status"], res["w"]["cached"]) == ("warn", False)
+        assert (res["f"]["status"], res["f"]["detail"], res["f"]["cached"]) == ("fail", "broken", False)
+    assert doctor.cli([]) == 1
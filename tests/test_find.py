@@ -0,0 +1,52 @@
+import concurrent.futures
+
+from nomaanos.modules import find
+
+def _tree(root, n):
+    for i in range(n):
+        d = root / f"d{i % 7}"
+        d.mkdir(exist_ok=True)
+        (d / f"f{i}.txt").write_text(f"common word{i} Needle{i % 3}\n")
+
+def test_index_falls_back_to_serial_without_multiprocessing(tmp_path, monkeypatch):
+    _tree(tmp_path, find.PARALLEL_MIN + 10)
+    rels = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*.txt"))
+    serial = find._postings_batch(str(tmp_path), rels, 0)
+
+    def broken(*a, **kw):
+        raise OSError("[Errno 38] Function not implemented")
+    monkeypatch.setattr(find.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", broken)
+    assert find._index(str(tmp_path), rels, 0) == [serial]
+
+def test_first_line_keeps_original_case(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"first\nSecond Line with NeedLE inside\nthird\n")
+    assert find._first_line(str(path), b"needle") == (2, b"Second Line with NeedLE inside")
+
+def test_first_line_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(find, "CHUNK", 8)
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"aaaa\nbbHeLLo\n")
+    assert find._first_line(str(path), b"hello") == (2, b"bbHeLLo")
+
+def test_first_line_spanning_many_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(find, "CHUNK", 8)
+    path = tmp_path / "notes.txt"
+    path.write_bytes(b"x\nabcdefghijklmnopHeLLo tail\n")
+    assert find._first_line(str(path), b"hello") == (2, b"abcdefghijklmnopHeLLo tail")
+    path.write_bytes(b"one\ntwo\nthree Needle and then a long tail of words\nlast\n")
+    assert find._first_line(str(path), b"needle") == (3, b"three Needle and then a long tail of words")
+    assert find._first_line(str(path), b"last") == (4, b"last")
+
+def test_index_is_serial_off_the_main_thread(tmp_path, monkeypatch):
+    _tree(tmp_path, find.PARALLEL_MIN + 10)
+    rels = sorted(str(p.relative_to(tmp_path)) for p in tmp_path.rglob("*.txt"))
+
+    def forbidden(*a, **kw):
+        raise AssertionError("forked from a worker thread")
+    monkeypatch.setattr(find.os, "cpu_count", lambda: 4)
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", forbidden)
+    with concurrent.futures.ThreadPoolExecutor(1) as pool:
+        parts = pool.submit(find._index, str(tmp_path), rels, 0).result()
+    assert parts == [find._postings_batch(str(tmp_path), rels, 0)]
@@ -0,0 +1,33 @@
+import pytest
+
+from nomaanos import fleet
+from nomaanos.main import cmd_modules, cmd_run
+
+def test_agent_rejects_unregistered_module_names():
+    for name in ("os", "nomaanos.main", "../hello", None, ["hello"]):
+        resp = fleet._answer({"id": 1, "op": "run", "name": name}, None)
+        assert resp == {"id": 1, "ok": False, "error": f"unknown module {name!r}"}
+
+def test_agent_runs_registered_module():
+    resp = fleet._answer({"id": 2, "op": "run", "name": "hello"}, None)
+    assert resp["ok"] and resp["result"] == {"hello": "world"}
+
+def test_agent_refuses_open_bind_without_token(monkeypatch, capsys):
+    monkeypatch.delenv("NOMAANOS_AGENT_TOKEN", raising=False)
+    assert fleet.serve("0.0.0.0", 0) == 1
+    assert "without agent_token" in capsys.readouterr().out
+
+@pytest.mark.parametrize("args", [["--hosts", ""], ["--hosts"], ["--hosts=,"], ["--hosts= "]])
+def test_empty_hosts_is_a_usage_error(args, capsys):
+    assert cmd_run(["hello"] + args) == 2
+    assert cmd_modules(list(args)) == 2
+    assert "--hosts expects" in capsys.readouterr().out
+
+@pytest.mark.parametrize("args, message", [
+    (["--port", "http"], "--port expects a number, got 'http'"),
+    (["--port"], "--port expects a number, got None"),
+    (["--port", "70000"], "--port expects 0-65535, got 70000"),
+])
+def test_agent_bad_port_is_a_usage_error(args, message, capsys):
+    assert fleet.cli(args) == 2
+    assert capsys.readouterr().out == f"[ERROR] agent: {message}\n"
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from nomaanos import isolate
+
+MODULES = {
+    "zz_spin": "def main():\n    while True:\n        pass\n",
+    "zz_hog": "def main():\n    return len(bytearray(1 << 30))\n",
+    "zz_chatty": "def main():\n    print('hi from the child')\n    return {'pid': __import__('os').getpid()}\n",
+}
+
+@pytest.fixture
+def child_path(tmp_path, monkeypatch):
+    # unregistered top-level modules: the child's runner finds them on PYTHONPATH
+    for name, src in MODULES.items():
+        (tmp_path / f"{name}.py").write_text(src)
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(p for p in (str(tmp_path), os.environ.get("PYTHONPATH")) if p))
+    monkeypatch.setenv("NOMAANOS_NO_CACHE", "1")
+
+def test_ok_result_with_usage_and_stdout(child_path, capsys):
+    res = isolate.run("zz_chatty")
+    assert res["status"] == "ok" and res["result"]["pid"] != os.getpid()
+    assert set(res["usage"]) == {"wall", "user", "sys", "max_rss_kb"} and res["usage"]["max_rss_kb"] > 0
+    assert capsys.readouterr().out == "hi from the child\n"
+
+def test_wall_clock_timeout_kills_the_child(child_path):
+    res = isolate.run("zz_spin", timeout=0.5)
+    assert (res["status"], res["error"]) == ("timeout", "timed out after 0.5s")
+    assert res["usage"]["wall"] < 5
+
+def test_cpu_limit(child_path):
+    res = isolate.run("zz_spin", timeout=30, cpu=1)
+    assert res["status"] == "cpu_limit" and res["error"] == "exceeded 1s CPU time"
+    assert res["usage"]["user"] + res["usage"]["sys"] >= 0.9
+
+def test_memory_limit(child_path):
+    res = isolate.run("zz_hog", mem_mb=256)
+    assert res["status"] == "memory_limit" and "256 MB" in res["error"]
+
+def test_run_many_keeps_failures_per_module(child_path):
+    res = isolate.run_many(["hello", "zz_spin", "hello"], jobs=2, timeout=0.5)
+    assert list(res) == ["hello", "zz_spin"]
+    assert res["hello"]["result"] == {"hello": "world"} and res["zz_spin"]["status"] == "timeout"
@@ -0,0 +1,60 @@
+import pytest
+
+from nomaanos import metrics
+
+STAT = "cpu  {user} 0 {sys} {idle} 0 0 0 0 0 0\ncpu0 1 0 1 1 0 0 0 0 0 0\ncpu1 1 0 1 1 0 0 0 0 0 0\nintr 1\n"
+MEMINFO = ("MemTotal:        1000 kB\nMemFree:          100 kB\nMemAvailable:     250 kB\n"
+           "Buffers:           10 kB\nCached:            20 kB\nSwapTotal:        400 kB\nSwapFree:         300 kB\n")
+PID_STAT = "{pid} (my prog) S 1 1 1 0 -1 0 0 0 0 0 {utime} {stime} 0 0 20 0 3 0 100 4096 {rss} 0\n"
+
+@pytest.fixture
+def proc(tmp_path):
+    (tmp_path / "stat").write_text(STAT.format(user=100, sys=50, idle=850))
+    (tmp_path / "meminfo").write_text(MEMINFO)
+    (tmp_path / "loadavg").write_text("0.50 0.25 0.10 2/123 4567\n")
+    (tmp_path / "uptime").write_text("1234.56 2000.00\n")
+    (tmp_path / "42").mkdir()
+    (tmp_path / "42" / "stat").write_text(PID_STAT.format(pid=42, utime=10, stime=5, rss=25))
+    return tmp_path
+
+def test_snapshot_parses_proc_files(proc):
+    eng = metrics.Engine(disk_paths=(str(proc),), proc_root=str(proc))
+    snap = eng.snapshot(("cpu", "mem", "load", "uptime", "disk", "nope"))
+    assert snap["cpu"] == {"percent": 15.0, "count": 2, "since_boot": True}
+    assert snap["mem"] == {"total": 1024000, "available": 256000, "used": 768000, "percent": 75.0,
+                           "buffers": 10240, "cached": 20480, "swap_total": 409600, "swap_used": 102400}
+    assert snap["load"] == {"1m": 0.5, "5m": 0.25, "15m": 0.1, "running": 2, "threads": 123}
+    assert snap["uptime"] == {"seconds": 1234.56, "idle_seconds": 2000.0}
+    assert snap["disk"][str(proc)]["total"] > 0
+    assert "unknown metric group 'nope'" in snap["nope"]["error"]
+    eng.close()
+
+def test_cpu_and_process_usage_are_deltas_over_open_files(proc, monkeypatch):
+    eng = metrics.Engine(proc_root=str(proc))
+    eng.cpu()
+    first = eng.procs()
+    assert first == [{"pid": 42, "comm": "my prog", "state": "S", "cpu": None,
+                      "rss": 25 * metrics.PAGE_SIZE, "threads": 3}]
+    # rewritten in place: the engine re-reads the fds it already holds
+    (proc / "stat").write_text(STAT.format(user=130, sys=70, idle=900))
+    (proc / "42" / "stat").write_text(PID_STAT.format(pid=42, utime=10 + metrics.CLK_TCK, stime=5, rss=25))
+    eng._pid_t -= 2.0  # two seconds since the last sample
+    assert eng.cpu() == {"percent": 50.0, "count": 2, "since_boot": False}
+    assert eng.procs()[0]["cpu"] == pytest.approx(50.0, abs=1)
+    assert list(eng._pid_fds) == [42]
+
+    (proc / "42" / "stat").unlink()
+    (proc / "42").rmdir()
+    assert eng.procs() == [] and eng._pid_fds == {}
+    eng.close()
+
+def test_missing_proc_file_is_reported_per_group(tmp_path):
+    eng = metrics.Engine(disk_paths=(), proc_root=str(tmp_path))
+    snap = eng.snapshot(("load", "disk"))
+    assert snap["load"]["error"].startswith("FileNotFoundError")
+    assert snap["disk"] == {}
+
+def test_parse_groups():
+    assert metrics.parse_groups("") == metrics.DEFAULT_GROUPS
+    assert metrics.parse_groups("all") == metrics.GROUPS
+    assert metrics.parse_groups(" cpu, mem ,") == ("cpu", "mem")
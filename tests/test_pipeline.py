@@ -0,0 +1,56 @@
+import json
+
+from nomaanos import pipeline
+
+COUNTER = '''import os
+def main():
+    with open(os.environ["NOMAANOS_TEST_LOG"], "a") as f:
+        f.write("{name}\\n")
+    return {value}
+'''
+
+def _log(tmp_path, monkeypatch):
+    path = tmp_path / "calls.log"
+    monkeypatch.setenv("NOMAANOS_TEST_LOG", str(path))
+    return path
+
+def test_levels_put_each_module_after_its_inputs(module_file):
+    module_file("zz_a", "def main():\n    return 1\n")
+    module_file("zz_b", "INPUTS = ('zz_a',)\ndef main(zz_a):\n    return zz_a + 1\n")
+    module_file("zz_c", "INPUTS = ('zz_a',)\ndef main(zz_a):\n    return zz_a + 2\n")
+    module_file("zz_d", "INPUTS = ('zz_b', 'zz_c')\ndef main(zz_b, zz_c):\n    return zz_b * zz_c\n")
+    deps = pipeline.graph(["zz_d"])
+    assert deps == {"zz_d": ["zz_b", "zz_c"], "zz_b": ["zz_a"], "zz_c": ["zz_a"], "zz_a": []}
+    assert pipeline.levels(deps) == [["zz_a"], ["zz_b", "zz_c"], ["zz_d"]]
+
+def test_shared_upstream_runs_once(module_file, tmp_path, monkeypatch):
+    log = _log(tmp_path, monkeypatch)
+    module_file("zz_src", COUNTER.format(name="zz_src", value="{'n': 3}"))
+    module_file("zz_x", "INPUTS = ('zz_src',)\ndef main(zz_src):\n    return zz_src['n'] * 2\n")
+    module_file("zz_y", "INPUTS = ('zz_src',)\ndef main(zz_src):\n    return zz_src['n'] * 3\n")
+    assert pipeline.run(["zz_x", "zz_y"], jobs=2) == {"zz_x": 6, "zz_y": 9}
+    assert log.read_text().splitlines() == ["zz_src"]
+
+def test_cycle_and_failed_upstream(module_file):
+    module_file("zz_p", "INPUTS = ('zz_q',)\ndef main(zz_q):\n    return 1\n")
+    module_file("zz_q", "INPUTS = ('zz_p',)\ndef main(zz_p):\n    return 1\n")
+    try:
+        pipeline.graph(["zz_p"])
+    except pipeline.PipelineError as e:
+        assert "cycle" in str(e)
+    else:
+        raise AssertionError("cycle not detected")
+    module_file("zz_bad", "def main():\n    raise RuntimeError('boom')\n")
+    module_file("zz_after", "INPUTS = ('zz_bad',)\ndef main(zz_bad):\n    return 'ran'\n")
+    res = pipeline.run(["zz_after"], keep_all=True)
+    assert res["zz_bad"] == {"error": "RuntimeError: boom"}
+    assert res["zz_after"] == {"error": "upstream zz_bad failed"}
+
+def test_cli_runs_a_module_and_rejects_bad_jobs(module_file, capsys):
+    module_file("zz_one", "def main():\n    return {'ok': True}\n")
+    assert pipeline.cli(["zz_one", "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out) == {"zz_one": {"ok": True}}
+    assert pipeline.cli(["zz_one", "--jobs", "many"]) == 2
+    assert capsys.readouterr().out == "[ERROR] pipe: --jobs expects a number, got 'many'\n"
+    assert pipeline.cli(["zz_one", "-j"]) == 2
+    assert capsys.readouterr().out == "[ERROR] pipe: -j expects a number, got None\n"
@@ -0,0 +1,29 @@
+import json, sys
+
+from nomaanos import registry
+
+def test_analyse_file_reads_source_without_importing(module_file):
+    path = module_file("zz_meta", '"""Doc line."""\nraise SystemExit("imported")\n'
+                                  'CACHE_TTL = 30\nINPUTS = ("a", "b")\nasync def main(a, b):\n    pass\n')
+    spec = registry.analyse_file(path)
+    assert spec == {"entry": "main", "arity": 2, "async": True, "doc": "Doc line.",
+                    "cache_ttl": 30, "inputs": ["a", "b"]}
+    assert f"{registry.PKG}.zz_meta" not in sys.modules
+
+def test_manifest_is_persisted_and_tracks_edits(module_file):
+    module_file("zz_one", "def main():\n    return 1\n")
+    assert "zz_one" in registry.list_modules()
+    with open(registry.MANIFEST_FILE) as f:
+        on_disk = json.load(f)
+    assert on_disk["dir"] == registry.MODULE_DIR and "zz_one" in on_disk["modules"]
+
+    # an in-place edit leaves the dir mtime alone; lookup() notices the file's stat
+    module_file("zz_one", "def run(name):\n    return name\n", bump=2)
+    spec = registry.lookup("zz_one")
+    assert (spec["entry"], spec["arity"]) == ("run", 1)
+    assert registry.load(spec)("x") == "x"
+
+def test_broken_module_is_listed_with_its_error(module_file):
+    module_file("zz_broken", "def main(:\n")
+    assert registry.lookup("zz_broken")["error"]
+    assert registry.lookup("zz_missing") is None
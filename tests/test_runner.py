@@ -0,0 +1,44 @@
+import os, subprocess, sys
+
+from tests.conftest import SRC
+
+def test_run_with_unwritable_config_dir(tmp_path):
+    env = dict(os.environ, PYTHONPATH=SRC, NOMAANOS_CONFIG="/proc/nope/cfg.json")
+    proc = subprocess.run([sys.executable, "-m", "nomaanos", "run", "hello"],
+                          capture_output=True, text=True, env=env, cwd=str(tmp_path))
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert proc.stdout.strip() == "{'hello': 'world'}"
+
+def test_run_does_not_create_the_config(tmp_path):
+    cfg = tmp_path / "fresh" / "cfg.json"
+    env = dict(os.environ, PYTHONPATH=SRC, NOMAANOS_CONFIG=str(cfg))
+    proc = subprocess.run([sys.executable, "-m", "nomaanos", "run", "hello"],
+                          capture_output=True, text=True, env=env)
+    assert proc.stdout.strip() == "{'hello': 'world'}"
+    assert not (tmp_path / "fresh").exists()
+
+def test_async_runs_are_timed_individually(module_file, monkeypatch):
+    from nomaanos import history
+    from nomaanos.modules import run_many
+    module_file("zz_async_slow", "import asyncio\nasync def main():\n    await asyncio.sleep(0.3)\n    return 1\n")
+    module_file("zz_async_fast", "async def main():\n    return 2\n")
+    seen = {}
+    monkeypatch.setenv("NOMAANOS_HISTORY", "1")
+    monkeypatch.setenv("NOMAANOS_NO_CACHE", "1")
+    monkeypatch.setattr(history, "record", lambda n, start, dur, status, res=None: seen.__setitem__(n, dur))
+    assert run_many(["zz_async_slow", "zz_async_fast"]) == {"zz_async_slow": 1, "zz_async_fast": 2}
+    assert seen["zz_async_slow"] >= 0.3
+    assert seen["zz_async_fast"] < 0.1
+
+def test_history_flag_is_read_without_writing(tmp_path, monkeypatch):
+    from nomaanos import config, history
+    monkeypatch.delenv("NOMAANOS_HISTORY", raising=False)
+    cfg = tmp_path / "cfg.json"
+    monkeypatch.setattr(config, "CONFIG_FILE", str(cfg))
+    monkeypatch.setattr(config, "_cache", None)
+    assert history.enabled() is False
+    assert list(tmp_path.iterdir()) == []  # neither the config nor its .lock
+    cfg.write_text('{"history": true}')
+    assert history.enabled() is True
+    cfg.write_text("{not json")
+    assert config.peek("history", "dflt") == "dflt" and history.enabled() is False
@@ -0,0 +1,29 @@
+import io, threading
+
+from nomaanos import config, schedule
+
+def test_overlapping_runs_count_every_run(monkeypatch):
+    job = schedule.Job("pair", {"run": "hello", "every": "1m", "max_concurrency": 2})
+    sched = schedule.Scheduler({"pair": job}, {"pair": {"runs": 3}}, out=io.StringIO())
+    both = threading.Barrier(2)
+    monkeypatch.setattr(schedule, "_execute", lambda j: ("ok", None))
+    # hold each run at its log line until the other gets there: the two always finish together
+    monkeypatch.setattr(sched, "_log", lambda msg: both.wait(timeout=5))
+
+    for _ in range(5):
+        job.running = 2
+        runs = [threading.Thread(target=sched._run, args=(job, 0)) for _ in range(2)]
+        for t in runs:
+            t.start()
+        for t in runs:
+            t.join()
+    assert job.running == 0
+    assert sched.state["pair"]["runs"] == 13
+    assert config.get("schedule_state")["pair"]["runs"] == 13
+
+def test_backup_job_logs_the_snapshot_id(monkeypatch):
+    from nomaanos import backup
+    monkeypatch.setattr(backup, "backup", lambda: {"snapshot": "20260101_000000"})
+    monkeypatch.setattr(backup, "prune", lambda: {})
+    job = schedule.Job("b", {"run": "@backup", "every": "1d"})
+    assert schedule._execute(job) == ("ok", "20260101_000000")
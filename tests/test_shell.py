@@ -0,0 +1,38 @@
+import json
+
+from nomaanos import trace
+from nomaanos.modules import runner
+from nomaanos.shell import Reloader, Shell
+
+VERSION = "def main():\n    return {{'v': {v}}}\n"
+
+def test_reloader_reloads_only_edited_modules(module_file):
+    module_file("zz_edit", VERSION.format(v=1))
+    module_file("zz_keep", VERSION.format(v=1))
+    assert runner.run("zz_edit") == {"v": 1} and runner.run("zz_keep") == {"v": 1}
+    reloader = Reloader()
+    reloader.track()
+    assert reloader.reload_changed() == []
+
+    module_file("zz_edit", VERSION.format(v=2), bump=2)
+    assert reloader.reload_changed() == ["zz_edit"]
+    assert runner.run("zz_edit") == {"v": 2}
+    assert reloader.reload_changed() == []
+    assert reloader.reload_changed(force={"zz_keep"}) == ["zz_keep"]
+
+def test_shell_strips_trace_flag_and_traces_the_command(tmp_path, capsys):
+    shell = Shell()
+    shell.timing = False
+    path = tmp_path / "shell.json"
+    assert shell.execute(f"run hello --trace={path}") is True
+    out = capsys.readouterr()
+    assert out.out.strip() == "{'hello': 'world'}"
+    assert f"-> {path}" in out.err
+    assert not trace.enabled()
+    with open(path) as f:
+        names = {e["name"] for e in json.load(f)["traceEvents"]}
+    assert {"command", "execute"} <= names
+
+    # the next command runs untraced again
+    assert shell.execute("run hello") is True
+    assert "trace:" not in capsys.readouterr().err
@@ -0,0 +1,36 @@
+import json, os, subprocess, sys
+
+from tests.conftest import SRC
+
+from nomaanos import trace
+
+def test_spans_export_as_chrome_trace(tmp_path, capsys):
+    assert trace.span("import") is trace.span("execute")  # the shared no-op while disabled
+    trace.record("init", 0, 2_000_000, note="early")       # kept aside until enable()
+    path = str(tmp_path / "t.json")
+    trace.enable(path)
+    with trace.span("execute", module="hello"):
+        with trace.span("import", module="hello"):
+            pass
+    assert list(trace.summary()) == ["init", "import", "execute"]
+    assert trace.finish() == path and not trace.enabled()
+
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    by_name = {e["name"]: e for e in events}
+    assert set(by_name) == {"init", "import", "execute"}
+    assert all(e["ph"] == "X" and e["pid"] == os.getpid() for e in events)
+    assert by_name["init"]["dur"] == 2000.0 and by_name["init"]["args"] == {"note": "early"}
+    outer, inner = by_name["execute"], by_name["import"]
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert "trace: init 2.00ms" in capsys.readouterr().err
+
+def test_cli_trace_flag_writes_file(tmp_path):
+    env = dict(os.environ, PYTHONPATH=SRC)
+    proc = subprocess.run([sys.executable, "-m", "nomaanos", "--trace=t.json", "run", "hello"],
+                          capture_output=True, text=True, env=env, cwd=str(tmp_path))
+    assert proc.stdout.strip() == "{'hello': 'world'}"
+    assert "-> t.json" in proc.stderr
+    with open(tmp_path / "t.json") as f:
+        names = {e["name"] for e in json.load(f)["traceEvents"]}
+    assert {"command", "execute"} <= names
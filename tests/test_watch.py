@@ -0,0 +1,47 @@
+import io
+
+from nomaanos import watch
+
+def _samples(monkeypatch, *results):
+    seq = iter(results)
+
+    def sample():
+        r = next(seq)
+        if isinstance(r, Exception):
+            raise r
+        return r
+    monkeypatch.setattr(watch, "_sampler", lambda name: sample)
+
+def test_every_error_sample_is_printed_and_stale_fields_dropped(monkeypatch):
+    _samples(monkeypatch, {"a": 1, "b": 2}, OSError("gone"), {"a": 3}, OSError("again"))
+    out = io.StringIO()
+    watch.watch("probe", interval=0, count=4, out=out)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 4
+    assert "a=1" in lines[0] and "b=2" in lines[0]
+    assert lines[1].endswith("[ERROR] OSError: gone")
+    assert "a=3" in lines[2] and "b=" not in lines[2]
+    assert lines[3].endswith("[ERROR] OSError: again")
+
+def test_ndjson_carries_the_error(monkeypatch):
+    import json
+    _samples(monkeypatch, {"a": 1}, ValueError("bad"))
+    out = io.StringIO()
+    watch.watch("probe", interval=0, count=2, fmt="ndjson", out=out)
+    first, second = map(json.loads, out.getvalue().splitlines())
+    assert "a" in first["fields"] and "error" not in first
+    assert second == {"t": second["t"], "fields": {}, "error": "ValueError: bad"}
+
+def test_non_finite_values(monkeypatch):
+    _samples(monkeypatch, {"x": float("nan"), "y": float("inf"), "z": float("-inf")})
+    out = io.StringIO()
+    watch.watch("probe", interval=0, count=1, out=out)
+    line = out.getvalue()
+    assert "x=nan" in line and "y=inf" in line and "z=-inf" in line
+
+def test_cli_rejects_bad_numbers(capsys):
+    assert watch.cli(["probe", "--interval", "soon"]) == 2
+    assert watch.cli(["probe", "--count"]) == 2
+    out = capsys.readouterr().out.splitlines()
+    assert out == ["[ERROR] watch: --interval expects a number, got 'soon'",
+                   "[ERROR] watch: --count expects a number, got None"]